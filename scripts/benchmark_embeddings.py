@@ -0,0 +1,142 @@
+import argparse
+import contextlib
+import io
+import random
+import string
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+import generate_embeddings_ollama as fetcher
+from ollama_standin import (DEFAULT_DIM, DEFAULT_JITTER_MS, DEFAULT_LATENCY_MS, DEFAULT_PARALLEL,
+                            DEFAULT_PER_ITEM_MS, StandinServer, standin_vector)
+
+# Benchmark the embedding fetchers of generate_embeddings_ollama.py against the
+# offline stand-in server (ollama_standin.py), started in-process on a free port.
+# For every mode (one word per request, or batched), concurrency and injected
+# error rate it reports words/sec, requests and injected errors (the retry
+# overhead shows as the gap to the error-free row), client-side request latency
+# percentiles, and checks every returned vector against the stand-in's
+# deterministic one. Exits non-zero if any word failed or mismatched.
+
+# --- Configuration ---
+DEFAULT_NUM_WORDS = 2000
+FETCH_MODES = ("single", "batched")
+
+
+def synthetic_words(num_words: int, seed: int = 0) -> List[str]:
+    """Distinct pseudo-words, reproducible for a seed."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < num_words:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def run_fetch(server: StandinServer, words: List[str], mode: str, concurrency: int,
+              error_rate: float, verbose: bool = False) -> Dict:
+    """Fetch every word once through the fetcher and collect throughput, latency and correctness."""
+    server.error_rate = error_rate
+    counts_before = dict(server.counts)
+    latencies = []
+    session = fetcher.make_session(concurrency)
+    session.hooks["response"].append(lambda response, *args, **kwargs:
+                                     latencies.append(response.elapsed.total_seconds()))
+
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            stack.enter_context(contextlib.redirect_stderr(io.StringIO()))
+        start_time = time.perf_counter()
+        if mode == "batched":
+            results = fetcher.fetch_embeddings_batched(words, concurrency, session)
+        else:
+            results = fetcher.fetch_embeddings(words, concurrency, session)
+        elapsed = time.perf_counter() - start_time
+
+    failed = sum(1 for result in results if result is None)
+    mismatches = 0
+    for word, result in zip(words, results):
+        if result is None:
+            continue
+        expected = standin_vector(server.model, word, server.dim)
+        if mode == "batched":
+            expected = expected / np.linalg.norm(expected)
+        if not np.allclose(result, expected, atol=1e-6):
+            mismatches += 1
+
+    requests = {name: server.counts.get(name, 0) - counts_before.get(name, 0) for name in server.counts}
+    latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "error_rate": error_rate,
+        "words_per_sec": len(words) / elapsed,
+        "requests": requests.get("/api/embeddings", 0) + requests.get("/api/embed", 0),
+        "errors": requests.get("errors", 0),
+        "p50_ms": float(np.percentile(latency_ms, 50)),
+        "p95_ms": float(np.percentile(latency_ms, 95)),
+        "p99_ms": float(np.percentile(latency_ms, 99)),
+        "max_ms": float(latency_ms.max()),
+        "failed": failed,
+        "mismatches": mismatches,
+    }
+
+
+def print_table(rows: List[Dict]) -> None:
+    print(f"\n{'mode':<9}{'conc':>5}{'err %':>7}{'words/s':>10}{'requests':>10}{'errors':>8}"
+          f"{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'max ms':>8}{'failed':>8}{'mismatch':>10}")
+    for row in rows:
+        print(f"{row['mode']:<9}{row['concurrency']:>5}{100 * row['error_rate']:>7.1f}{row['words_per_sec']:>10.1f}"
+              f"{row['requests']:>10}{row['errors']:>8}{row['p50_ms']:>8.1f}{row['p95_ms']:>8.1f}"
+              f"{row['p99_ms']:>8.1f}{row['max_ms']:>8.1f}{row['failed']:>8}{row['mismatches']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark embedding fetch throughput against the offline stand-in')
+    parser.add_argument('--words', type=int, default=DEFAULT_NUM_WORDS, help='Number of synthetic words')
+    parser.add_argument('--words-file', default=None, help='Fetch the words in this file (one per line) instead')
+    parser.add_argument('--modes', nargs='+', choices=FETCH_MODES, default=list(FETCH_MODES), help='Fetch modes')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='Requests in flight')
+    parser.add_argument('--error-rates', type=float, nargs='+', default=[0.0, 0.02],
+                        help='Fractions of requests the stand-in fails with HTTP 500')
+    parser.add_argument('--retry-delay', type=float, default=0.2,
+                        help=f'Seconds between retries of a word (the fetcher uses {fetcher.RETRY_DELAY})')
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_LATENCY_MS, help='Stand-in base latency')
+    parser.add_argument('--per-item-ms', type=float, default=DEFAULT_PER_ITEM_MS, help='Stand-in latency per text')
+    parser.add_argument('--jitter-ms', type=float, default=DEFAULT_JITTER_MS, help='Stand-in latency jitter')
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL, help='Stand-in requests processed at once')
+    parser.add_argument('--dim', type=int, default=DEFAULT_DIM, help='Embedding dimension')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for words, jitter and injected errors')
+    parser.add_argument('--verbose', action='store_true', help='Show the fetchers\' progress and retry output')
+    args = parser.parse_args()
+
+    if args.words_file:
+        with open(args.words_file, 'r') as f:
+            words = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    else:
+        words = synthetic_words(args.words, args.seed)
+
+    server = StandinServer(0, fetcher.MODEL_NAME, args.dim, args.latency_ms, args.per_item_ms,
+                           args.jitter_ms, parallel=args.parallel, seed=args.seed)
+    server.start_background()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Point the fetcher at the stand-in instead of the local Ollama
+    fetcher.OLLAMA_API_URL = f"{base_url}/api/embeddings"
+    fetcher.OLLAMA_EMBED_URL = f"{base_url}/api/embed"
+    fetcher.RETRY_DELAY = args.retry_delay
+    print(f"Stand-in serving on {base_url}: {args.latency_ms} ms + {args.per_item_ms} ms/text "
+          f"+/- {args.jitter_ms} ms, {args.parallel} parallel; {len(words)} words")
+
+    rows = []
+    for mode in args.modes:
+        for concurrency in args.concurrency:
+            for error_rate in args.error_rates:
+                rows.append(run_fetch(server, words, mode, concurrency, error_rate, args.verbose))
+                row = rows[-1]
+                print(f"  {mode} x{concurrency}, {100 * error_rate:.1f}% errors: {row['words_per_sec']:.1f} words/sec")
+    server.shutdown()
+    print_table(rows)
+    sys.exit(1 if any(row["failed"] or row["mismatches"] for row in rows) else 0)
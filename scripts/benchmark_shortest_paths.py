@@ -0,0 +1,85 @@
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from landmarks import DEFAULT_NUM_LANDMARKS, LANDMARK_STRATEGIES, LandmarkIndex
+from word_graph import WordGraph, load_graph
+
+# --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+GRAPH_PATH = PROJECT_ROOT / "src" / "data" / "graph.json"
+DEFAULT_NUM_PAIRS = 500
+
+
+def run_searches(name: str, search: Callable, pairs: List[Tuple[int, int]],
+                 reference: List[List[int]]) -> Dict:
+    """Run one search mode over all pairs and collect settled counts, timing and mismatches."""
+    settled_counts = []
+    mismatches = 0
+    start_time = time.perf_counter()
+    for (start, end), expected in zip(pairs, reference):
+        stats = {}
+        path = search(start, end, stats)
+        settled_counts.append(stats.get("settled", 0))
+        if path != expected:
+            mismatches += 1
+    elapsed = time.perf_counter() - start_time
+    return {
+        "name": name,
+        "mean_settled": statistics.mean(settled_counts),
+        "median_settled": statistics.median(settled_counts),
+        "ms_per_query": elapsed * 1000 / len(pairs),
+        "mismatches": mismatches,
+    }
+
+
+def benchmark(graph: WordGraph, num_pairs: int, landmark_counts: List[int], seed: int) -> List[Dict]:
+    """Compare Dijkstra, bidirectional Dijkstra and ALT variants on the same random pairs."""
+    rng = random.Random(seed)
+    pairs = [tuple(rng.sample(range(len(graph)), 2)) for _ in range(num_pairs)]
+
+    print(f"Computing reference Dijkstra paths for {num_pairs} pairs...")
+    reference = [graph.shortest_path_ids(start, end) for start, end in pairs]
+
+    rows = [
+        run_searches("dijkstra", lambda s, e, st: graph.shortest_path_ids(s, e, stats=st), pairs, reference),
+        run_searches("bidirectional", lambda s, e, st: graph.shortest_path_ids(s, e, True, st), pairs, reference),
+    ]
+    for strategy in LANDMARK_STRATEGIES:
+        for count in landmark_counts:
+            build_start = time.perf_counter()
+            index = LandmarkIndex(graph, count, strategy)
+            build_seconds = time.perf_counter() - build_start
+            row = run_searches(f"alt-{strategy}-{len(index.landmarks)}", index.path_ids, pairs, reference)
+            row["build_s"] = build_seconds
+            rows.append(row)
+    return rows
+
+
+def print_table(rows: List[Dict]) -> None:
+    baseline = rows[0]["mean_settled"]
+    print(f"\n{'mode':<22}{'mean settled':>14}{'median':>10}{'vs dijkstra':>13}"
+          f"{'ms/query':>10}{'build s':>9}{'mismatch':>10}")
+    for row in rows:
+        build = f"{row['build_s']:.2f}" if "build_s" in row else "-"
+        print(f"{row['name']:<22}{row['mean_settled']:>14.1f}{row['median_settled']:>10.0f}"
+              f"{baseline / max(row['mean_settled'], 1):>12.1f}x{row['ms_per_query']:>10.3f}"
+              f"{build:>9}{row['mismatches']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark shortest-path modes: settled nodes and query time')
+    parser.add_argument('--graph', default=str(GRAPH_PATH), help='Path to graph.json')
+    parser.add_argument('--pairs', type=int, default=DEFAULT_NUM_PAIRS, help='Number of random word pairs')
+    parser.add_argument('--landmarks', type=int, nargs='+', default=[4, 8, DEFAULT_NUM_LANDMARKS],
+                        help='Landmark counts to try')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for pair sampling')
+    args = parser.parse_args()
+
+    # Always search: an attached atlas would answer without settling anything
+    graph = load_graph(args.graph, use_atlas=False)
+    print(f"Loaded {len(graph)} words")
+    print_table(benchmark(graph, args.pairs, args.landmarks, args.seed))
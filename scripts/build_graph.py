@@ -1,23 +1,42 @@
+import importlib.util
 import json
-import pickle
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 import sys
 import argparse
-import nltk # Add NLTK imports
-from nltk.corpus import wordnet as wn
+from pathlib import Path
+from typing import Dict, List
+
+from build_state import load_build_state, save_build_state
+from definition_cache import lookup_definitions
+from embedding_store import open_embeddings
+from graph_health import giant_scc_mask, health_report, print_health_report, prune_nodes
+from nearest_neighbors import (DEFAULT_BLOCK_MB, DEFAULT_NUM_PROBES, DEFAULT_RECALL_SAMPLE, NEIGHBOR_BACKENDS,
+                               find_neighbors, neighbor_edges, normalize_embeddings, recall_at_k,
+                               rows_per_block, update_top_k)
+from similarity_store import STORE_DTYPES, SimilarityStore, write_dense_json, write_similarity_store
+from word_graph import COMPACT_WEIGHT_SCALE, WordGraph, write_compact_json, write_json_atomic
 
 # Constants
 MAX_DEFINITIONS_PER_WORD = 3 # Max definitions to keep
 MAX_DEFINITION_LENGTH = 90 # Max characters per definition
 # K = 7 # REMOVED
-WORDS_PATH = os.path.join("raw_data", "ENGLISH_LEMMATIZED.json")
-EMBEDDINGS_PATH = os.path.join("raw_data", "embeddings.pkl")
-TSNE_COORDS_PATH = os.path.join("data", "tsne_coordinates.json")
-OUTPUT_DIR = os.path.join("client", "public", "data")
+# Every path resolves from the project root, like build_state.py and definition_cache.py
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "database", "raw_data")
+WORDS_PATH = os.path.join(RAW_DATA_DIR, "ENGLISH_LEMMATIZED.json")
+EMBEDDINGS_PATH = os.path.join(RAW_DATA_DIR, "embeddings") # Embedding store directory
+LEGACY_EMBEDDINGS_PATH = os.path.join(RAW_DATA_DIR, "embeddings.pkl")
+TSNE_COORDS_PATH = os.path.join(PROJECT_ROOT, "data", "tsne_coordinates.json")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "client", "public", "data")
 OUTPUT_GRAPH_PATH = os.path.join(OUTPUT_DIR, "graph.json")
+OUTPUT_COMPACT_GRAPH_PATH = os.path.join(OUTPUT_DIR, "graph.compact.json") # Optional indexed export
 OUTPUT_DEFS_PATH = os.path.join(OUTPUT_DIR, "definitions.json") # Path for definitions
+OUTPUT_DENSE_SIMILARITY_DIR = os.path.join(OUTPUT_DIR, "dense_similarity") # Quantized all-pairs store
+OUTPUT_DENSE_SIMILARITY_PATH = os.path.join(OUTPUT_DIR, "dense_similarity_matrix.json") # Optional legacy JSON
+HEALTH_REPORT_PATH = os.path.join(PROJECT_ROOT, "data", "graph_health.json") # Structural report for every built k
+
+SUMMARY_SAMPLE_SOURCES = 64 # Start words sampled for the per-k average path length
 
 # List of words to filter out
 FILTERED_WORDS = {
@@ -28,78 +47,106 @@ FILTERED_WORDS = {
     "cluster",
 }
 
-# --- WordNet Definition Function ---
-# Ensure WordNet data is available before calling this
-try:
-    wn.ensure_loaded()
-except LookupError:
-    print("WordNet corpus not found. Please ensure NLTK data is downloaded.")
-    print("Run: python -c \"import nltk; nltk.download('wordnet'); nltk.download('omw-1.4')\"")
-    sys.exit(1)
-
-def get_wordnet_definition(word):
-    """Fetches up to MAX_DEFINITIONS_PER_WORD synset definitions for a given word,
-       filtering by MAX_DEFINITION_LENGTH."""
-    synsets = wn.synsets(word)
-    if synsets:
-        # Get all non-empty definitions first
-        all_definitions = [s.definition() for s in synsets if s.definition()]
-        # Filter by length
-        filtered_definitions = [d for d in all_definitions if len(d) <= MAX_DEFINITION_LENGTH]
-        # Return the first MAX_DEFINITIONS_PER_WORD from the filtered list
-        return filtered_definitions[:MAX_DEFINITIONS_PER_WORD]
-    return []
-# --- End Definition Function ---
-
-def build_graph(k_neighbors):
+def graph_path_for_k(k_neighbors, compact=False):
+    """Output path of the graph for one k when several k values are built at once."""
+    suffix = ".compact.json" if compact else ".json"
+    return os.path.join(OUTPUT_DIR, f"graph_k{k_neighbors}{suffix}")
+
+def summarize_graph(graph: WordGraph, k_neighbors: int, seed: int = 0) -> Dict:
+    """Component, path length and degree statistics for one built graph."""
+    labels = graph.weak_components()
+    component_sizes = np.bincount(labels)
+    component_sizes = component_sizes[component_sizes > 0]
+
+    rng = np.random.default_rng(seed)
+    sources = rng.choice(len(graph), min(SUMMARY_SAMPLE_SOURCES, len(graph)), replace=False)
+    hops = graph.multi_source_hops(sources)
+    reachable = hops > 0
+    in_degrees = np.bincount(graph.indices, minlength=len(graph))
+
+    return {
+        "k": k_neighbors,
+        "components": len(component_sizes),
+        "largest_component": int(component_sizes.max()),
+        "avg_path_length": float(hops[reachable].mean()) if reachable.any() else float("nan"),
+        "unreachable_pct": 100.0 * (1.0 - reachable.sum() / max(len(sources) * (len(graph) - 1), 1)),
+        "in_degree_min": int(in_degrees.min()),
+        "in_degree_mean": float(in_degrees.mean()),
+        "in_degree_max": int(in_degrees.max()),
+        "zero_in_degree": int((in_degrees == 0).sum()),
+    }
+
+def print_summary_table(summaries: List[Dict]):
+    print(f"\n{'k':>4}{'components':>12}{'largest':>9}{'avg path':>10}{'unreach %':>11}"
+          f"{'in-deg min':>12}{'mean':>7}{'max':>6}{'in-deg 0':>10}")
+    for row in summaries:
+        print(f"{row['k']:>4}{row['components']:>12}{row['largest_component']:>9}{row['avg_path_length']:>10.2f}"
+              f"{row['unreachable_pct']:>11.2f}{row['in_degree_min']:>12}{row['in_degree_mean']:>7.1f}"
+              f"{row['in_degree_max']:>6}{row['zero_in_degree']:>10}")
+
+def build_graph(k_values, block_mb=DEFAULT_BLOCK_MB, backend="exact", num_lists=None,
+                num_probes=DEFAULT_NUM_PROBES, recall_sample=DEFAULT_RECALL_SAMPLE,
+                similarity_dtype="uint16", dense_json=False, incremental=False, compact=False,
+                prune_to_giant_scc=False):
     """
     Loads embeddings, filters words based on definition existence,
     loads t-SNE coordinates, calculates similarity, finds neighbors,
     and saves the resulting graph and definitions to JSON files.
 
+    Several k values share one neighbor search (for the largest k); each gets
+    its own graph_k{k}.json and a row in the summary table.
+
     Args:
-        k_neighbors (int): The number of nearest neighbors.
+        k_values (int or list of int): The number(s) of nearest neighbors.
+        block_mb (float): Memory budget for each block of similarity rows.
+        backend (str): Neighbor search backend, "exact" or approximate "ivf".
+        num_lists (int): IVF list count (default about sqrt of the vocabulary size).
+        num_probes (int): IVF lists searched per word.
+        recall_sample (int): Words sampled to report IVF recall@k against exact search (0 to skip).
+        similarity_dtype (str): Quantization of the all-pairs similarity store, "uint16" or "int8".
+        dense_json (bool): Also stream the legacy dense_similarity_matrix.json.
+        incremental (bool): Reuse the previous build's neighbor table and similarity
+            store, recomputing only what the vocabulary/embedding changes affect.
+        compact (bool): Also write the compact indexed graph export (graph.compact.json).
+        prune_to_giant_scc (bool): Drop words outside the largest strongly connected
+            component (and edges to them), so every remaining pair has a path.
     """
-    print("Loading embeddings dictionary...")
-    with open(EMBEDDINGS_PATH, 'rb') as f:
-        embeddings_dict = pickle.load(f)
-    initial_word_count = len(embeddings_dict)
-    print(f"Loaded embeddings for {initial_word_count} words.")
+    if prune_to_giant_scc and importlib.util.find_spec("scipy") is None:
+        print("Error: --prune-to-giant-scc needs SciPy to find strongly connected components "
+              "(pip install scipy).", file=sys.stderr)
+        sys.exit(1)
+
+    print("Loading embedding store...")
+    embedding_store = open_embeddings(EMBEDDINGS_PATH, LEGACY_EMBEDDINGS_PATH)
+    initial_word_count = len(embedding_store)
+    print(f"Loaded embeddings for {initial_word_count} words ({embedding_store.dtype}).")
 
     # --- Filter Words Based on Definitions and Filtered Words List ---
     print("Fetching definitions and filtering words...")
-    filtered_embeddings_dict = {}
+    kept_rows = []
     final_definitions = {}
     definition_not_found_count = 0
-    filtered_words_count = 0
-    words_processed = 0
-
-    for word, embedding in embeddings_dict.items():
-        # Skip words in the filtered list
-        if word.lower() in FILTERED_WORDS:
-            filtered_words_count += 1
-            continue
-            
-        definitions_list = get_wordnet_definition(word)
+
+    # Skip words in the filtered list
+    candidate_words = [word for word in embedding_store.words if word.lower() not in FILTERED_WORDS]
+    filtered_words_count = initial_word_count - len(candidate_words)
+    # Cached WordNet lookups; only words new since the last build hit WordNet
+    definitions = lookup_definitions(candidate_words, MAX_DEFINITIONS_PER_WORD, MAX_DEFINITION_LENGTH)
+
+    for word in candidate_words:
+        definitions_list = definitions[word]
         if definitions_list: # Keep only words with definitions
-            filtered_embeddings_dict[word] = embedding
+            kept_rows.append(embedding_store.word_ids[word])
             final_definitions[word] = definitions_list
         else:
             definition_not_found_count += 1
-        
-        words_processed += 1
-        if words_processed % 500 == 0:
-            print(f"  Processed {words_processed}/{initial_word_count} words for definition check...")
     
-    filtered_word_count = len(filtered_embeddings_dict)
+    filtered_word_count = len(kept_rows)
     print(f"Finished definition check. Kept {filtered_word_count} words with definitions.")
     print(f"Removed {definition_not_found_count} words without definitions.")
     print(f"Removed {filtered_words_count} words from filtered words list.")
     # --- End Filter ---
 
-    # Continue with the filtered dictionary
-    embeddings_dict = filtered_embeddings_dict
-
     print(f"Loading t-SNE coordinates from {TSNE_COORDS_PATH}...")
     try:
         with open(TSNE_COORDS_PATH, 'r') as f:
@@ -113,77 +160,137 @@ def build_graph(k_neighbors):
         print(f"Error: Could not decode JSON from {TSNE_COORDS_PATH}")
         sys.exit(1)
 
-    # --- Reconstruct words list and embeddings matrix FROM FILTERED DATA ---
-    print("Reconstructing words list and embeddings matrix from FILTERED dictionary...")
-    words = list(embeddings_dict.keys()) # Now uses filtered words
-    # Assuming values are numpy arrays or lists that can be stacked
-    try:
-        embeddings_list = [embeddings_dict[word] for word in words]
-        embeddings = np.stack(embeddings_list)
-    except KeyError as e:
-        print(f"Error: Word '{e}' not found in embeddings dictionary during matrix construction.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error stacking embeddings: {e}")
-        sys.exit(1)
+    # --- Select FILTERED rows of the embedding matrix ---
+    words = [embedding_store.words[row] for row in kept_rows]
+    embeddings = embedding_store.vectors(kept_rows)
+    print(f"Selected embeddings matrix with shape: {embeddings.shape}")
+    # --- End Select ---
 
-    print(f"Reconstructed embeddings matrix with shape: {embeddings.shape}")
-    print(f"Reconstructed word list with {len(words)} words.")
-    # --- End Reconstruct ---
+    if isinstance(k_values, int):
+        k_values = [k_values]
+    k_values = sorted(set(k_values))
+    # One search for the largest k; smaller graphs keep a prefix of each row
+    k_neighbors = max(k_values)
 
-    print("Calculating cosine similarity matrix...")
-    # Ensure embeddings are float32 for efficiency if needed
-    if embeddings.dtype != np.float32:
-         embeddings = embeddings.astype(np.float32)
-    similarity_matrix = cosine_similarity(embeddings)
-    print(f"Calculated similarity matrix with shape: {similarity_matrix.shape}")
-
-    print(f"Building graph with top {k_neighbors} neighbors and t-SNE coordinates...")
-    graph = {"nodes": {}}
+    print(f"Calculating cosine similarity top-k with the {backend} backend...")
+    # Normalized float32 rows: each block of similarities is one matrix product
+    normalized = normalize_embeddings(embeddings)
     num_words = len(words)
-    missing_tsne_count = 0
-
-    for i in range(num_words):
-        word = words[i]
-        similarities = similarity_matrix[i]
-        num_to_find = min(k_neighbors + 1, num_words)
-        indices = np.argpartition(similarities, -num_to_find)[-num_to_find:]
-        sorted_indices = indices[np.argsort(similarities[indices])[::-1]]
-
-        edges = {}
-        neighbors_found = 0
-        for idx in sorted_indices:
-            if idx != i:
-                neighbor_word = words[idx]
-                score = float(similarities[idx])
-                edges[neighbor_word] = score
-                neighbors_found += 1
-                if neighbors_found == k_neighbors:
-                    break
-
-        tsne_coords = tsne_coords_map.get(word)
-        if tsne_coords is None:
-            tsne_coords = [0.0, 0.0]
-            missing_tsne_count += 1
-
-        graph["nodes"][word] = {
-            "edges": edges,
-            "tsne": tsne_coords
-        }
-
-        if (i + 1) % 500 == 0:
-            print(f"Processed {i + 1}/{num_words} words...")
+    if backend == "exact":
+        print(f"Using blocks of {rows_per_block(num_words, block_mb)} rows ({block_mb} MB budget)")
+
+    previous = load_build_state() if incremental else None
+    if incremental:
+        if previous is None:
+            print("No previous build state found; running a full build.")
+        elif backend != "exact" or previous.k_neighbors != k_neighbors \
+                or previous.normalized.shape[1] != normalized.shape[1] \
+                or previous.neighbor_indices.shape[1] != min(k_neighbors + 1, num_words):
+            print("Previous build used other settings or embeddings; running a full build.")
+            previous = None
 
+    previous_ids = None
+    if previous is not None:
+        previous_ids = previous.previous_ids(words, normalized)
+        fresh_count = int((previous_ids < 0).sum())
+        removed_count = len(previous.words) - (len(words) - fresh_count)
+        print(f"Incremental build: {fresh_count} new or re-embedded words, "
+              f"{removed_count} removed or re-embedded since the previous build.")
+        neighbor_indices, neighbor_scores, updated = update_top_k(
+            normalized, k_neighbors, previous.neighbor_indices, previous.neighbor_scores, previous_ids, block_mb)
+        print(f"Recomputed neighbors for {updated}/{num_words} words.")
+    else:
+        neighbor_indices, neighbor_scores = find_neighbors(normalized, k_neighbors, backend, block_mb,
+                                                           num_lists, num_probes)
+    if backend != "exact" and recall_sample > 0:
+        recall = recall_at_k(normalized, neighbor_indices, k_neighbors, recall_sample)
+        print(f"Recall@{k_neighbors} against exact search on {min(recall_sample, num_words)} words: {recall:.3f}")
+
+    missing_tsne_count = sum(1 for word in words if tsne_coords_map.get(word) is None)
     if missing_tsne_count > 0:
         print(f"Warning: Missing t-SNE coordinates for {missing_tsne_count} words. Defaulted to [0,0].")
-    print("Graph construction complete.")
-
-    # --- Save Output Files ---
-    print(f"Saving graph to {OUTPUT_GRAPH_PATH}...")
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT_GRAPH_PATH, 'w') as f:
-        json.dump(graph, f, indent=2)
-    print("Graph saved successfully.")
+    summaries = []
+    health_reports = {}
+    graph_words = set() # Words in any written graph
+
+    for k in k_values:
+        print(f"Building graph with top {k} neighbors and t-SNE coordinates...")
+        graph = {"nodes": {}}
+
+        for i in range(num_words):
+            word = words[i]
+            edges = neighbor_edges(words, i, neighbor_indices, neighbor_scores, k)
+
+            tsne_coords = tsne_coords_map.get(word)
+            if tsne_coords is None:
+                tsne_coords = [0.0, 0.0]
+
+            graph["nodes"][word] = {
+                "edges": edges,
+                "tsne": tsne_coords
+            }
+
+            if (i + 1) % 500 == 0:
+                print(f"Processed {i + 1}/{num_words} words...")
+
+        print("Graph construction complete.")
+
+        word_graph = WordGraph.from_nodes(graph["nodes"])
+        try:
+            report = health_report(word_graph)
+        except ImportError:
+            print("Warning: SciPy is not installed; skipping the graph health report.")
+            report = None
+        if report is not None:
+            print_health_report(report, f"k={k}")
+            health_reports[str(k)] = report
+        if prune_to_giant_scc and report["outside_giant_scc"]:
+            giant = giant_scc_mask(word_graph)
+            graph["nodes"] = prune_nodes(graph["nodes"], [word for word, keep in zip(word_graph.words, giant) if keep])
+            word_graph = WordGraph.from_nodes(graph["nodes"])
+            report["pruned"] = int((~giant).sum())
+            print(f"Pruned {report['pruned']} words outside the giant strongly connected component.")
+        graph_words.update(graph["nodes"])
+
+        # --- Save Output Files ---
+        graph_path = OUTPUT_GRAPH_PATH if len(k_values) == 1 else graph_path_for_k(k)
+        print(f"Saving graph to {graph_path}...")
+        with open(graph_path, 'w') as f:
+            json.dump(graph, f, indent=2)
+        print("Graph saved successfully.")
+
+        if compact:
+            compact_path = OUTPUT_COMPACT_GRAPH_PATH if len(k_values) == 1 else graph_path_for_k(k, compact=True)
+            print(f"Saving compact graph to {compact_path}...")
+            write_compact_json(word_graph, compact_path, COMPACT_WEIGHT_SCALE)
+            print("Compact graph saved successfully. Check it with: python scripts/compact_graph.py verify "
+                  f"--graph {graph_path} --compact {compact_path}")
+
+        summaries.append(summarize_graph(word_graph, k))
+
+    print_summary_table(summaries)
+
+    if len(graph_words) < num_words:
+        # Restrict definitions, the similarity store and the build state to the words
+        # the pruned graphs kept (for several k, the words kept by any of them)
+        kept_ids = np.array([i for i, word in enumerate(words) if word in graph_words], dtype=np.int64)
+        words = [words[i] for i in kept_ids]
+        normalized = normalized[kept_ids]
+        final_definitions = {word: final_definitions[word] for word in words}
+        if previous_ids is not None:
+            previous_ids = previous_ids[kept_ids]
+        if backend == "exact":
+            # Rows that lost a neighbor are recomputed over the kept words, so the saved
+            # table stays the exact top-k of its vocabulary and the pruned words come
+            # back as new words in the next incremental build
+            neighbor_indices, neighbor_scores, updated = update_top_k(
+                normalized, k_neighbors, neighbor_indices, neighbor_scores, kept_ids, block_mb)
+            print(f"Recomputed neighbors for {updated}/{len(words)} kept words.")
+        print(f"Definitions, similarity store and build state cover the {len(words)} kept words.")
+
+    write_json_atomic(HEALTH_REPORT_PATH, health_reports)
+    print(f"Graph health report saved to {HEALTH_REPORT_PATH}.")
 
     print(f"Saving definitions to {OUTPUT_DEFS_PATH}...")
     with open(OUTPUT_DEFS_PATH, 'w') as f:
@@ -191,46 +298,71 @@ def build_graph(k_neighbors):
     print("Definitions saved successfully.")
     # --- End Save ---
 
-    # --- Generate and Save Dense Similarity Matrix ---
-    print("\nGenerating dense similarity matrix for all filtered word pairs...")
-    dense_similarity_data = {}
-    num_filtered_words = len(words) # words list is already based on filtered_embeddings_dict
-
-    for i in range(num_filtered_words):
-        word1 = words[i]
-        dense_similarity_data[word1] = {}
-        for j in range(num_filtered_words):
-            word2 = words[j]
-            # similarity_matrix was calculated on the filtered embeddings
-            raw_score = float(similarity_matrix[i][j])
-            quantized_score = round(raw_score, 3) # Round to 3 decimal places
-            dense_similarity_data[word1][word2] = quantized_score
-        if (i + 1) % 500 == 0:
-            print(f"  Built dense similarities for {i + 1}/{num_filtered_words} words...")
-
-    OUTPUT_DENSE_SIMILARITY_PATH = os.path.join(OUTPUT_DIR, "dense_similarity_matrix.json")
-    print(f"Saving dense similarity matrix to {OUTPUT_DENSE_SIMILARITY_PATH}...")
+    # --- Generate and Save Dense Similarity Store ---
+    print("\nGenerating quantized similarity store for all filtered word pairs...")
+    num_filtered_words = len(words) # words list only holds the filtered words
+    store_previous_ids = None
+    if previous_ids is not None:
+        # Only pairs involving new words need computing if the store matches the previous build
+        try:
+            store = SimilarityStore(OUTPUT_DENSE_SIMILARITY_DIR)
+            if store.words == previous.words and store.dtype == similarity_dtype:
+                store_previous_ids = previous_ids
+        except (OSError, ValueError):
+            pass
     try:
-        with open(OUTPUT_DENSE_SIMILARITY_PATH, 'w') as f:
-            json.dump(dense_similarity_data, f) # Intentionally no indent for smaller size
-        print("Dense similarity matrix saved successfully.")
-        
-        # Get and print file size
-        file_size_bytes = os.path.getsize(OUTPUT_DENSE_SIMILARITY_PATH)
-        file_size_mb = file_size_bytes / (1024 * 1024)
-        print(f"\n--- Dense Similarity Matrix File Size ---")
+        store_size = write_similarity_store(OUTPUT_DENSE_SIMILARITY_DIR, words, normalized,
+                                            similarity_dtype, block_mb, store_previous_ids)
+        print(f"Similarity store saved to {OUTPUT_DENSE_SIMILARITY_DIR}.")
+        print(f"\n--- Dense Similarity Store Size ---")
         print(f"Vocabulary size (filtered words): {num_filtered_words}")
-        print(f"File size of dense_similarity_matrix.json: {file_size_mb:.2f} MB")
-        print(f"This contains N*N = {num_filtered_words*num_filtered_words} similarity scores.")
-        print(f"--- End File Size Report ---")
-
+        print(f"Size of similarities.npy ({similarity_dtype}): {store_size / (1024 * 1024):.2f} MB")
+        print(f"This contains N*(N+1)/2 = {num_filtered_words * (num_filtered_words + 1) // 2} similarity scores.")
+        print(f"--- End Size Report ---")
     except Exception as e:
-        print(f"Error saving or getting size of dense similarity matrix: {e}")
+        print(f"Error saving dense similarity store: {e}")
+
+    if dense_json:
+        print(f"Streaming dense similarity matrix to {OUTPUT_DENSE_SIMILARITY_PATH}...")
+        try:
+            write_dense_json(OUTPUT_DENSE_SIMILARITY_PATH, words, normalized, block_mb)
+            file_size_mb = os.path.getsize(OUTPUT_DENSE_SIMILARITY_PATH) / (1024 * 1024)
+            print(f"Dense similarity matrix saved successfully ({file_size_mb:.2f} MB).")
+        except Exception as e:
+            print(f"Error saving dense similarity matrix: {e}")
     # --- End Dense Similarity ---
 
+    if backend == "exact":
+        save_build_state(words, k_neighbors, normalized, neighbor_indices, neighbor_scores)
+        print("Saved build state for incremental rebuilds.")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Build a semantic graph and definitions from word embeddings, filtering words without definitions.")
-    parser.add_argument("-k", "--k", type=int, default=5, # Default to K=5
-                        help="Number of nearest neighbors (K) to include for each word.")
+    parser.add_argument("-k", "--k", type=int, nargs="+", default=[5], # Default to K=5
+                        help="Number of nearest neighbors (K) to include for each word. Several values build "
+                             "one graph_k{K}.json per K from a single similarity pass.")
+    parser.add_argument("--block-mb", type=float, default=DEFAULT_BLOCK_MB,
+                        help="Memory budget in MB for each block of similarity rows.")
+    parser.add_argument("--backend", choices=NEIGHBOR_BACKENDS, default="exact",
+                        help="Neighbor search: exact blocked search, or an approximate IVF index for large vocabularies.")
+    parser.add_argument("--nlist", type=int, default=None,
+                        help="Number of IVF lists (default: about sqrt of the vocabulary size).")
+    parser.add_argument("--nprobe", type=int, default=DEFAULT_NUM_PROBES,
+                        help="IVF lists searched per word; higher is slower with better recall.")
+    parser.add_argument("--recall-sample", type=int, default=DEFAULT_RECALL_SAMPLE,
+                        help="Words sampled to report IVF recall@k against exact search (0 to skip).")
+    parser.add_argument("--similarity-dtype", choices=STORE_DTYPES, default="uint16",
+                        help="Quantization of the all-pairs similarity store.")
+    parser.add_argument("--dense-json", action="store_true",
+                        help="Also write the legacy dense_similarity_matrix.json (streamed row by row).")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only recompute neighbors and similarities affected by word list or embedding "
+                             "changes since the previous exact build.")
+    parser.add_argument("--compact", action="store_true",
+                        help="Also write graph.compact.json: word table plus integer-indexed edges with quantized weights.")
+    parser.add_argument("--prune-to-giant-scc", action="store_true",
+                        help="Drop words outside the largest strongly connected component so every pair has a path.")
     args = parser.parse_args()
-    build_graph(args.k) 
\ No newline at end of file
+    build_graph(args.k, args.block_mb, args.backend, args.nlist, args.nprobe, args.recall_sample,
+                args.similarity_dtype, args.dense_json, args.incremental, args.compact,
+                args.prune_to_giant_scc) 
\ No newline at end of file
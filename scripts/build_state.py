@@ -0,0 +1,83 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from word_graph import read_manifest, write_json_atomic
+
+# What build_graph.py needs from its previous run to rebuild incrementally.
+#
+# After an exact-backend build, data/graph_build/ holds the final word list,
+# the normalized embedding rows and the top-(k + 1) neighbor table. The next
+# `build_graph.py --incremental` diffs its vocabulary and embeddings against
+# this state and only recomputes neighbor rows that can have changed (see
+# nearest_neighbors.update_top_k).
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BUILD_STATE_DIR = PROJECT_ROOT / "data" / "graph_build"
+BUILD_STATE_VERSION = 1
+BUILD_STATE_ARRAYS = ("normalized", "neighbor_indices", "neighbor_scores")
+
+
+class BuildState:
+    """Word list, normalized embeddings and neighbor table of a previous build."""
+
+    def __init__(self, words: List[str], k_neighbors: int, normalized: np.ndarray,
+                 neighbor_indices: np.ndarray, neighbor_scores: np.ndarray):
+        self.words = words
+        self.word_ids = {word: i for i, word in enumerate(words)}
+        self.k_neighbors = k_neighbors
+        self.normalized = normalized
+        self.neighbor_indices = neighbor_indices
+        self.neighbor_scores = neighbor_scores
+
+    def previous_ids(self, words: List[str], normalized: np.ndarray) -> np.ndarray:
+        """
+        Previous id of each new word, or -1 if the word is new or its
+        normalized embedding differs from the previous build.
+        """
+        ids = np.array([self.word_ids.get(word, -1) for word in words], dtype=np.int64)
+        known = np.nonzero(ids >= 0)[0]
+        changed = (self.normalized[ids[known]] != normalized[known]).any(axis=1)
+        ids[known[changed]] = -1
+        return ids
+
+
+def load_build_state(state_dir=BUILD_STATE_DIR) -> Optional[BuildState]:
+    """The saved build state, or None if there is none (or it is from another format version)."""
+    state_dir = os.fspath(state_dir)
+    manifest = read_manifest(os.path.join(state_dir, "manifest.json"), BUILD_STATE_VERSION)
+    if manifest is None:
+        return None
+    try:
+        with open(os.path.join(state_dir, "words.json"), 'r') as f:
+            words = json.load(f)
+        arrays = {name: np.load(os.path.join(state_dir, f"{name}.npy"), mmap_mode='r')
+                  for name in BUILD_STATE_ARRAYS}
+    except (OSError, ValueError):
+        return None
+    return BuildState(words, manifest["k_neighbors"], **arrays)
+
+
+def save_build_state(words: List[str], k_neighbors: int, normalized: np.ndarray,
+                     neighbor_indices: np.ndarray, neighbor_scores: np.ndarray,
+                     state_dir=BUILD_STATE_DIR) -> None:
+    """Save this build's state for the next incremental build."""
+    state_dir = os.fspath(state_dir)
+    os.makedirs(state_dir, exist_ok=True)
+    manifest_path = os.path.join(state_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    arrays = {"normalized": normalized, "neighbor_indices": neighbor_indices,
+              "neighbor_scores": neighbor_scores}
+    for name in BUILD_STATE_ARRAYS:
+        # Replace rather than overwrite: the previous state may still be memory-mapped
+        tmp_path = os.path.join(state_dir, f"{name}.tmp{os.getpid()}.npy")
+        np.save(tmp_path, np.ascontiguousarray(arrays[name]))
+        os.replace(tmp_path, os.path.join(state_dir, f"{name}.npy"))
+    write_json_atomic(os.path.join(state_dir, "words.json"), words)
+    write_json_atomic(manifest_path, {"version": BUILD_STATE_VERSION, "k_neighbors": k_neighbors,
+                                      "num_words": len(words)})
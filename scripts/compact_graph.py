@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from word_graph import COMPACT_TSNE_DECIMALS, COMPACT_WEIGHT_SCALE, WordGraph, load_graph, write_compact_json
+
+# Export graph.json in the compact indexed format (see word_graph.py) and verify
+# that the export is equivalent: same words, same neighbors in the same order,
+# weights and t-SNE within their rounding, and the same shortest-path lengths
+# for every daily challenge (plus optional random pairs).
+
+# --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+GRAPH_PATH = PROJECT_ROOT / "src" / "data" / "graph.json"
+DAILY_CHALLENGES_PATH = PROJECT_ROOT / "src" / "data" / "daily_challenges.json"
+
+
+def compact_path_for(graph_path) -> str:
+    """Default compact export path: graph.json -> graph.compact.json."""
+    root, ext = os.path.splitext(os.fspath(graph_path))
+    return f"{root}.compact{ext}"
+
+
+def compare_structure(graph: WordGraph, compact: WordGraph, weight_scale: int) -> List[str]:
+    """Differences in words, neighbors, weights and t-SNE coordinates."""
+    if graph.words != compact.words:
+        return ["word tables differ"]
+    problems = []
+    if not (np.array_equal(graph.indptr, compact.indptr) and np.array_equal(graph.indices, compact.indices)):
+        problems.append("neighbor lists differ")
+    else:
+        weight_error = np.abs(graph.weights.astype(np.float64) - compact.weights).max(initial=0.0)
+        if weight_error > 0.5 / weight_scale + 1e-7:
+            problems.append(f"weights differ by up to {weight_error:.2e}")
+    same_missing = np.array_equal(np.isnan(graph.tsne), np.isnan(compact.tsne))
+    tsne_error = np.nanmax(np.abs(graph.tsne - compact.tsne), initial=0.0)
+    if not same_missing or tsne_error > 0.5 * 10 ** -COMPACT_TSNE_DECIMALS + 1e-4:
+        problems.append("t-SNE coordinates differ")
+    return problems
+
+
+def compare_path_lengths(graph: WordGraph, compact: WordGraph,
+                         pairs: List[Tuple[str, str]]) -> List[Tuple[str, str, int, int]]:
+    """Pairs whose shortest-path length differs between the two graphs."""
+    mismatches = []
+    for start_word, target_word in pairs:
+        expected = graph.path_length(start_word, target_word)
+        actual = compact.path_length(start_word, target_word)
+        if expected != actual:
+            mismatches.append((start_word, target_word, expected, actual))
+    return mismatches
+
+
+def verify(graph_path, compact_path, challenges_path, num_random_pairs: int = 0, seed: int = 42) -> bool:
+    """Check the compact export against graph.json. Returns True if they are equivalent."""
+    # Plain Dijkstra on both sides: an atlas would only answer for graph.json
+    graph = load_graph(graph_path, use_atlas=False)
+    compact = load_graph(compact_path, use_atlas=False)
+    with open(compact_path, 'r') as f:
+        weight_scale = json.load(f)["weightScale"]
+
+    problems = compare_structure(graph, compact, weight_scale)
+    for problem in problems:
+        print(f"  {problem}")
+
+    with open(challenges_path, 'r') as f:
+        challenges = json.load(f)["challenges"]
+    pairs = [(c["startWord"], c["targetWord"]) for c in challenges]
+    rng = random.Random(seed)
+    pairs += [tuple(rng.sample(graph.words, 2)) for _ in range(num_random_pairs)]
+
+    mismatches = compare_path_lengths(graph, compact, pairs)
+    for start_word, target_word, expected, actual in mismatches:
+        print(f"  {start_word} -> {target_word}: graph.json {expected}, compact {actual}")
+
+    print(f"Compared {len(graph)} words and {len(pairs)} shortest paths "
+          f"({len(challenges)} daily challenges, {num_random_pairs} random pairs): "
+          f"{len(problems)} structural differences, {len(mismatches)} path length mismatches")
+    print(f"Size: {os.path.getsize(graph_path) / 1024:.0f} KB -> {os.path.getsize(compact_path) / 1024:.0f} KB")
+    return not problems and not mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export or verify the compact indexed graph format')
+    parser.add_argument('command', choices=['export', 'verify'],
+                        help='export: write the compact file from graph.json; verify: compare the two')
+    parser.add_argument('--graph', default=str(GRAPH_PATH), help='Path to graph.json')
+    parser.add_argument('--compact', default=None, help='Compact file (default: graph.compact.json next to the graph)')
+    parser.add_argument('--challenges', default=str(DAILY_CHALLENGES_PATH),
+                        help='Daily challenges whose path lengths must match')
+    parser.add_argument('--weight-scale', type=int, default=COMPACT_WEIGHT_SCALE,
+                        help='Weights are stored as round(similarity * scale)')
+    parser.add_argument('--pairs', type=int, default=0, help='Extra random word pairs to compare')
+    args = parser.parse_args()
+
+    compact_path = args.compact or compact_path_for(args.graph)
+    if args.command == 'export':
+        write_compact_json(load_graph(args.graph, use_atlas=False), compact_path, args.weight_scale)
+        print(f"Compact graph written to {compact_path}")
+    else:
+        sys.exit(0 if verify(args.graph, compact_path, args.challenges, args.pairs) else 1)
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from word_graph import write_json_atomic
+
+# Persistent cache of WordNet definitions for build_graph.py and
+# generate_definitions.py.
+#
+# Each combination of WordNet version, max definitions per word and max
+# definition length gets its own JSON file under data/definition_cache/,
+# mapping word -> definitions (an empty list records "no definition", so
+# misses are cached too). Only words missing from that file are looked up,
+# spread over a process pool, so rebuilding after a word list edit only
+# queries WordNet for the new words.
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFINITION_CACHE_DIR = PROJECT_ROOT / "data" / "definition_cache"
+CACHE_FORMAT_VERSION = 1
+WORDS_PER_TASK = 200
+
+
+def _wordnet():
+    """Load the WordNet corpus reader, exiting with download instructions if it is missing."""
+    from nltk.corpus import wordnet as wn
+    try:
+        wn.ensure_loaded()
+    except LookupError:
+        print("WordNet corpus not found. Please ensure NLTK data is downloaded.")
+        print("Run: python -c \"import nltk; nltk.download('wordnet'); nltk.download('omw-1.4')\"")
+        sys.exit(1)
+    return wn
+
+
+def wordnet_version() -> str:
+    """Version of the installed WordNet corpus (part of every cache file name)."""
+    return _wordnet().get_version()
+
+
+def wordnet_definitions(wn, word: str, max_definitions: int, max_length: Optional[int] = None) -> List[str]:
+    """
+    Up to max_definitions non-empty synset definitions for word, skipping those
+    longer than max_length characters (when given).
+    """
+    definitions = [s.definition() for s in wn.synsets(word) if s.definition()]
+    if max_length is not None:
+        definitions = [d for d in definitions if len(d) <= max_length]
+    return definitions[:max_definitions]
+
+
+def cache_path_for(wordnet_version: str, max_definitions: int, max_length: Optional[int],
+                   cache_dir=DEFINITION_CACHE_DIR) -> str:
+    """Cache file for one WordNet version and definition settings."""
+    length = "any" if max_length is None else str(max_length)
+    return os.path.join(os.fspath(cache_dir),
+                        f"wordnet-{wordnet_version}_defs{max_definitions}_len{length}.json")
+
+
+# --- Worker pool ---
+
+_worker_wordnet = None
+
+
+def _init_worker() -> None:
+    global _worker_wordnet
+    if _worker_wordnet is None:
+        _worker_wordnet = _wordnet()
+
+
+def _lookup_chunk(args: Tuple[List[str], int, Optional[int]]) -> Dict[str, List[str]]:
+    words, max_definitions, max_length = args
+    return {word: wordnet_definitions(_worker_wordnet, word, max_definitions, max_length) for word in words}
+
+
+def lookup_definitions(words: List[str], max_definitions: int, max_length: Optional[int] = None,
+                       cache_dir=DEFINITION_CACHE_DIR, workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Definitions for every word (an empty list when WordNet has none), reading
+    the on-disk cache and looking up only the missing words.
+
+    Args:
+        words: Words to define.
+        max_definitions: Max definitions kept per word.
+        max_length: Max characters per definition, or None for no limit.
+        cache_dir: Directory holding the cache files.
+        workers: Worker processes for cache misses (default: CPU count).
+    """
+    global _worker_wordnet
+    wn = _wordnet()
+    cache_path = cache_path_for(wn.get_version(), max_definitions, max_length, cache_dir)
+
+    cached = {}
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+        if data.get("version") == CACHE_FORMAT_VERSION:
+            cached = data["definitions"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    missing = list(dict.fromkeys(word for word in words if word not in cached))
+    print(f"Definition cache: {len(words) - len(missing)} hits, {len(missing)} words to look up ({cache_path})")
+    if missing:
+        # Forked workers inherit the loaded corpus; spawned ones load it in _init_worker
+        _worker_wordnet = wn
+        tasks = [(missing[i:i + WORDS_PER_TASK], max_definitions, max_length)
+                 for i in range(0, len(missing), WORDS_PER_TASK)]
+        workers = max(1, min(workers or cpu_count(), len(tasks)))
+        with Pool(processes=workers, initializer=_init_worker) as pool:
+            for done, chunk in enumerate(pool.imap_unordered(_lookup_chunk, tasks), 1):
+                cached.update(chunk)
+                if done % 10 == 0 or done == len(tasks):
+                    print(f"  Looked up {min(done * WORDS_PER_TASK, len(missing))}/{len(missing)} words...")
+
+        os.makedirs(os.fspath(cache_dir), exist_ok=True)
+        write_json_atomic(cache_path, {"version": CACHE_FORMAT_VERSION, "definitions": cached})
+
+    return {word: cached[word] for word in words}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from embedding_store import open_embeddings
+
+    parser = argparse.ArgumentParser(description='Fill the WordNet definition cache for every word in an embedding store')
+    parser.add_argument('command', choices=['warm'], help='warm: look up all words missing from the cache')
+    parser.add_argument('--embeddings', default=os.path.join(PROJECT_ROOT, "database", "raw_data", "embeddings"),
+                        help='Embedding store directory whose words to define')
+    parser.add_argument('--max-definitions', type=int, default=3, help='Max definitions kept per word')
+    parser.add_argument('--max-length', type=int, default=None, help='Max characters per definition')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for cache misses')
+    args = parser.parse_args()
+
+    words = open_embeddings(args.embeddings).words
+    lookup_definitions(words, args.max_definitions, args.max_length, workers=args.workers)
@@ -0,0 +1,120 @@
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from embedding_checkpoint import CHECKPOINT_VERSION, ShardStore
+from word_graph import read_manifest, write_json_atomic
+
+# Persistent, content-addressed cache of fetched embeddings for
+# generate_embeddings_ollama.py.
+#
+# Entries are keyed by SHA-256 of (model name, model digest, normalized word),
+# so switching MODEL_NAME, pulling a new build of the same tag or editing
+# words.txt only fetches what was never embedded before. Every model variant
+# gets its own directory, so several coexist side by side:
+#     database/raw_data/embedding_cache/<model>@<digest[:12]>.<endpoint>/
+# holding append-only shards in the embedding_checkpoint.py format (with the
+# entry keys in place of words). The endpoint is part of the variant because
+# /api/embed returns L2-normalized vectors and /api/embeddings does not.
+# Nothing is ever deleted: keys carry the full model name and digest, so a
+# directory shared by two variants (or with a torn manifest) still only
+# answers lookups with the right variant's entries.
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+EMBEDDING_CACHE_DIR = os.path.join(PROJECT_ROOT, "database", "raw_data", "embedding_cache")
+CACHE_SHARD_SIZE = 5000
+
+
+def normalize_word(word: str) -> str:
+    """Cache form of a word: Unicode NFC with surrounding whitespace stripped and inner runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", word).split())
+
+
+def cache_key(model: str, digest: str, word: str) -> str:
+    """Content address of one embedding."""
+    return hashlib.sha256(f"{model}\0{digest}\0{normalize_word(word)}".encode("utf-8")).hexdigest()
+
+
+def model_digest(tags: Dict, model: str) -> Optional[str]:
+    """Digest of model in an Ollama /api/tags response, or None if it is not listed."""
+    for entry in tags.get("models", []):
+        if model in (entry.get("name"), entry.get("model")) and entry.get("digest"):
+            return entry["digest"]
+    return None
+
+
+def variant_dir_for(model: str, digest: str, endpoint: str, cache_root: str = EMBEDDING_CACHE_DIR) -> str:
+    """Cache directory of one model variant."""
+    slug = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+    return os.path.join(cache_root, f"{slug}@{digest.split(':')[-1][:12]}.{endpoint}")
+
+
+class EmbeddingCache(ShardStore):
+    """Cached embeddings of one model variant, looked up by word."""
+
+    def __init__(self, model: str, digest: str, endpoint: str, cache_root: str = EMBEDDING_CACHE_DIR):
+        """
+        Args:
+            model: Model name as sent to the server.
+            digest: Model digest reported by /api/tags.
+            endpoint: "embed" or "embeddings", the API the vectors come from.
+            cache_root: Directory holding every variant.
+        """
+        super().__init__(variant_dir_for(model, digest, endpoint, cache_root), CACHE_SHARD_SIZE)
+        self.model = model
+        self.digest = digest
+        variant = f"{model}@{digest}/{endpoint}"
+        manifest_path = os.path.join(self.checkpoint_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            write_json_atomic(manifest_path, {"version": CHECKPOINT_VERSION, "model": variant})
+        else:
+            manifest = read_manifest(manifest_path, CHECKPOINT_VERSION)
+            if manifest is None:
+                print(f"Warning: Ignoring unreadable embedding cache manifest {manifest_path}.", file=sys.stderr)
+            elif manifest.get("model") != variant:
+                print(f"Warning: {self.checkpoint_dir} also holds embeddings of {manifest.get('model')}; "
+                      f"keeping them alongside {variant}.", file=sys.stderr)
+        self._load_shards()
+        self._continue_numbering()
+
+    def get(self, word: str) -> Optional[np.ndarray]:
+        return self.embeddings.get(cache_key(self.model, self.digest, word))
+
+    def lookup(self, words: List[str]) -> Dict[str, np.ndarray]:
+        """Cached embeddings for the words that have one."""
+        found = {}
+        for word in words:
+            embedding = self.get(word)
+            if embedding is not None:
+                found[word] = embedding
+        return found
+
+    def put(self, word: str, embedding: np.ndarray) -> None:
+        """Add one embedding (buffered until flush or CACHE_SHARD_SIZE entries)."""
+        self.add(cache_key(self.model, self.digest, word), embedding)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Inspect the embedding cache')
+    parser.add_argument('command', choices=['list'], help='list: cached model variants and entry counts')
+    parser.add_argument('--cache-dir', default=EMBEDDING_CACHE_DIR, help='Embedding cache directory')
+    args = parser.parse_args()
+
+    for variant_dir in sorted(glob.glob(os.path.join(args.cache_dir, "*"))):
+        manifest = read_manifest(os.path.join(variant_dir, "manifest.json"), CHECKPOINT_VERSION)
+        if manifest is None:
+            continue
+        entries = 0
+        for shard_path in glob.glob(os.path.join(variant_dir, "shard_*.npz")):
+            with np.load(shard_path) as shard:
+                entries += len(shard["words"])
+        print(f"{manifest['model']}: {entries} embeddings ({variant_dir})")
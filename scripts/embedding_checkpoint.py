@@ -0,0 +1,120 @@
+import glob
+import os
+import shutil
+import sys
+import threading
+import zipfile
+from typing import Dict, List
+
+import numpy as np
+
+from word_graph import read_manifest, write_json_atomic
+
+# Append-only checkpoint for long generate_embeddings_ollama.py runs.
+#
+# Fetched embeddings are buffered and flushed every shard_size words as a new
+# shard file; a shard is written to a temporary name and renamed into place,
+# so a crash loses at most the unflushed buffer and never leaves a torn shard:
+#     manifest.json      format version and embedding model variant
+#     shard_00000.npz    words + float32 embeddings of one flush
+# A resumed run loads every shard and only fetches the words not in them; the
+# final compaction assembles the embedding matrix in word-list order.
+# ShardStore is the shard I/O alone, shared with the persistent embedding
+# cache (embedding_cache.py); only EmbeddingCheckpoint discards stale shards.
+
+CHECKPOINT_VERSION = 1
+DEFAULT_SHARD_SIZE = 500
+
+
+class ShardStore:
+    """Append-only shard files in one directory plus an in-memory view of every entry."""
+
+    def __init__(self, checkpoint_dir: str, shard_size: int = DEFAULT_SHARD_SIZE):
+        self.checkpoint_dir = checkpoint_dir
+        self.shard_size = shard_size
+        self.embeddings: Dict[str, np.ndarray] = {}
+        self._pending_words: List[str] = []
+        self._pending_vectors: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self._next_shard = 0
+
+    def __len__(self) -> int:
+        return len(self.embeddings)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.embeddings
+
+    def _shard_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.checkpoint_dir, "shard_[0-9][0-9][0-9][0-9][0-9].npz")))
+
+    def _load_shards(self) -> None:
+        for path in self._shard_paths():
+            try:
+                with np.load(path) as shard:
+                    words, vectors = shard["words"], shard["embeddings"]
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                print(f"Warning: Skipping unreadable checkpoint shard {path}: {e}", file=sys.stderr)
+                continue
+            for word, vector in zip(words.tolist(), vectors):
+                self.embeddings[word] = vector
+
+    def _continue_numbering(self) -> None:
+        self._next_shard = max((int(os.path.basename(path)[6:11]) for path in self._shard_paths()), default=-1) + 1
+
+    def add(self, word: str, embedding: np.ndarray) -> None:
+        """Record one fetched embedding (thread-safe); flushes a shard every shard_size words."""
+        with self._lock:
+            self.embeddings[word] = embedding
+            self._pending_words.append(word)
+            self._pending_vectors.append(embedding)
+            if len(self._pending_words) >= self.shard_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write any buffered embeddings as a shard."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending_words:
+            return
+        shard_path = os.path.join(self.checkpoint_dir, f"shard_{self._next_shard:05d}.npz")
+        tmp_path = os.path.join(self.checkpoint_dir, f"shard.tmp{os.getpid()}.npz")
+        np.savez(tmp_path, words=np.array(self._pending_words),
+                 embeddings=np.stack(self._pending_vectors).astype(np.float32))
+        os.replace(tmp_path, shard_path)
+        self._next_shard += 1
+        self._pending_words = []
+        self._pending_vectors = []
+
+
+class EmbeddingCheckpoint(ShardStore):
+    """Shard files of fetched embeddings for one run; a stale checkpoint is discarded."""
+
+    def __init__(self, checkpoint_dir: str, model: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                 resume: bool = False):
+        """
+        Args:
+            checkpoint_dir: Directory holding the shards.
+            model: Embedding model variant, e.g. "<model>/<endpoint>"; a checkpoint
+                from another variant is discarded.
+            shard_size: Words per shard (the most a crash can lose).
+            resume: Keep the shards already in checkpoint_dir instead of starting over.
+        """
+        super().__init__(checkpoint_dir, shard_size)
+        manifest = read_manifest(os.path.join(checkpoint_dir, "manifest.json"), CHECKPOINT_VERSION)
+        if resume and manifest is not None and manifest.get("model") != model:
+            print(f"Checkpoint in {checkpoint_dir} is for model {manifest.get('model')}; starting over.")
+            manifest = None
+        if resume and manifest is not None:
+            self._load_shards()
+        else:
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+            os.makedirs(checkpoint_dir)
+            write_json_atomic(os.path.join(checkpoint_dir, "manifest.json"),
+                              {"version": CHECKPOINT_VERSION, "model": model})
+        self._continue_numbering()
+
+    def remove(self) -> None:
+        """Delete the checkpoint once its embeddings are in the embedding store."""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from word_graph import read_manifest, write_json_atomic
+
+# On-disk embedding store replacing the pickled {word: np.ndarray} dict.
+#
+# A store is a directory holding one contiguous matrix plus its word index:
+#     embeddings.npy   (N, d) matrix, row i is the embedding of words[i]
+#     scales.npy       per-row float32 scales (int8 stores only)
+#     words.json       word list
+#     manifest.json    format version, dtype, N and d
+# float32 stores are memory-mapped and handed out without a copy; float16
+# halves and int8 (symmetric, one scale per row) quarters the file size.
+
+STORE_FORMAT_VERSION = 1
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+
+class EmbeddingStore:
+    """Word index plus (usually memory-mapped) embedding matrix."""
+
+    def __init__(self, words: List[str], matrix: np.ndarray, scales: Optional[np.ndarray] = None):
+        """
+        Args:
+            words: Word for each row of matrix.
+            matrix: (N, d) float32, float16 or int8 matrix.
+            scales: Per-row scales for an int8 matrix.
+        """
+        self.words = words
+        self.word_ids: Dict[str, int] = {word: i for i, word in enumerate(words)}
+        self.matrix = matrix
+        self.scales = scales
+
+    @classmethod
+    def open(cls, store_dir: str) -> "EmbeddingStore":
+        """Open a store directory written by write_embedding_store (memory-mapped)."""
+        manifest = read_manifest(os.path.join(store_dir, "manifest.json"), STORE_FORMAT_VERSION)
+        if manifest is None:
+            raise FileNotFoundError(f"No embedding store at {store_dir}")
+        with open(os.path.join(store_dir, "words.json"), 'r') as f:
+            words = json.load(f)
+        matrix = np.load(os.path.join(store_dir, "embeddings.npy"), mmap_mode='r')
+        scales = None
+        if manifest["dtype"] == "int8":
+            scales = np.load(os.path.join(store_dir, "scales.npy"), mmap_mode='r')
+        return cls(words, matrix, scales)
+
+    @classmethod
+    def from_pickle(cls, path: str) -> "EmbeddingStore":
+        """Load a legacy embeddings.pkl ({word: vector}) into memory."""
+        with open(path, 'rb') as f:
+            embeddings_dict = pickle.load(f)
+        words = list(embeddings_dict.keys())
+        return cls(words, np.stack([np.asarray(embeddings_dict[word], dtype=np.float32) for word in words]))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_ids
+
+    @property
+    def dtype(self) -> str:
+        return self.matrix.dtype.name
+
+    def vectors(self, rows=None) -> np.ndarray:
+        """
+        float32 embeddings for the given row ids (default: all rows). A float32
+        store returns the memory-mapped matrix itself when all rows are requested.
+        """
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        if matrix.dtype == np.float32:
+            return matrix
+        vectors = matrix.astype(np.float32)
+        if self.scales is not None:
+            vectors *= (self.scales if rows is None else self.scales[rows])[:, np.newaxis]
+        return vectors
+
+    def vector(self, word: str) -> np.ndarray:
+        """float32 embedding of one word (KeyError if unknown)."""
+        return self.vectors([self.word_ids[word]])[0]
+
+
+def write_embedding_store(store_dir: str, words: List[str], matrix: np.ndarray, dtype: str = "float32") -> None:
+    """
+    Write words and their (N, d) embeddings as a store, quantized to dtype.
+
+    Args:
+        store_dir: Output directory (created if needed).
+        words: Word for each row of matrix.
+        matrix: Embeddings, any float dtype.
+        dtype: "float32", "float16" or "int8".
+    """
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unknown embedding dtype '{dtype}', expected one of {EMBEDDING_DTYPES}")
+    matrix = np.asarray(matrix, dtype=np.float32)
+    os.makedirs(store_dir, exist_ok=True)
+    manifest_path = os.path.join(store_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    arrays = {}
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        arrays["embeddings"] = np.rint(matrix / scales[:, np.newaxis]).astype(np.int8)
+        arrays["scales"] = scales.astype(np.float32)
+    else:
+        arrays["embeddings"] = matrix.astype(dtype)
+    for name, array in arrays.items():
+        # Replace rather than overwrite: a reader may still have the old file mapped
+        tmp_path = os.path.join(store_dir, f"{name}.tmp{os.getpid()}.npy")
+        np.save(tmp_path, array)
+        os.replace(tmp_path, os.path.join(store_dir, f"{name}.npy"))
+
+    write_json_atomic(os.path.join(store_dir, "words.json"), list(words))
+    write_json_atomic(manifest_path, {"version": STORE_FORMAT_VERSION, "dtype": dtype,
+                                      "num_words": len(words), "dim": int(matrix.shape[1])})
+
+
+def open_embeddings(store_dir: str, legacy_pickle_path: Optional[str] = None) -> EmbeddingStore:
+    """
+    Open the embedding store, falling back to a legacy embeddings.pkl when the
+    store has not been written yet. Exits with a message if neither exists.
+    """
+    try:
+        return EmbeddingStore.open(store_dir)
+    except FileNotFoundError:
+        pass
+    if legacy_pickle_path and os.path.exists(legacy_pickle_path):
+        print(f"No embedding store at {store_dir}; reading legacy {legacy_pickle_path} "
+              f"(convert it with: python scripts/embedding_store.py convert {legacy_pickle_path} {store_dir})")
+        return EmbeddingStore.from_pickle(legacy_pickle_path)
+    print(f"Error: No embedding store found at {store_dir}", file=sys.stderr)
+    print("Please run scripts/generate_embeddings_ollama.py first.", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert a legacy embeddings.pkl into an embedding store')
+    parser.add_argument('command', choices=['convert'], help='convert: pickle -> store directory')
+    parser.add_argument('pickle_path', help='Legacy {word: vector} pickle')
+    parser.add_argument('store_dir', help='Output store directory')
+    parser.add_argument('--dtype', choices=EMBEDDING_DTYPES, default="float32", help='Stored precision')
+    args = parser.parse_args()
+
+    store = EmbeddingStore.from_pickle(args.pickle_path)
+    write_embedding_store(args.store_dir, store.words, store.matrix, args.dtype)
+    print(f"Wrote {len(store)} embeddings ({args.dtype}) to {args.store_dir}")
@@ -1,15 +1,22 @@
+import argparse
 import json
 import random
 import os
 import sys
 from collections import deque
-from multiprocessing import Pool, cpu_count, Manager, Lock
+from multiprocessing import Pool, cpu_count, Lock
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 
-# Assuming graph.json is in ../client/public/data/graph.json relative to this script's location
-GRAPH_PATH = "../client/public/data/graph.json"
-OUTPUT_PATH = "../src/data/playtest_pairs.json"  # Changed output path
+import numpy as np
+
+import word_graph
+from word_graph import WordGraph, source_fingerprint
+
+# Resolved from the project root (run_pipeline.py reads these too)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRAPH_PATH = os.path.join(PROJECT_ROOT, "client", "public", "data", "graph.json")
+OUTPUT_PATH = os.path.join(PROJECT_ROOT, "src", "data", "playtest_pairs.json")  # Changed output path
 
 # Constraints (matching useGameStore.ts)
 MIN_PATH_LENGTH = 4  # 4 steps (5 nodes)
@@ -27,6 +34,8 @@ PAIRS_PER_PATH_LENGTH = {
 }
 TARGET_PATH_LENGTHS = [4, 5]  # Only 4-5 step paths
 CHUNK_SIZE = 10  # Increased chunk size for efficiency
+BATCH_START_WORDS = 256  # Start words per multi-source shortest-path pass (--batched)
+CANDIDATES_SUFFIX = ".pairs.npz"  # Enumerated candidate pairs, stored next to the graph (--enumerate)
 
 # Global lock for thread-safe printing
 print_lock = Lock()
@@ -36,74 +45,19 @@ def safe_print(*args, **kwargs):
     with print_lock:
         print(*args, **kwargs)
 
-def load_graph(path):
-    """Loads the graph data from a JSON file."""
-    if not os.path.exists(path):
-        print(f"Error: Graph file not found at {path}")
-        print("Please ensure build_graph.py has been run and the path is correct.")
-        sys.exit(1)
-    with open(path, 'r') as f:
-        return json.load(f)["nodes"]
+def load_graph(path) -> WordGraph:
+    """Loads the graph data from a JSON file as a compiled WordGraph (with its path atlas, if built)."""
+    return word_graph.load_graph(path)
 
-def find_shortest_path(graph, start_node, end_node):
+def find_shortest_path(graph: WordGraph, start_node, end_node):
     """Finds the shortest path between start_node and end_node using Dijkstra's algorithm with semantic distances."""
     if start_node not in graph or end_node not in graph:
         print(f"find_shortest_path: Invalid graph data or start/end words (start={start_node}, end={end_node})")
         return []
     
-    # Initialize distances and previous nodes
-    distances = {node: float('infinity') for node in graph}
-    previous_nodes = {node: None for node in graph}
-    visited = set()  # Track visited nodes
-    unvisited = set(graph.keys())
-    distances[start_node] = 0
-    
-    while unvisited:
-        # Find unvisited node with smallest distance
-        current = None
-        min_distance = float('infinity')
-        for node in unvisited:
-            if distances[node] < min_distance:
-                min_distance = distances[node]
-                current = node
-        
-        # If all remaining unvisited nodes are inaccessible, or if we reached end node
-        if current is None or distances[current] == float('infinity') or current == end_node:
-            break
-            
-        unvisited.remove(current)
-        visited.add(current)  # Mark as visited
-        
-        # Update distances for neighbors
-        edges = graph[current].get("edges", {})
-        for neighbor, similarity in edges.items():
-            # Skip if neighbor has been visited
-            if neighbor in visited:
-                continue
-                
-            # Convert similarity to cost (higher similarity = lower cost)
-            cost = 1 - similarity
-            distance_through_current = distances[current] + cost
-            
-            if distance_through_current < distances[neighbor]:
-                distances[neighbor] = distance_through_current
-                previous_nodes[neighbor] = current
-    
-    # Reconstruct path if end is reachable
-    if distances[end_node] == float('infinity'):
+    path = graph.shortest_path(start_node, end_node)
+    if not path:
         print(f"No path found from {start_node} to {end_node}")
-        return []
-        
-    # Trace back from end to start
-    path = []
-    current = end_node
-    while current is not None:
-        path.insert(0, current)  # Use insert(0) instead of append + reverse
-        current = previous_nodes[current]
-        if current == start_node:
-            path.insert(0, start_node)
-            break
-    
     return path
 
 def generate_valid_pair(graph, words_list, used_start_words, used_target_words, target_path_length=None):
@@ -127,34 +81,27 @@ def generate_valid_pair(graph, words_list, used_start_words, used_target_words,
         if start_word in used_start_words or end_word in used_target_words:
             continue
 
-        start_node_data = graph.get(start_word)
-        end_node_data = graph.get(end_word)
-
-        if not start_node_data or not end_node_data:
+        if start_word not in graph or end_word not in graph:
             continue
 
         # 1. Check t-SNE distance - more lenient for shorter paths
-        if "tsne" in start_node_data and "tsne" in end_node_data:
-            s_tsne = start_node_data["tsne"]
-            e_tsne = end_node_data["tsne"]
-            if s_tsne and e_tsne and len(s_tsne) == 2 and len(e_tsne) == 2:
-                dx = s_tsne[0] - e_tsne[0]
-                dy = s_tsne[1] - e_tsne[1]
-                dist_squared = dx*dx + dy*dy
-                # Use more lenient distance for shorter paths
-                min_distance = MIN_TSNE_DISTANCE_SQUARED
-                if target_path_length is not None and target_path_length <= 4:
-                    min_distance = (MIN_TSNE_DISTANCE_SQUARED // 2)  # Half the distance for shorter paths
-                if dist_squared < min_distance:
-                    continue
-            else:
-                continue
-        else:
+        s_tsne = graph.tsne_of(start_word)
+        e_tsne = graph.tsne_of(end_word)
+        if s_tsne is None or e_tsne is None:
+            continue
+        dx = s_tsne[0] - e_tsne[0]
+        dy = s_tsne[1] - e_tsne[1]
+        dist_squared = dx*dx + dy*dy
+        # Use more lenient distance for shorter paths
+        min_distance = MIN_TSNE_DISTANCE_SQUARED
+        if target_path_length is not None and target_path_length <= 4:
+            min_distance = (MIN_TSNE_DISTANCE_SQUARED // 2)  # Half the distance for shorter paths
+        if dist_squared < min_distance:
             continue
 
         # 2. Check node degree - more lenient for shorter paths
-        start_degree = len(start_node_data.get("edges", {}))
-        end_degree = len(end_node_data.get("edges", {}))
+        start_degree = graph.degree(start_word)
+        end_degree = graph.degree(end_word)
         min_degree = MIN_NODE_DEGREE
         if target_path_length is not None and target_path_length <= 4:
             min_degree = 1  # Allow single connections for shorter paths
@@ -171,112 +118,344 @@ def generate_valid_pair(graph, words_list, used_start_words, used_target_words,
         
     return None
 
-def generate_chunk(args: Tuple[Dict, List[str], int, dict, dict, dict]) -> List[Dict]:
-    """Generate a chunk of valid pairs in parallel."""
-    graph, words, chunk_size, used_start_words, used_target_words, needed_pairs = args
-    chunk_pairs = []
+# --- Worker pool ---
+
+# Read-only graph shared by pool workers. It is set in the parent before the pool
+# starts, so forked workers inherit it without any pickling; spawned workers
+# reopen it from the memory-mapped graph cache in _init_worker instead. Only
+# NumPy arrays are shared: the searches copy out one node's edges at a time, so
+# workers never write to (and copy) the inherited pages.
+_worker_graph: Optional[WordGraph] = None
+
+def _init_worker(graph_path: str) -> None:
+    global _worker_graph
+    if _worker_graph is None:
+        _worker_graph = load_graph(graph_path)
+
+def generate_candidates(args: Tuple[int, frozenset, frozenset, Tuple[int, ...]]) -> List[Dict]:
+    """
+    Generate candidate pairs in a worker with no shared state.
+
+    Args:
+        args: (number of pair attempts, start words and target words the coordinator
+            had already used when the task was issued, path lengths still needed).
+
+    Returns:
+        Candidate pairs for the coordinator to accept or reject.
+    """
+    attempts, used_start_words, used_target_words, wanted_lengths = args
+    # Local copies so one batch does not reuse its own words either
+    used_start_words = set(used_start_words)
+    used_target_words = set(used_target_words)
+    candidates = []
+
+    for _ in range(attempts):
+        pair_info = generate_valid_pair(_worker_graph, _worker_graph.words, used_start_words, used_target_words)
+        if pair_info and pair_info["pathLength"] in wanted_lengths:
+            candidates.append(pair_info)
+            used_start_words.add(pair_info["startWord"])
+            used_target_words.add(pair_info["targetWord"])
+
+    return candidates
+
+def generate_pairs_pool(graph: WordGraph, graph_path: str) -> List[Dict]:
+    """
+    Generate pairs by random rejection sampling across a worker pool.
+
+    Workers only propose candidates; this process is the single coordinator that
+    applies word uniqueness and the per-length quotas, so quotas are exact and no
+    state is shared between processes. A few tasks are kept in flight and new ones
+    carry the current used words, and no more are issued once quotas are filled.
+    """
+    global _worker_graph
+    _worker_graph = graph
+    graph.adjacency()  # Build the edge cost array once, before the workers fork
+
+    needed_pairs = {length: PAIRS_PER_PATH_LENGTH[length] for length in TARGET_PATH_LENGTHS}
+    used_start_words = set()
+    used_target_words = set()
     generated_pairs = set()
-    
-    while any(count > 0 for count in needed_pairs.values()):
-        pair_info = generate_valid_pair(graph, words, used_start_words, used_target_words)
-        if pair_info:
-            start_word = pair_info["startWord"]
-            target_word = pair_info["targetWord"]
-            path_length = pair_info["pathLength"]
-            
-            # Skip if we don't need more pairs of this length
-            if path_length not in needed_pairs or needed_pairs[path_length] <= 0:
-                continue
-            
-            # Create a unique key for the pair to check for duplicates
-            pair_key = tuple(sorted((start_word, target_word)))
-            if pair_key not in generated_pairs:
+    all_pairs = []
+
+    def next_task():
+        wanted_lengths = tuple(length for length, count in needed_pairs.items() if count > 0)
+        return (CHUNK_SIZE, frozenset(used_start_words), frozenset(used_target_words), wanted_lengths)
+
+    workers = min(cpu_count(), 4)
+    with Pool(processes=workers, initializer=_init_worker, initargs=(graph_path,)) as pool:
+        pending = deque(pool.apply_async(generate_candidates, (next_task(),)) for _ in range(workers * 2))
+
+        while pending and any(count > 0 for count in needed_pairs.values()):
+            for pair_info in pending.popleft().get():
+                start_word = pair_info["startWord"]
+                target_word = pair_info["targetWord"]
+                path_length = pair_info["pathLength"]
+
+                # Skip if we don't need more pairs of this length or a word is already taken
+                if needed_pairs.get(path_length, 0) <= 0:
+                    continue
+                if start_word in used_start_words or target_word in used_target_words:
+                    continue
+
+                # Create a unique key for the pair to check for duplicates
+                pair_key = tuple(sorted((start_word, target_word)))
+                if pair_key in generated_pairs:
+                    continue
+
                 safe_print(f"Found path of length {path_length} from {start_word} to {target_word}")
-                chunk_pairs.append(pair_info)
+                all_pairs.append(pair_info)
                 generated_pairs.add(pair_key)
-                used_start_words[start_word] = True
-                used_target_words[target_word] = True
+                used_start_words.add(start_word)
+                used_target_words.add(target_word)
                 needed_pairs[path_length] -= 1
-                
+
                 # Print progress
                 remaining = sum(needed_pairs.values())
                 if remaining % 5 == 0:  # Print every 5 pairs
-                    safe_print(f"Still need: {dict(needed_pairs)}")
-                
+                    safe_print(f"Still need: {needed_pairs}")
+
                 # If we've found all pairs for this length, print it
                 if needed_pairs[path_length] == 0:
                     safe_print(f"Completed length {path_length}!")
-    
-    return chunk_pairs
 
-def main():
+            if any(count > 0 for count in needed_pairs.values()):
+                pending.append(pool.apply_async(generate_candidates, (next_task(),)))
+        # Leaving the pool terminates workers still busy with tasks nobody needs
+
+    return all_pairs
+
+def generate_pairs_batched(graph: WordGraph, block_size: int = BATCH_START_WORDS,
+                           seed: Optional[int] = None) -> List[Dict]:
+    """
+    Generate pairs from batched multi-source shortest paths.
+
+    Start words are drawn in random blocks; one multi-source pass gives the hop
+    length from every start in the block to every word, and each start then takes
+    a random target that passes the t-SNE, degree and path-length checks. Accepted
+    lengths are confirmed with find_shortest_path, so stored pathLength values
+    always match the single-pair search.
+    """
+    rng = np.random.default_rng(seed)
+    needed_pairs = {length: PAIRS_PER_PATH_LENGTH[length] for length in TARGET_PATH_LENGTHS}
+    tsne = graph.tsne.astype(np.float64)
+
+    # Words usable at either end: enough connections and known t-SNE coordinates
+    eligible = (graph.degrees >= MIN_NODE_DEGREE) & ~np.isnan(tsne).any(axis=1)
+    target_available = eligible.copy()
+    start_order = rng.permutation(np.nonzero(eligible)[0])
+
+    all_pairs = []
+    generated_pairs = set()
+    for block_start in range(0, len(start_order), block_size):
+        if all(count <= 0 for count in needed_pairs.values()):
+            break
+        block = start_order[block_start:block_start + block_size]
+        hops = graph.multi_source_hops(block)
+
+        for row, start_id in enumerate(block):
+            wanted_lengths = [length for length, count in needed_pairs.items() if count > 0]
+            if not wanted_lengths:
+                break
+
+            dist_squared = ((tsne - tsne[start_id]) ** 2).sum(axis=1)
+            candidates = (target_available
+                          & (dist_squared >= MIN_TSNE_DISTANCE_SQUARED)
+                          & np.isin(hops[row], wanted_lengths))
+            candidates[start_id] = False
+            candidate_ids = np.nonzero(candidates)[0]
+            if len(candidate_ids) == 0:
+                continue
+
+            target_id = int(rng.choice(candidate_ids))
+            start_word = graph.words[start_id]
+            target_word = graph.words[target_id]
+            pair_key = tuple(sorted((start_word, target_word)))
+            if pair_key in generated_pairs:
+                continue
+
+            path = find_shortest_path(graph, start_word, target_word)
+            path_length = len(path) - 1 if path else 0
+            if needed_pairs.get(path_length, 0) <= 0:
+                continue
+
+            safe_print(f"Found path of length {path_length} from {start_word} to {target_word}")
+            all_pairs.append({"startWord": start_word, "targetWord": target_word, "pathLength": path_length})
+            generated_pairs.add(pair_key)
+            target_available[target_id] = False
+            needed_pairs[path_length] -= 1
+            if needed_pairs[path_length] == 0:
+                safe_print(f"Completed length {path_length}!")
+
+        safe_print(f"Processed {min(block_start + block_size, len(start_order))}/{len(start_order)} "
+                   f"start words, still need: {needed_pairs}")
+
+    return all_pairs
+
+def candidate_constraints() -> Dict:
+    """Constraints baked into an enumerated candidate set; a change invalidates the file."""
+    return {
+        "min_path_length": MIN_PATH_LENGTH,
+        "max_path_length": MAX_PATH_LENGTH,
+        "min_node_degree": MIN_NODE_DEGREE,
+        "min_tsne_distance_squared": MIN_TSNE_DISTANCE_SQUARED,
+    }
+
+def enumerate_candidates(graph: WordGraph, block_size: int = BATCH_START_WORDS) -> Dict[int, np.ndarray]:
+    """
+    Enumerate every (start, target) pair that passes the t-SNE distance, degree and
+    path-length checks.
+
+    Returns:
+        Path length -> int32 array of (start id, target id) rows, in id order.
+    """
+    tsne = graph.tsne.astype(np.float64)
+    eligible = (graph.degrees >= MIN_NODE_DEGREE) & ~np.isnan(tsne).any(axis=1)
+    start_ids = np.nonzero(eligible)[0]
+    lengths = range(MIN_PATH_LENGTH, MAX_PATH_LENGTH + 1)
+    buckets = {length: [] for length in lengths}
+
+    for block_start in range(0, len(start_ids), block_size):
+        block = start_ids[block_start:block_start + block_size]
+        hops = graph.multi_source_hops(block)
+        dist_squared = ((tsne[block][:, None, :] - tsne[None, :, :]) ** 2).sum(axis=2)
+        valid = eligible[None, :] & (dist_squared >= MIN_TSNE_DISTANCE_SQUARED)
+        for length in lengths:
+            rows, targets = np.nonzero(valid & (hops == length))
+            buckets[length].append(np.column_stack((block[rows], targets)).astype(np.int32))
+        safe_print(f"Enumerated {min(block_start + block_size, len(start_ids))}/{len(start_ids)} start words...")
+
+    return {
+        length: np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int32)
+        for length, parts in buckets.items()
+    }
+
+def load_or_enumerate_candidates(graph: WordGraph, graph_path: str, rebuild: bool = False) -> Dict[int, np.ndarray]:
+    """Load the persisted candidate set for graph_path, enumerating and saving it when missing or stale."""
+    candidates_path = os.fspath(graph_path) + CANDIDATES_SUFFIX
+    meta = {"graph_sha256": source_fingerprint(os.fspath(graph_path))["sha256"],
+            "constraints": candidate_constraints()}
+
+    if not rebuild and os.path.exists(candidates_path):
+        with np.load(candidates_path) as data:
+            if json.loads(str(data["meta"])) == meta:
+                candidates = {length: data[f"length_{length}"].astype(np.int32)
+                              for length in range(MIN_PATH_LENGTH, MAX_PATH_LENGTH + 1)}
+                safe_print(f"Loaded candidate pairs from {candidates_path}")
+                return candidates
+        safe_print(f"Candidate pairs at {candidates_path} are stale, re-enumerating...")
+
+    candidates = enumerate_candidates(graph)
+    # Word ids fit in uint16 for vocabularies up to 65536 words
+    id_dtype = np.uint16 if len(graph) <= np.iinfo(np.uint16).max + 1 else np.int32
+    arrays = {f"length_{length}": pairs.astype(id_dtype) for length, pairs in candidates.items()}
+    np.savez_compressed(candidates_path, meta=np.array(json.dumps(meta)), **arrays)
+    safe_print(f"Saved candidate pairs to {candidates_path}")
+    return candidates
+
+def sample_pairs_from_candidates(graph: WordGraph, candidates: Dict[int, np.ndarray],
+                                 seed: Optional[int] = None) -> List[Dict]:
+    """
+    Fill PAIRS_PER_PATH_LENGTH directly from the enumerated candidates.
+
+    Each length bucket is visited in a seeded random order, skipping pairs whose start
+    or target word is already used, so the same candidates and seed always give the
+    same pairs.
+    """
+    rng = np.random.default_rng(seed)
+    used_start = np.zeros(len(graph), dtype=bool)
+    used_target = np.zeros(len(graph), dtype=bool)
+    generated_pairs = set()
+    all_pairs = []
+
+    for length in TARGET_PATH_LENGTHS:
+        needed = PAIRS_PER_PATH_LENGTH[length]
+        bucket = candidates.get(length, np.empty((0, 2), dtype=np.int32))
+        safe_print(f"Sampling {needed} pairs of length {length} from {len(bucket)} candidates...")
+
+        for start_id, target_id in bucket[rng.permutation(len(bucket))]:
+            if needed <= 0:
+                break
+            if used_start[start_id] or used_target[target_id]:
+                continue
+            start_word = graph.words[start_id]
+            target_word = graph.words[target_id]
+            pair_key = tuple(sorted((start_word, target_word)))
+            if pair_key in generated_pairs:
+                continue
+            # Confirm against the single-pair search (batched hops may break exact cost ties differently)
+            path = find_shortest_path(graph, start_word, target_word)
+            if len(path) - 1 != length:
+                continue
+
+            all_pairs.append({"startWord": start_word, "targetWord": target_word, "pathLength": length})
+            generated_pairs.add(pair_key)
+            used_start[start_id] = True
+            used_target[target_id] = True
+            needed -= 1
+
+        if needed > 0:
+            safe_print(f"Warning: Only found {PAIRS_PER_PATH_LENGTH[length] - needed} pairs of length {length}")
+
+    return all_pairs
+
+def main(batched: bool = False, block_size: int = BATCH_START_WORDS, seed: Optional[int] = None,
+         enumerate_mode: bool = False, rebuild_candidates: bool = False):
     safe_print(f"Loading graph from {GRAPH_PATH}...")
-    graph_nodes = load_graph(GRAPH_PATH)
-    words = list(graph_nodes.keys())
-    safe_print(f"Loaded {len(words)} words from graph.")
-
-    # Create shared dictionaries for used words and progress tracking
-    with Manager() as manager:
-        used_start_words = manager.dict()
-        used_target_words = manager.dict()
-        # Track global progress
-        needed_pairs = manager.dict({length: PAIRS_PER_PATH_LENGTH[length] for length in TARGET_PATH_LENGTHS})
-
-        # Generate pairs for each target path length
-        all_pairs = []
-        safe_print(f"\nGenerating pairs with distribution: {PAIRS_PER_PATH_LENGTH}")
-        
-        # Calculate number of chunks needed
-        total_pairs_needed = sum(PAIRS_PER_PATH_LENGTH.values())  # 185 + 220 = 405
-        num_chunks = (total_pairs_needed + CHUNK_SIZE - 1) // CHUNK_SIZE
-        
-        # Prepare arguments for parallel processing
-        chunk_args = [(graph_nodes, words, CHUNK_SIZE, used_start_words, used_target_words, needed_pairs) 
-                     for _ in range(num_chunks)]
-
-        # Use multiprocessing to generate pairs in parallel
-        with Pool(processes=min(cpu_count(), 4)) as pool:
-            chunk_results = pool.map(generate_chunk, chunk_args)
-
-        # Combine results
-        for chunk in chunk_results:
-            all_pairs.extend(chunk)
-
-        # Verify we have all the pairs we need
-        pairs_by_length = {}
-        for pair in all_pairs:
-            length = pair["pathLength"]
-            if length not in pairs_by_length:
-                pairs_by_length[length] = []
-            pairs_by_length[length].append(pair)
-
-        # Print summary
-        safe_print("\nGenerated pairs summary:")
-        for length in TARGET_PATH_LENGTHS:
-            count = len(pairs_by_length.get(length, []))
-            safe_print(f"Length {length}: {count} pairs")
-
-        # Ensure output directory exists
-        output_dir = os.path.dirname(OUTPUT_PATH)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Create the final structure
-        output_data = {
-            "version": "1.0",
-            "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
-            "pairs": all_pairs
-        }
-
-        safe_print(f"\nSaving {len(all_pairs)} playtest pairs to {OUTPUT_PATH}...")
-        with open(OUTPUT_PATH, 'w') as f:
-            json.dump(output_data, f, indent=2)
-        safe_print("Playtest pairs saved successfully.")
+    graph = load_graph(GRAPH_PATH)
+    safe_print(f"Loaded {len(graph)} words from graph.")
+
+    # Generate pairs for each target path length
+    safe_print(f"\nGenerating pairs with distribution: {PAIRS_PER_PATH_LENGTH}")
+    if enumerate_mode:
+        candidates = load_or_enumerate_candidates(graph, GRAPH_PATH, rebuild_candidates)
+        all_pairs = sample_pairs_from_candidates(graph, candidates, seed)
+    elif batched:
+        all_pairs = generate_pairs_batched(graph, block_size, seed)
+    else:
+        all_pairs = generate_pairs_pool(graph, GRAPH_PATH)
+
+    # Verify we have all the pairs we need
+    pairs_by_length = {}
+    for pair in all_pairs:
+        length = pair["pathLength"]
+        if length not in pairs_by_length:
+            pairs_by_length[length] = []
+        pairs_by_length[length].append(pair)
+
+    # Print summary
+    safe_print("\nGenerated pairs summary:")
+    for length in TARGET_PATH_LENGTHS:
+        count = len(pairs_by_length.get(length, []))
+        safe_print(f"Length {length}: {count} pairs")
+
+    # Ensure output directory exists
+    output_dir = os.path.dirname(OUTPUT_PATH)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Create the final structure
+    output_data = {
+        "version": "1.0",
+        "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
+        "pairs": all_pairs
+    }
+
+    safe_print(f"\nSaving {len(all_pairs)} playtest pairs to {OUTPUT_PATH}...")
+    with open(OUTPUT_PATH, 'w') as f:
+        json.dump(output_data, f, indent=2)
+    safe_print("Playtest pairs saved successfully.")
 
 if __name__ == "__main__":
-    # Adjust GRAPH_PATH and OUTPUT_PATH based on script location relative to project root
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    GRAPH_PATH = os.path.join(project_root, "client", "public", "data", "graph.json")
-    OUTPUT_PATH = os.path.join(project_root, "src", "data", "playtest_pairs.json")
-    
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate playtest word pairs for daily challenges.")
+    parser.add_argument("--batched", action="store_true",
+                        help="Validate pairs with batched multi-source shortest paths instead of random attempts.")
+    parser.add_argument("--block-size", type=int, default=BATCH_START_WORDS,
+                        help="Start words per multi-source pass in --batched mode.")
+    parser.add_argument("--enumerate", action="store_true",
+                        help="Enumerate all valid candidate pairs once (cached next to the graph) and sample the quotas from them.")
+    parser.add_argument("--rebuild-candidates", action="store_true",
+                        help="Re-enumerate candidates in --enumerate mode even if the cached set is current.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --batched and --enumerate modes.")
+    args = parser.parse_args()
+
+    main(args.batched, args.block_size, args.seed, args.enumerate, args.rebuild_candidates) 
\ No newline at end of file
@@ -1,39 +1,86 @@
+import argparse
 import json
-import pickle
 import requests
 import os
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
 import numpy as np
 
+from embedding_cache import EmbeddingCache, model_digest
+from embedding_checkpoint import DEFAULT_SHARD_SIZE, EmbeddingCheckpoint
+from embedding_store import EMBEDDING_DTYPES, write_embedding_store
+
 # --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 # WORDS_PATH = os.path.join("raw_data", "ENGLISH_LEMMATIZED.json") # Old path
-WORDS_PATH = os.path.join("raw_data", "words.txt") # New path
-OUTPUT_DIR = "raw_data"
-OUTPUT_PATH = os.path.join(OUTPUT_DIR, "embeddings.pkl")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "database", "raw_data")
+WORDS_PATH = os.path.join(OUTPUT_DIR, "words.txt") # New path
+OUTPUT_PATH = os.path.join(OUTPUT_DIR, "embeddings") # Embedding store directory (see embedding_store.py)
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, "embeddings_checkpoint") # Shards of an unfinished run (see embedding_checkpoint.py)
 OLLAMA_API_URL = "http://localhost:11434/api/embeddings"
+OLLAMA_EMBED_URL = "http://localhost:11434/api/embed" # Batched endpoint: a list of inputs per request
 MODEL_NAME = "nomic-embed-text:137m-v1.5-fp16"
 REQUEST_TIMEOUT = 60 # Timeout for API requests in seconds
 RETRY_DELAY = 5 # Delay before retrying API request in seconds
 MAX_RETRIES = 3 # Maximum number of retries for a single word
+DEFAULT_CONCURRENCY = 8 # Requests in flight at once
+PROGRESS_EVERY = 250 # Words between progress lines
+INITIAL_BATCH_SIZE = 32 # Words per /api/embed request at the start of a batched run
+MAX_BATCH_SIZE = 512
+TARGET_BATCH_SECONDS = 2.0 # Batch sizes adapt to keep requests around this latency
 # --- End Configuration ---
 
-def get_ollama_embedding(word, retries=MAX_RETRIES):
-    """Fetches embedding for a single word from the Ollama API with retries."""
-    payload = {
-        "model": MODEL_NAME,
-        "prompt": word
-    }
+def make_session(max_connections=DEFAULT_CONCURRENCY):
+    """A keep-alive session whose connection pool holds max_connections connections to the server."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class _Progress:
+    """Thread-safe progress counter that prints words/sec every PROGRESS_EVERY words."""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def add(self, count):
+        with self.lock:
+            previous, self.done = self.done, self.done + count
+            if self.done // PROGRESS_EVERY > previous // PROGRESS_EVERY or self.done == self.total:
+                elapsed = time.time() - self.start_time
+                print(f"Processed {self.done}/{self.total} words ({self.done / max(elapsed, 1e-9):.1f} words/sec)")
+
+def get_ollama_embedding(word, retries=MAX_RETRIES, session=None, batch_endpoint=False):
+    """
+    Fetches embedding for a single word from the Ollama API with retries.
+    With batch_endpoint, asks /api/embed (as a one-word batch) so the vector
+    matches the ones returned for batched requests.
+    """
+    if batch_endpoint:
+        url, payload, key = OLLAMA_EMBED_URL, {"model": MODEL_NAME, "input": [word]}, "embeddings"
+    else:
+        url, payload, key = OLLAMA_API_URL, {"model": MODEL_NAME, "prompt": word}, "embedding"
+    post = session.post if session is not None else requests.post
     current_retries = 0
     while current_retries < retries:
         try:
-            response = requests.post(OLLAMA_API_URL, json=payload, timeout=REQUEST_TIMEOUT)
+            response = post(url, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status() # Raises HTTPError for bad responses (4XX or 5XX)
             
             data = response.json()
-            if "embedding" in data and isinstance(data["embedding"], list):
+            embedding = data.get(key)
+            if batch_endpoint and isinstance(embedding, list) and len(embedding) == 1:
+                embedding = embedding[0]
+            if isinstance(embedding, list) and embedding:
                 # Convert to numpy array for consistency if build_graph expects it
-                return np.array(data["embedding"], dtype=np.float32) 
+                return np.array(embedding, dtype=np.float32)
             else:
                 print(f"  Warning: Unexpected response format for word '{word}': {data}", file=sys.stderr)
                 return None # Or raise an error
@@ -43,7 +90,7 @@ def get_ollama_embedding(word, retries=MAX_RETRIES):
         except requests.exceptions.Timeout as e:
             print(f"  Timeout Error for word '{word}': {e}. Retrying in {RETRY_DELAY}s...", file=sys.stderr)
         except requests.exceptions.HTTPError as e:
-            print(f"  HTTP Error for word '{word}': {e.Response.status_code} - {e.Response.text}. Retrying in {RETRY_DELAY}s...", file=sys.stderr)
+            print(f"  HTTP Error for word '{word}': {e.response.status_code} - {e.response.text}. Retrying in {RETRY_DELAY}s...", file=sys.stderr)
         except requests.exceptions.RequestException as e:
             print(f"  Request Error for word '{word}': {e}. Retrying in {RETRY_DELAY}s...", file=sys.stderr)
         
@@ -54,8 +101,137 @@ def get_ollama_embedding(word, retries=MAX_RETRIES):
             print(f"  Failed to get embedding for word '{word}' after {retries} retries.", file=sys.stderr)
             return None # Failed after retries
 
-def generate_embeddings():
-    """Loads words, fetches embeddings from Ollama, and saves them to a pickle file."""
+def get_ollama_embeddings(words, session=None):
+    """
+    Fetches embeddings for a batch of words from /api/embed in one request (no retries).
+
+    Returns:
+        List aligned with words: the embedding, or None for an item the response left out.
+
+    Raises:
+        requests.exceptions.RequestException: The request failed.
+        ValueError: The response is not a batch of embeddings.
+    """
+    post = session.post if session is not None else requests.post
+    response = post(OLLAMA_EMBED_URL, json={"model": MODEL_NAME, "input": list(words)}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    embeddings = response.json().get("embeddings")
+    if not isinstance(embeddings, list) or len(embeddings) != len(words):
+        raise ValueError(f"Unexpected response format for a batch of {len(words)} words")
+    return [np.array(embedding, dtype=np.float32) if isinstance(embedding, list) and embedding else None
+            for embedding in embeddings]
+
+class AdaptiveBatchSize:
+    """
+    Words per batched request: doubles while requests finish well under the
+    target latency, halves when one is slower than the target or fails.
+    """
+
+    def __init__(self, initial=INITIAL_BATCH_SIZE, maximum=MAX_BATCH_SIZE, target_seconds=TARGET_BATCH_SECONDS):
+        self.size = initial
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+
+    def record(self, batch_size, seconds, succeeded):
+        """Adjust the size after a request of batch_size words took seconds."""
+        if not succeeded or seconds > self.target_seconds:
+            self.size = max(1, min(self.size, batch_size // 2))
+        elif seconds < self.target_seconds / 2 and batch_size >= self.size:
+            # Only full-size batches count: a small batch finishing fast says little
+            self.size = min(self.maximum, self.size * 2)
+
+def fetch_embeddings(words, concurrency=DEFAULT_CONCURRENCY, session=None, batch_endpoint=False,
+                     on_embedding=None):
+    """
+    Fetches embeddings for words with up to `concurrency` requests in flight
+    over one pooled keep-alive session. on_embedding(i, embedding) is called
+    (from worker threads) as each word's embedding arrives.
+
+    Returns:
+        List aligned with words: the embedding, or None where fetching failed.
+    """
+    session = session or make_session(concurrency)
+    results = [None] * len(words)
+    progress = _Progress(len(words))
+
+    def fetch(i):
+        results[i] = get_ollama_embedding(words[i], session=session, batch_endpoint=batch_endpoint)
+        if results[i] is not None and on_embedding is not None:
+            on_embedding(i, results[i])
+        progress.add(1)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in as_completed([executor.submit(fetch, i) for i in range(len(words))]):
+            future.result()
+    return results
+
+def fetch_embeddings_batched(words, concurrency=DEFAULT_CONCURRENCY, session=None, on_embedding=None):
+    """
+    Fetches embeddings with many words per /api/embed request and up to
+    `concurrency` requests in flight. The batch size adapts to observed latency
+    and errors (see AdaptiveBatchSize); words from failed requests, or missing
+    from a response, are retried one at a time with the usual retries.
+    on_embedding(i, embedding) is called as each word's embedding arrives.
+
+    Returns:
+        List aligned with words: the embedding, or None where fetching failed.
+    """
+    session = session or make_session(concurrency)
+    results = [None] * len(words)
+    progress = _Progress(len(words))
+    batch_size = AdaptiveBatchSize()
+    failed = []
+
+    def fetch(start, stop):
+        start_time = time.time()
+        try:
+            embeddings = get_ollama_embeddings(words[start:stop], session)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"  Batch of {stop - start} words failed: {e}", file=sys.stderr)
+            embeddings = None
+        return start, stop, embeddings, time.time() - start_time
+
+    next_word = 0
+    running = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while next_word < len(words) or running:
+            while next_word < len(words) and len(running) < concurrency:
+                stop = min(next_word + batch_size.size, len(words))
+                running.add(executor.submit(fetch, next_word, stop))
+                next_word = stop
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                start, stop, embeddings, seconds = future.result()
+                batch_size.record(stop - start, seconds, embeddings is not None)
+                for offset, embedding in enumerate(embeddings or [None] * (stop - start)):
+                    if embedding is None:
+                        failed.append(start + offset)
+                    else:
+                        results[start + offset] = embedding
+                        if on_embedding is not None:
+                            on_embedding(start + offset, embedding)
+                progress.add(stop - start)
+    print(f"Final batch size: {batch_size.size} words")
+
+    if failed:
+        print(f"Retrying {len(failed)} words one at a time...")
+        retried = fetch_embeddings([words[i] for i in failed], concurrency, session, batch_endpoint=True,
+                                   on_embedding=None if on_embedding is None else
+                                   lambda j, embedding: on_embedding(failed[j], embedding))
+        for i, embedding in zip(failed, retried):
+            results[i] = embedding
+    return results
+
+def generate_embeddings(dtype="float32", concurrency=DEFAULT_CONCURRENCY, batched=False,
+                        shard_size=DEFAULT_SHARD_SIZE, resume=False, use_cache=True):
+    """
+    Loads words, fetches embeddings from Ollama, and saves them to an embedding store.
+
+    Embeddings are checkpointed in shards of shard_size words as they arrive; with
+    resume, words already in the checkpoint of an interrupted run are not fetched again.
+    With use_cache, words already in the embedding cache for this model variant
+    (see embedding_cache.py) are not fetched either, and new embeddings are added to it.
+    """
     print(f"Loading words from {WORDS_PATH}...")
     try:
         # with open(WORDS_PATH, 'r') as f: # Old JSON loading
@@ -73,60 +249,112 @@ def generate_embeddings():
         print(f"Error: Could not read words file {WORDS_PATH}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    embeddings_dict = {}
-    failed_words = []
-    total_words = len(words)
+    words = list(dict.fromkeys(words)) # Drop duplicate lines, keeping the first
 
     print(f"Generating embeddings using Ollama model: {MODEL_NAME}")
     print(f"Connecting to Ollama API at: {OLLAMA_API_URL}")
+    session = make_session(concurrency)
 
     # Ensure Ollama is running and the model is available (optional pre-check)
     try:
-        requests.get(OLLAMA_API_URL.replace('/api/embeddings', '/api/tags'), timeout=5).raise_for_status()
+        response = session.get(OLLAMA_API_URL.replace('/api/embeddings', '/api/tags'), timeout=5)
+        response.raise_for_status()
         print("Successfully connected to Ollama API.")
-        # You could add a check here to see if MODEL_NAME is in the list of available models
-    except requests.exceptions.RequestException as e:
+        digest = model_digest(response.json(), MODEL_NAME)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Error: Could not connect to Ollama API at {OLLAMA_API_URL.replace('/api/embeddings', '')}. Please ensure Ollama is running.", file=sys.stderr)
         print(f"Details: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # /api/embed L2-normalizes and /api/embeddings does not, so the cache and the
+    # checkpoint only hold vectors from the endpoint this run uses
+    endpoint = "embed" if batched else "embeddings"
+    cache = None
+    if use_cache and digest is None:
+        print(f"Warning: {MODEL_NAME} is not listed by /api/tags, so its digest is unknown; not using the embedding cache.")
+    elif use_cache:
+        cache = EmbeddingCache(MODEL_NAME, digest, endpoint)
+    cached = cache.lookup(words) if cache is not None else {}
+    if cache is not None:
+        print(f"Embedding cache: {len(cached)} hits, {len(words) - len(cached)} misses ({cache.checkpoint_dir}).")
 
-    for i, word in enumerate(words):
-        print(f"Processing word {i + 1}/{total_words}: '{word}'")
-        embedding = get_ollama_embedding(word)
-        
-        if embedding is not None:
-            embeddings_dict[word] = embedding
+    checkpoint = EmbeddingCheckpoint(CHECKPOINT_DIR, f"{MODEL_NAME}/{endpoint}", shard_size, resume)
+    words_to_fetch = [word for word in words if word not in checkpoint and word not in cached]
+    if resume:
+        print(f"Resuming: {len(checkpoint)} words already checkpointed in {CHECKPOINT_DIR}.")
+    total_words = len(words_to_fetch)
+
+    print(f"Fetching {total_words} embeddings with {concurrency} requests in flight"
+          f"{' (batched)' if batched else ''}...")
+    start_time = time.time()
+
+    def on_embedding(i, embedding):
+        checkpoint.add(words_to_fetch[i], embedding)
+
+    try:
+        if batched:
+            embeddings = fetch_embeddings_batched(words_to_fetch, concurrency, session, on_embedding)
         else:
-            failed_words.append(word)
-            print(f"  Skipping word '{word}' due to embedding failure.")
+            embeddings = fetch_embeddings(words_to_fetch, concurrency, session, on_embedding=on_embedding)
+    finally:
+        # Keep what arrived so far even if the run is interrupted
+        checkpoint.flush()
+    elapsed = time.time() - start_time
 
-        # Optional small delay to be nice to the API
-        # time.sleep(0.05) 
+    failed_words = [word for word, embedding in zip(words_to_fetch, embeddings) if embedding is None]
+    # Compaction: every cached or checkpointed word, in word-list order
+    embeddings_by_word = dict(cached)
+    embeddings_by_word.update(checkpoint.embeddings)
+    saved_words = [word for word in words if word in embeddings_by_word]
 
-    success_count = len(embeddings_dict)
+    success_count = len(saved_words)
     fail_count = len(failed_words)
     print(f"\nEmbedding generation complete.")
+    print(f"Fetched {total_words - fail_count} embeddings "
+          f"in {elapsed:.1f}s ({total_words / max(elapsed, 1e-9):.1f} words/sec).")
     print(f"Successfully generated embeddings for {success_count} words.")
     if fail_count > 0:
         print(f"Failed to generate embeddings for {fail_count} words:")
         print(f"  {failed_words}")
+        print(f"Rerun with --resume to fetch only these words.")
 
     if success_count == 0:
         print("Error: No embeddings were successfully generated. Aborting save.", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Saving embeddings dictionary to {OUTPUT_PATH}...")
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"Saving embeddings ({dtype}) to {OUTPUT_PATH}...")
     try:
-        with open(OUTPUT_PATH, 'wb') as f:
-            pickle.dump(embeddings_dict, f)
+        write_embedding_store(OUTPUT_PATH, saved_words,
+                              np.stack([embeddings_by_word[word] for word in saved_words]), dtype)
         print("Embeddings saved successfully.")
     except Exception as e:
-        print(f"Error: Failed to save embeddings pickle file: {e}", file=sys.stderr)
+        print(f"Error: Failed to save embedding store: {e}", file=sys.stderr)
         sys.exit(1)
+    if cache is not None:
+        new_words = [word for word in saved_words if word not in cached]
+        for word in new_words:
+            cache.put(word, embeddings_by_word[word])
+        cache.flush()
+        print(f"Added {len(new_words)} embeddings to the embedding cache.")
+    if fail_count == 0:
+        checkpoint.remove()
 
 if __name__ == "__main__":
     # Note: This script requires the 'requests' library.
     # Install it using: pip install requests
-    generate_embeddings() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate word embeddings with a local Ollama model.")
+    parser.add_argument("--dtype", choices=EMBEDDING_DTYPES, default="float32",
+                        help="Precision of the saved embedding matrix (float16/int8 shrink it 2x/4x).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Embedding requests in flight at once.")
+    parser.add_argument("--batched", action="store_true",
+                        help="Send many words per request to /api/embed, adapting the batch size to latency and errors.")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="Words per checkpoint shard; an interrupted run loses at most this many.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run, skipping words already in the checkpoint.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Fetch every word instead of reusing the embedding cache for this model.")
+    args = parser.parse_args()
+    generate_embeddings(args.dtype, args.concurrency, args.batched, args.shard_size, args.resume,
+                        not args.no_cache) 
\ No newline at end of file
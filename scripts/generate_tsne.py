@@ -1,13 +1,17 @@
-import pickle
 import numpy as np
-from sklearn.manifold import TSNE
 import json
 import os
 import sys
+from pathlib import Path
+
+from embedding_store import open_embeddings
 
 # Constants
-EMBEDDINGS_PATH = os.path.join("raw_data", "embeddings.pkl")
-OUTPUT_DIR = os.path.join("data")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "database", "raw_data")
+EMBEDDINGS_PATH = os.path.join(RAW_DATA_DIR, "embeddings") # Embedding store directory
+LEGACY_EMBEDDINGS_PATH = os.path.join(RAW_DATA_DIR, "embeddings.pkl")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data")
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, "tsne_coordinates.json")
 
 # t-SNE Parameters (adjust as needed)
@@ -22,27 +26,18 @@ def generate_tsne():
     Loads embeddings, computes 2D t-SNE coordinates, and saves them
     to a JSON file mapping words to coordinates.
     """
-    print("Loading embeddings dictionary...")
-    with open(EMBEDDINGS_PATH, 'rb') as f:
-        embeddings_dict = pickle.load(f)
-    print(f"Loaded embeddings for {len(embeddings_dict)} words.")
-
-    print("Reconstructing words list and embeddings matrix from dictionary...")
-    words = list(embeddings_dict.keys())
-    try:
-        embeddings_list = [embeddings_dict[word] for word in words]
-        embeddings = np.stack(embeddings_list)
-    except Exception as e:
-        print(f"Error stacking embeddings: {e}")
-        sys.exit(1)
+    print("Loading embedding store...")
+    embedding_store = open_embeddings(EMBEDDINGS_PATH, LEGACY_EMBEDDINGS_PATH)
+    print(f"Loaded embeddings for {len(embedding_store)} words ({embedding_store.dtype}).")
 
-    # Ensure float32 for t-SNE
-    if embeddings.dtype != np.float32:
-        embeddings = embeddings.astype(np.float32)
+    words = embedding_store.words
+    # float32 for t-SNE (memory-mapped as-is for float32 stores)
+    embeddings = embedding_store.vectors()
 
-    print(f"Reconstructed embeddings matrix with shape: {embeddings.shape}")
+    print(f"Embeddings matrix shape: {embeddings.shape}")
 
     print("Running t-SNE... (This may take a while)")
+    from sklearn.manifold import TSNE # Imported here so run_pipeline.py can read the paths above without it
     tsne = TSNE(
         n_components=2,
         perplexity=TSNE_PERPLEXITY,
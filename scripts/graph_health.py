@@ -0,0 +1,178 @@
+import argparse
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from word_graph import WordGraph, load_graph, write_json_atomic
+
+# Structural health report for a built graph, computed with sparse operations.
+#
+# k-NN edges are directed (u lists v as a neighbor, v need not list u), so a
+# word can be weakly connected to the rest of the graph and still have no path
+# to or from most of it. The report covers:
+#     strongly connected components and the giant SCC
+#     in-degree and out-degree distributions
+#     reciprocal-edge ratio (fraction of edges u -> v with v -> u)
+#     words unreachable from the giant SCC, and words that cannot reach it
+#     a hop-length histogram over sampled start words
+# Pairs drawn from inside the giant SCC always have a path, so pruning every
+# word outside it (build_graph.py --prune-to-giant-scc) keeps pair sampling
+# from drawing dead pairs. The pruned graph is strongly connected: any path
+# between two giant-SCC words only passes through giant-SCC words.
+# SciPy is imported on first use, so build_graph.py still runs without it
+# (skipping the report) like word_graph.py does.
+
+# --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+GRAPH_PATH = PROJECT_ROOT / "src" / "data" / "graph.json"
+DEFAULT_HOP_SAMPLE = 64  # Start words sampled for the hop-length histogram
+EXAMPLE_WORDS = 10  # Words listed per problem category
+
+
+def adjacency_matrix(graph: WordGraph) -> "scipy.sparse.csr_matrix":
+    """0/1 CSR adjacency matrix (row u has a 1 in column v for every edge u -> v)."""
+    from scipy.sparse import csr_matrix
+    data = np.ones(len(graph.indices), dtype=np.int8)
+    return csr_matrix((data, graph.indices, graph.indptr), shape=(len(graph), len(graph)))
+
+
+def strong_components(graph: WordGraph) -> np.ndarray:
+    """Strongly connected component label of every node."""
+    from scipy.sparse.csgraph import connected_components
+    _, labels = connected_components(adjacency_matrix(graph), directed=True, connection='strong')
+    return labels
+
+
+def giant_scc_mask(graph: WordGraph, labels: Optional[np.ndarray] = None) -> np.ndarray:
+    """Boolean mask of the nodes in the largest strongly connected component."""
+    if labels is None:
+        labels = strong_components(graph)
+    return labels == np.bincount(labels).argmax()
+
+
+def _distribution(values: np.ndarray) -> Dict:
+    counts = np.bincount(values)
+    return {
+        "min": int(values.min()),
+        "mean": float(values.mean()),
+        "max": int(values.max()),
+        "histogram": {int(value): int(counts[value]) for value in np.nonzero(counts)[0]},
+    }
+
+
+def health_report(graph: WordGraph, hop_sample: int = DEFAULT_HOP_SAMPLE, seed: int = 0) -> Dict:
+    """
+    Structural statistics of a graph (see the module comment).
+
+    Args:
+        graph: Graph to check.
+        hop_sample: Start words sampled for the hop-length histogram (0 to skip).
+        seed: Seed for the start word sample.
+
+    Returns:
+        JSON-serializable report.
+
+    Raises:
+        ImportError: SciPy is not installed.
+    """
+    from scipy.sparse.csgraph import breadth_first_order
+
+    num_nodes = len(graph)
+    adjacency = adjacency_matrix(graph)
+    labels = strong_components(graph)
+    component_sizes = np.bincount(labels)
+    giant = labels == component_sizes.argmax()
+    giant_root = int(np.nonzero(giant)[0][0])
+
+    # Forward search from the giant SCC finds what it reaches, backward search what reaches it
+    reached = np.zeros(num_nodes, dtype=bool)
+    reached[breadth_first_order(adjacency, giant_root, directed=True, return_predecessors=False)] = True
+    reaching = np.zeros(num_nodes, dtype=bool)
+    reaching[breadth_first_order(adjacency.T.tocsr(), giant_root, directed=True,
+                                 return_predecessors=False)] = True
+
+    # An edge u -> v is reciprocal when v -> u is also an edge
+    reciprocal_edges = adjacency.multiply(adjacency.T).nnz
+    in_degrees = np.bincount(graph.indices, minlength=num_nodes)
+
+    report = {
+        "nodes": num_nodes,
+        "edges": int(adjacency.nnz),
+        "strong_components": len(component_sizes),
+        "giant_scc_size": int(giant.sum()),
+        "outside_giant_scc": int(num_nodes - giant.sum()),
+        "weak_components": len(np.unique(graph.weak_components())),
+        "out_degree": _distribution(graph.degrees),
+        "in_degree": _distribution(in_degrees),
+        "reciprocity": reciprocal_edges / max(adjacency.nnz, 1),
+        "unreachable_from_giant": int((~reached).sum()),
+        "cannot_reach_giant": int((~reaching).sum()),
+        "examples": {
+            "unreachable_from_giant": [graph.words[i] for i in np.nonzero(~reached)[0][:EXAMPLE_WORDS]],
+            "cannot_reach_giant": [graph.words[i] for i in np.nonzero(~reaching)[0][:EXAMPLE_WORDS]],
+            "zero_in_degree": [graph.words[i] for i in np.nonzero(in_degrees == 0)[0][:EXAMPLE_WORDS]],
+        },
+    }
+
+    if hop_sample > 0:
+        rng = np.random.default_rng(seed)
+        sources = rng.choice(num_nodes, min(hop_sample, num_nodes), replace=False)
+        hops = graph.multi_source_hops(sources)
+        reachable = hops[hops > 0]
+        counts = np.bincount(reachable) if len(reachable) else np.zeros(0, dtype=np.int64)
+        report["hop_sample_sources"] = len(sources)
+        report["hop_histogram"] = {int(value): int(counts[value]) for value in np.nonzero(counts)[0]}
+        report["hop_unreachable_pct"] = 100.0 * (1.0 - len(reachable) / max(len(sources) * (num_nodes - 1), 1))
+    return report
+
+
+def prune_nodes(nodes: Dict, keep_words) -> Dict:
+    """graph.json nodes restricted to keep_words, dropping edges to removed words."""
+    keep_words = set(keep_words)
+    return {
+        word: {**node, "edges": {neighbor: score for neighbor, score in node["edges"].items()
+                                 if neighbor in keep_words}}
+        for word, node in nodes.items() if word in keep_words
+    }
+
+
+def print_health_report(report: Dict, label: str = "") -> None:
+    print(f"\n--- Graph Health{f' ({label})' if label else ''} ---")
+    print(f"Nodes: {report['nodes']}, edges: {report['edges']}, "
+          f"reciprocal edges: {100.0 * report['reciprocity']:.1f}%")
+    print(f"Strongly connected components: {report['strong_components']} "
+          f"(giant: {report['giant_scc_size']}, outside: {report['outside_giant_scc']}); "
+          f"weakly connected components: {report['weak_components']}")
+    for name in ("out_degree", "in_degree"):
+        stats = report[name]
+        histogram = ", ".join(f"{value}:{count}" for value, count in stats["histogram"].items())
+        print(f"{name.replace('_', '-')}: min {stats['min']}, mean {stats['mean']:.2f}, "
+              f"max {stats['max']} [{histogram}]")
+    print(f"Unreachable from the giant SCC: {report['unreachable_from_giant']}, "
+          f"cannot reach it: {report['cannot_reach_giant']}")
+    for name, words in report["examples"].items():
+        if words:
+            print(f"  {name.replace('_', ' ')}: {', '.join(words)}")
+    if "hop_histogram" in report:
+        histogram = ", ".join(f"{value}:{count}" for value, count in report["hop_histogram"].items())
+        print(f"Hop lengths from {report['hop_sample_sources']} sampled words: [{histogram}], "
+              f"{report['hop_unreachable_pct']:.2f}% unreachable")
+    print("--- End Graph Health ---")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report the structural health of a built graph')
+    parser.add_argument('--graph', default=str(GRAPH_PATH), help='Path to graph.json (or a compact export)')
+    parser.add_argument('--hop-sample', type=int, default=DEFAULT_HOP_SAMPLE,
+                        help='Start words sampled for the hop-length histogram (0 to skip)')
+    parser.add_argument('--output', default=None, help='Also write the report as JSON to this path')
+    args = parser.parse_args()
+
+    # load_graph reports a missing file and exits
+    graph = load_graph(args.graph, use_atlas=False)
+    report = health_report(graph, args.hop_sample)
+    print_health_report(report, args.graph)
+    if args.output:
+        write_json_atomic(args.output, report)
+        print(f"Report written to {args.output}")
@@ -4,29 +4,40 @@ import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Set, Tuple
-import heapq
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import random
 
+import numpy as np
+
+from landmarks import LANDMARK_STRATEGIES, LandmarkIndex
+from word_graph import WordGraph, load_graph
+
 # --- Configuration ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DAILY_CHALLENGES_PATH = PROJECT_ROOT / "src" / "data" / "daily_challenges.json"
 GRAPH_PATH = PROJECT_ROOT / "src" / "data" / "graph.json"
 
+# Number of per-target distance fields kept on a solver (each is ~12 bytes per word)
+DISTANCE_FIELD_CACHE_SIZE = 64
+
 class HeuristicSolver:
     """A rule-based heuristic solver for word navigation puzzles."""
     
-    def __init__(self, graph_nodes: Dict):
-        self.graph_nodes = graph_nodes
+    def __init__(self, graph, landmarks: Optional[LandmarkIndex] = None):
+        # Accept either a compiled WordGraph or the raw "nodes" dict of graph.json
+        if not isinstance(graph, WordGraph):
+            graph = WordGraph.from_nodes(graph)
+        self.graph = graph
+        # Optional ALT index; shortest paths then use landmark-guided A* instead of Dijkstra
+        self.landmarks = landmarks
         self.word_degrees = self._calculate_word_degrees()
         self.hub_words = self._identify_hub_words()
+        # target word -> (cost-to-target, hops-to-target) arrays, most recently used last
+        self._distance_fields = OrderedDict()
         
     def _calculate_word_degrees(self) -> Dict[str, int]:
         """Calculate the degree (number of connections) for each word."""
-        degrees = {}
-        for word, data in self.graph_nodes.items():
-            degrees[word] = len(data.get("edges", {}))
-        return degrees
+        return dict(zip(self.graph.words, self.graph.degrees.tolist()))
     
     def _identify_hub_words(self, top_percentile: float = 0.1) -> Set[str]:
         """Identify hub words (highly connected words) in the top percentile."""
@@ -39,66 +50,38 @@ class HeuristicSolver:
     
     def get_word_neighbors(self, word: str) -> List[str]:
         """Get neighbors of a word, sorted by similarity (highest first)."""
-        if word not in self.graph_nodes:
+        node_id = self.graph.word_ids.get(word)
+        if node_id is None:
             return []
         
-        edges = self.graph_nodes[word].get("edges", {})
-        # Sort by similarity (descending)
-        sorted_neighbors = sorted(edges.items(), key=lambda x: x[1], reverse=True)
-        return [neighbor for neighbor, _ in sorted_neighbors]
+        # Stable sort by similarity (descending), ties keep graph.json order
+        neighbor_ids = self.graph.neighbor_ids(node_id)
+        order = np.argsort(-self.graph.neighbor_weights(node_id), kind='stable')
+        return [self.graph.words[i] for i in neighbor_ids[order]]
     
     def find_shortest_path(self, start: str, end: str) -> List[str]:
-        """Find shortest path using Dijkstra's algorithm."""
-        if start not in self.graph_nodes or end not in self.graph_nodes:
-            return []
-        
-        if start == end:
-            return [start]
-        
-        distances = {word: float('infinity') for word in self.graph_nodes}
-        previous = {word: None for word in self.graph_nodes}
-        distances[start] = 0
-        
-        # Priority queue: (distance, word)
-        pq = [(0, start)]
-        visited = set()
-        
-        while pq:
-            current_dist, current = heapq.heappop(pq)
-            
-            if current in visited:
-                continue
-                
-            visited.add(current)
-            
-            if current == end:
-                break
-            
-            edges = self.graph_nodes[current].get("edges", {})
-            for neighbor, similarity in edges.items():
-                if neighbor in visited:
-                    continue
-                
-                # Convert similarity to distance (cost)
-                cost = 1 - similarity
-                distance = current_dist + cost
-                
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current
-                    heapq.heappush(pq, (distance, neighbor))
-        
-        # Reconstruct path
-        if distances[end] == float('infinity'):
-            return []
-        
-        path = []
-        current = end
-        while current is not None:
-            path.insert(0, current)
-            current = previous[current]
+        """Find shortest path using Dijkstra's algorithm (or ALT A* when landmarks are set)."""
+        if self.landmarks is not None and self.graph.atlas is None:
+            return self.landmarks.path(start, end)
+        return self.graph.shortest_path(start, end)
+    
+    def get_distance_field(self, target: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cost and hop count from every word to target, computed once per target.
+
+        One reverse Dijkstra from the target replaces a forward search per scored
+        neighbor; fields are cached so repeated puzzles with the same target reuse them.
+        """
+        field = self._distance_fields.get(target)
+        if field is not None:
+            self._distance_fields.move_to_end(target)
+            return field
         
-        return path
+        field = self.graph.distance_field(self.graph.word_ids[target])
+        self._distance_fields[target] = field
+        if len(self._distance_fields) > DISTANCE_FIELD_CACHE_SIZE:
+            self._distance_fields.popitem(last=False)
+        return field
     
     def calculate_heuristic_score(self, word: str, target: str, current_path: List[str]) -> float:
         """Calculate a heuristic score for choosing a word."""
@@ -108,11 +91,13 @@ class HeuristicSolver:
         score = 0.0
         
         # 1. Distance to target (most important)
-        path_to_target = self.find_shortest_path(word, target)
-        if path_to_target:
-            # Shorter path to target = higher score
-            distance_to_target = len(path_to_target) - 1
-            score += 1000 / (distance_to_target + 1)
+        word_id = self.graph.word_ids.get(word)
+        if word_id is not None and target in self.graph:
+            _, hops_to_target = self.get_distance_field(target)
+            distance_to_target = int(hops_to_target[word_id])
+            if distance_to_target >= 0:
+                # Shorter path to target = higher score
+                score += 1000 / (distance_to_target + 1)
         
         # 2. Hub word bonus (helps with connectivity)
         if word in self.hub_words:
@@ -127,8 +112,8 @@ class HeuristicSolver:
         score += degree * 2
         
         # 5. Direct similarity to target
-        if target in self.graph_nodes.get(word, {}).get("edges", {}):
-            similarity_to_target = self.graph_nodes[word]["edges"][target]
+        similarity_to_target = self.graph.similarity(word, target)
+        if similarity_to_target is not None:
             score += similarity_to_target * 100
         
         return score
@@ -146,7 +131,7 @@ class HeuristicSolver:
         Returns:
             Dict with solution information including path, status, and reasoning
         """
-        if start_word not in self.graph_nodes or target_word not in self.graph_nodes:
+        if start_word not in self.graph or target_word not in self.graph:
             return {
                 "path": [start_word],
                 "steps": 0,
@@ -392,13 +377,15 @@ def load_json_file(path: Path) -> Dict:
     with open(path, 'r') as f:
         return json.load(f)
 
-def solve_daily_challenges_heuristic(num_to_solve: int = 50, path_length: int = 6) -> List[Dict]:
+def solve_daily_challenges_heuristic(num_to_solve: int = 50, path_length: int = 6,
+                                     graph_path=GRAPH_PATH) -> List[Dict]:
     """
     Solve daily challenges using heuristic solver.
     
     Args:
         num_to_solve: Number of puzzles to solve
         path_length: Filter for puzzles with this optimal path length
+        graph_path: Graph to solve the challenges on
     
     Returns:
         List of solution results
@@ -408,8 +395,7 @@ def solve_daily_challenges_heuristic(num_to_solve: int = 50, path_length: int =
     # Load data
     daily_challenges_data = load_json_file(DAILY_CHALLENGES_PATH)
     daily_challenges = daily_challenges_data["challenges"]
-    graph_data = load_json_file(GRAPH_PATH)
-    graph_nodes = graph_data["nodes"]
+    graph = load_graph(graph_path)
     
     # Filter challenges by path length
     filtered_challenges = [c for c in daily_challenges if c.get('pathLength') == path_length]
@@ -420,8 +406,8 @@ def solve_daily_challenges_heuristic(num_to_solve: int = 50, path_length: int =
         num_to_solve = len(filtered_challenges)
     
     # Initialize solver
-    solver = HeuristicSolver(graph_nodes)
-    print(f"Solver initialized with {len(graph_nodes)} words")
+    solver = HeuristicSolver(graph)
+    print(f"Solver initialized with {len(graph)} words")
     print(f"Identified {len(solver.hub_words)} hub words")
     
     # Solve puzzles
@@ -489,13 +475,18 @@ def solve_daily_challenges_heuristic(num_to_solve: int = 50, path_length: int =
     
     return results
 
-def solve_playtest_pairs_heuristic(pairs_file_path: str, max_retries: int = 50) -> List[Dict]:
+def solve_playtest_pairs_heuristic(pairs_file_path: str, max_retries: int = 50,
+                                   num_landmarks: int = 0, landmark_strategy: str = "farthest",
+                                   graph_path=GRAPH_PATH) -> List[Dict]:
     """
     Solve playtest pairs using heuristic solver with multiple retries.
     
     Args:
         pairs_file_path: Path to the playtest pairs JSON file
         max_retries: Maximum number of retry attempts per puzzle
+        num_landmarks: Use ALT shortest paths with this many landmarks (0 = Dijkstra)
+        landmark_strategy: Landmark selection strategy ("farthest" or "degree")
+        graph_path: Graph the pairs were generated from
     
     Returns:
         List of solution results
@@ -506,14 +497,14 @@ def solve_playtest_pairs_heuristic(pairs_file_path: str, max_retries: int = 50)
     # Load data
     pairs_data = load_json_file(Path(pairs_file_path))
     pairs = pairs_data["pairs"]
-    graph_data = load_json_file(GRAPH_PATH)
-    graph_nodes = graph_data["nodes"]
+    graph = load_graph(graph_path)
     
     print(f"Found {len(pairs)} pairs to solve")
     
     # Initialize solver
-    solver = HeuristicSolver(graph_nodes)
-    print(f"Solver initialized with {len(graph_nodes)} words")
+    landmarks = LandmarkIndex(graph, num_landmarks, landmark_strategy) if num_landmarks > 0 else None
+    solver = HeuristicSolver(graph, landmarks)
+    print(f"Solver initialized with {len(graph)} words")
     print(f"Identified {len(solver.hub_words)} hub words")
     
     # Solve puzzles
@@ -695,6 +686,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Heuristic solver for word puzzles')
     parser.add_argument('--solve-pair', nargs=2, metavar=('START', 'TARGET'), 
                        help='Solve a single word pair')
+    parser.add_argument('--landmarks', type=int, default=0,
+                       help='Use ALT (landmark A*) shortest paths with this many landmarks; 0 uses Dijkstra')
+    parser.add_argument('--landmark-strategy', choices=LANDMARK_STRATEGIES, default='farthest',
+                       help='How ALT landmarks are chosen')
+    parser.add_argument('--graph', default=str(GRAPH_PATH), help='Path to graph.json')
+    parser.add_argument('--pairs', default=str(PROJECT_ROOT / "src" / "data" / "playtest_pairs.json"),
+                       help='Playtest pairs to solve')
     args = parser.parse_args()
     
     if args.solve_pair:
@@ -704,15 +702,15 @@ if __name__ == "__main__":
         
         # Load graph data
         try:
-            graph_file_data = load_json_file(GRAPH_PATH)
-            # Handle graph format with "nodes" wrapper
-            graph_data = graph_file_data.get("nodes", graph_file_data)
+            # Handles graph format with or without the "nodes" wrapper
+            graph = load_graph(args.graph)
         except Exception as e:
             print(json.dumps({"status": "error", "reason": f"Failed to load graph: {e}"}))
             sys.exit(1)
         
         # Create solver and solve single pair
-        solver = HeuristicSolver(graph_data)
+        landmarks = LandmarkIndex(graph, args.landmarks, args.landmark_strategy) if args.landmarks > 0 else None
+        solver = HeuristicSolver(graph, landmarks)
         start_word, target_word = args.solve_pair
         
         result = solver.solve_puzzle(start_word, target_word)
@@ -740,8 +738,8 @@ if __name__ == "__main__":
     }
     
     # Solve the playtest pairs
-    pairs_file = PROJECT_ROOT / "src" / "data" / "playtest_pairs.json"
-    results = solve_playtest_pairs_heuristic(str(pairs_file))
+    results = solve_playtest_pairs_heuristic(args.pairs, num_landmarks=args.landmarks,
+                                             landmark_strategy=args.landmark_strategy, graph_path=args.graph)
     
     # Filter out optimal solutions and sample target distribution
     sampled_results = filter_and_sample_results(results, TARGET_DISTRIBUTION)
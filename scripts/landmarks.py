@@ -0,0 +1,170 @@
+import heapq
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from word_graph import WordGraph
+
+# ALT (A*, Landmarks, Triangle inequality) shortest paths.
+#
+# For a landmark L, the triangle inequality gives two lower bounds on the cost
+# from v to a target t:
+#     d(v, t) >= d(v, L) - d(t, L)      (costs *to* the landmark)
+#     d(v, t) >= d(L, t) - d(L, v)      (costs *from* the landmark)
+# The best bound over a handful of landmarks steers A* towards the target, so
+# it settles far fewer nodes than Dijkstra when the vocabulary is too large for
+# an all-pairs atlas (see path_atlas.py). Bounds are feasible potentials, so the
+# path cost is always optimal, and tied routes are resolved with Dijkstra's
+# predecessor rule, so the path is the same one WordGraph.shortest_path returns.
+# Bounds are only computed for the nodes the search touches.
+
+DEFAULT_NUM_LANDMARKS = 16
+LANDMARK_STRATEGIES = ("farthest", "degree")
+# Shave bounds slightly so float rounding in the subtractions never overestimates
+BOUND_SLACK = 1e-9
+
+
+class LandmarkIndex:
+    """Landmark distances for one WordGraph plus an A* search that uses them."""
+
+    def __init__(self, graph: WordGraph, num_landmarks: int = DEFAULT_NUM_LANDMARKS,
+                 strategy: str = "farthest"):
+        """
+        Args:
+            graph: Graph to index.
+            num_landmarks: Number of landmarks (clamped to the vocabulary size).
+            strategy: "degree" picks the best-connected words; "farthest" starts
+                from the best-connected word and repeatedly adds the word farthest
+                from every landmark chosen so far.
+        """
+        if strategy not in LANDMARK_STRATEGIES:
+            raise ValueError(f"Unknown landmark strategy '{strategy}', expected one of {LANDMARK_STRATEGIES}")
+        self.graph = graph
+        self.strategy = strategy
+        num_landmarks = max(1, min(num_landmarks, len(graph)))
+
+        # d(L, v) and d(v, L) for every landmark L (rows) and node v (columns)
+        self.landmarks: List[int] = []
+        from_rows = []
+        to_rows = []
+
+        def add_landmark(node_id: int) -> None:
+            self.landmarks.append(node_id)
+            from_rows.append(graph.shortest_path_tree(node_id)[0])
+            to_rows.append(graph.distance_field(node_id)[0])
+
+        total_degrees = graph.degrees + np.bincount(graph.indices, minlength=len(graph))
+        by_degree = np.argsort(-total_degrees, kind='stable')
+
+        if strategy == "degree":
+            for node_id in by_degree[:num_landmarks]:
+                add_landmark(int(node_id))
+        else:
+            add_landmark(int(by_degree[0]))
+            # Round-trip cost to the nearest landmark; unreachable words never win
+            nearest = np.full(len(graph), np.inf)
+            while len(self.landmarks) < num_landmarks:
+                round_trip = from_rows[-1] + to_rows[-1]
+                nearest = np.minimum(nearest, round_trip)
+                candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+                candidates[self.landmarks] = -1.0
+                best = int(np.argmax(candidates))
+                if candidates[best] <= 0:
+                    break
+                add_landmark(best)
+
+        # Node-major (N x 2L) so one fancy index gathers every bound term of a few
+        # nodes: [d(v, L) for each L] + [-d(L, v) for each L]. Both bounds are then
+        # the row minus the same row of the target.
+        self.landmark_costs = np.ascontiguousarray(
+            np.hstack([np.vstack(to_rows).T, -np.vstack(from_rows).T]))
+
+    def lower_bounds(self, nodes, end: int) -> np.ndarray:
+        """Lower bounds on the cost from each of nodes to end (inf where end is provably unreachable)."""
+        with np.errstate(invalid='ignore'):
+            return self._bounds(nodes, self.landmark_costs[end] + BOUND_SLACK)
+
+    def _bounds(self, nodes, target_costs: np.ndarray) -> np.ndarray:
+        # inf - inf is NaN (the landmark tells us nothing) and fmax skips it; the 0.0
+        # initial value clamps the bounds, which are shaved by BOUND_SLACK via target_costs
+        return np.fmax.reduce(self.landmark_costs[nodes] - target_costs, axis=1, initial=0.0)
+
+    def path_ids(self, start: int, end: int, stats: Optional[Dict] = None) -> List[int]:
+        """
+        A* shortest path between two node ids with landmark lower bounds.
+
+        Args:
+            start: Start node id.
+            end: End node id.
+            stats: Optional dict that receives the number of settled nodes ("settled").
+        """
+        if start == end:
+            return [start]
+
+        target_costs = self.landmark_costs[end] + BOUND_SLACK
+        indptr, indices, costs = self.graph.adjacency()
+        # Bounds of the nodes touched so far, computed a neighbor list at a time
+        bounds = {}
+        distances = {start: 0.0}
+        previous = {start: -1}
+        settled = set()
+        found = False
+
+        # Priority queue: (distance + bound, distance, node id)
+        with np.errstate(invalid='ignore'):
+            start_bound = float(self._bounds([start], target_costs)[0])
+            pq = [(start_bound, 0.0, start)] if start_bound != float('infinity') else []
+            while pq:
+                _, current_dist, current = heapq.heappop(pq)
+                if current_dist > distances[current]:
+                    continue  # Stale entry
+                if current == end:
+                    found = True
+                    break
+                settled.add(current)
+
+                first, last = indptr[current], indptr[current + 1]
+                neighbors = indices[first:last].tolist()
+                unknown = [neighbor for neighbor in neighbors if neighbor not in bounds]
+                if unknown:
+                    bounds.update(zip(unknown, self._bounds(unknown, target_costs).tolist()))
+
+                for neighbor, cost in zip(neighbors, costs[first:last].tolist()):
+                    bound = bounds[neighbor]
+                    if bound == float('infinity'):
+                        continue
+                    distance = current_dist + cost
+                    known = distances.get(neighbor, float('infinity'))
+                    if distance < known:
+                        distances[neighbor] = distance
+                        previous[neighbor] = current
+                        heapq.heappush(pq, (distance + bound, distance, neighbor))
+                    elif distance == known and neighbor != start:
+                        # Dijkstra settles in (distance, id) order and keeps the first
+                        # predecessor at the final distance; A* expands in another order,
+                        # so pick that predecessor explicitly. Every tied predecessor on a
+                        # shortest route has f below the end's and is expanded before it.
+                        other = previous[neighbor]
+                        if (current_dist, current) < (distances[other], other):
+                            previous[neighbor] = current
+
+        if stats is not None:
+            stats["settled"] = len(settled) + (1 if found else 0)
+        if not found:
+            return []
+
+        path = []
+        node = end
+        while node != -1:
+            path.append(node)
+            node = previous[node]
+        path.reverse()
+        return path
+
+    def path(self, start: str, end: str) -> List[str]:
+        """Shortest path between two words, or [] if either is unknown or unreachable."""
+        start_id = self.graph.word_ids.get(start)
+        end_id = self.graph.word_ids.get(end)
+        if start_id is None or end_id is None:
+            return []
+        return [self.graph.words[i] for i in self.path_ids(start_id, end_id)]
@@ -0,0 +1,264 @@
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Cosine top-k neighbor search over an embedding matrix for build_graph.py.
+#
+# The similarity matrix is never materialized: rows are produced in blocks of
+# normalized @ normalized.T sized to a memory budget, and each block is reduced
+# to its top-k columns with argpartition before the next one is computed. The
+# normalization and per-row selection mirror sklearn's cosine_similarity plus
+# the original argpartition/argsort loop, so the edges are the same as before.
+#
+# For vocabularies where even blocked exact search (O(N^2 d)) is too slow, the
+# "ivf" backend is an inverted-file index: spherical k-means splits the rows
+# into lists, and each row is only compared with the rows in the num_probes
+# lists whose centroids are closest to it. recall_at_k measures what that
+# costs against exact search on a sample of rows.
+
+DEFAULT_BLOCK_MB = 256
+# Bytes held per similarity cell while a block is reduced: the float32 score
+# plus argpartition's int64 index array
+BYTES_PER_CELL = 12
+
+NEIGHBOR_BACKENDS = ("exact", "ivf")
+DEFAULT_NUM_PROBES = 8
+KMEANS_ITERATIONS = 15
+KMEANS_TRAINING_ROWS_PER_LIST = 64
+DEFAULT_RECALL_SAMPLE = 500
+ASSIGN_BLOCK_ROWS = 4096  # Rows scored against the centroids at a time
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as float32 (all-zero rows are left as zeros)."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.sqrt(np.einsum('ij,ij->i', embeddings, embeddings))
+    norms[norms == 0.0] = 1.0
+    return embeddings / norms[:, np.newaxis]
+
+
+def rows_per_block(num_words: int, block_mb: float = DEFAULT_BLOCK_MB) -> int:
+    """Number of similarity rows that fit in block_mb megabytes (at least one)."""
+    return max(1, int(block_mb * 1024 * 1024) // (max(num_words, 1) * BYTES_PER_CELL))
+
+
+def similarity_blocks(normalized: np.ndarray, block_rows: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (first row, block) pairs covering the cosine similarity matrix.
+
+    Args:
+        normalized: (N, d) float32 matrix from normalize_embeddings.
+        block_rows: Rows per block; each block is (block_rows, N) float32.
+    """
+    for start in range(0, len(normalized), block_rows):
+        yield start, normalized[start:start + block_rows] @ normalized.T
+
+
+def top_k_block(similarities: np.ndarray, num_to_find: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Column indices and scores of each row's num_to_find largest similarities, best first."""
+    candidates = np.argpartition(similarities, -num_to_find, axis=1)[:, -num_to_find:]
+    scores = np.take_along_axis(similarities, candidates, axis=1)
+    order = np.argsort(scores, axis=1)[:, ::-1]
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def exact_top_k(normalized: np.ndarray, k_neighbors: int, block_mb: float = DEFAULT_BLOCK_MB,
+                rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact top-(k + 1) cosine neighbors of every row (the extra slot absorbs the
+    row itself), computed block by block within a bounded memory budget.
+
+    Args:
+        rows: Only compute these rows (default: all of them).
+
+    Returns:
+        (len(rows), min(k + 1, N)) neighbor indices and float32 scores, best first.
+    """
+    num_words = len(normalized)
+    num_rows = num_words if rows is None else len(rows)
+    num_to_find = min(k_neighbors + 1, num_words)
+    block_rows = rows_per_block(num_words, block_mb)
+    indices = np.empty((num_rows, num_to_find), dtype=np.int64)
+    scores = np.empty((num_rows, num_to_find), dtype=np.float32)
+
+    for start in range(0, num_rows, block_rows):
+        stop = min(start + block_rows, num_rows)
+        queries = normalized[start:stop] if rows is None else normalized[rows[start:stop]]
+        indices[start:stop], scores[start:stop] = top_k_block(queries @ normalized.T, num_to_find)
+        print(f"  Computed neighbors for {stop}/{num_rows} words...")
+
+    return indices, scores
+
+
+def update_top_k(normalized: np.ndarray, k_neighbors: int, previous_indices: np.ndarray,
+                 previous_scores: np.ndarray, previous_ids: np.ndarray,
+                 block_mb: float = DEFAULT_BLOCK_MB) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Exact top-(k + 1) neighbors after a vocabulary change, reusing the previous
+    build's rows wherever their neighbor set cannot have changed.
+
+    A kept row is recomputed only if one of its previous neighbors is gone or a
+    new word scores at least as high as its last kept neighbor; every other row
+    is carried over, so the result matches exact_top_k on the new matrix.
+
+    Args:
+        normalized: New (N, d) matrix from normalize_embeddings.
+        previous_indices: Previous build's exact_top_k indices (old word ids).
+        previous_scores: Previous build's exact_top_k scores.
+        previous_ids: Old id of each new row, or -1 for words that are new or
+            whose embedding changed.
+
+    Returns:
+        (indices, scores, number of rows recomputed).
+    """
+    num_words = len(normalized)
+    kept = np.nonzero(previous_ids >= 0)[0]
+    fresh = np.nonzero(previous_ids < 0)[0]
+    old_to_new = np.full(len(previous_indices), -1, dtype=np.int64)
+    old_to_new[previous_ids[kept]] = kept
+
+    indices = np.empty((num_words, previous_indices.shape[1]), dtype=np.int64)
+    scores = np.empty((num_words, previous_indices.shape[1]), dtype=np.float32)
+    indices[kept] = old_to_new[previous_indices[previous_ids[kept]]]
+    scores[kept] = previous_scores[previous_ids[kept]]
+
+    dirty = np.zeros(num_words, dtype=bool)
+    dirty[fresh] = True
+    dirty[kept] = (indices[kept] < 0).any(axis=1)
+    if len(fresh) and len(kept):
+        block_rows = rows_per_block(len(fresh), block_mb)
+        for start in range(0, len(kept), block_rows):
+            rows = kept[start:start + block_rows]
+            best_new = (normalized[rows] @ normalized[fresh].T).max(axis=1)
+            # Ties with the last kept neighbor are recomputed so ordering matches a full build
+            dirty[rows] |= best_new >= scores[rows, -1]
+
+    rows = np.nonzero(dirty)[0]
+    if len(rows):
+        indices[rows], scores[rows] = exact_top_k(normalized, k_neighbors, block_mb, rows)
+    return indices, scores, len(rows)
+
+
+def neighbor_edges(words: List[str], row: int, indices: np.ndarray, scores: np.ndarray,
+                   k_neighbors: int) -> Dict[str, float]:
+    """Edges dict for words[row]: its first k_neighbors candidates other than itself."""
+    edges = {}
+    for idx, score in zip(indices[row], scores[row]):
+        if idx != row and idx >= 0:
+            edges[words[idx]] = float(score)
+            if len(edges) == k_neighbors:
+                break
+    return edges
+
+
+# --- Approximate search (IVF) ---
+
+class IVFIndex:
+    """Inverted-file index over normalized embedding rows."""
+
+    def __init__(self, normalized: np.ndarray, num_lists: Optional[int] = None, seed: int = 0):
+        """
+        Args:
+            normalized: (N, d) float32 matrix from normalize_embeddings.
+            num_lists: Number of k-means lists (default about sqrt(N)).
+            seed: Seed for k-means initialization and training sample.
+        """
+        self.normalized = normalized
+        num_words = len(normalized)
+        self.num_lists = max(1, min(num_lists or int(np.sqrt(num_words)), num_words))
+        rng = np.random.default_rng(seed)
+
+        training_size = min(num_words, self.num_lists * KMEANS_TRAINING_ROWS_PER_LIST)
+        training = normalized[rng.choice(num_words, training_size, replace=False)]
+        self.centroids = training[rng.choice(training_size, self.num_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(training @ self.centroids.T, axis=1)
+            for list_id in range(self.num_lists):
+                members = training[assignment == list_id]
+                # Reseed empty lists from a random training row
+                centroid = members.sum(axis=0) if len(members) else training[rng.integers(training_size)]
+                self.centroids[list_id] = centroid
+            self.centroids = normalize_embeddings(self.centroids)
+
+        self.assignment = np.concatenate([
+            np.argmax(normalized[start:start + ASSIGN_BLOCK_ROWS] @ self.centroids.T, axis=1)
+            for start in range(0, num_words, ASSIGN_BLOCK_ROWS)
+        ])
+        order = np.argsort(self.assignment, kind='stable')
+        bounds = np.searchsorted(self.assignment[order], np.arange(self.num_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.num_lists)]
+
+    def search_all(self, k_neighbors: int,
+                   num_probes: int = DEFAULT_NUM_PROBES) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-(k + 1) neighbors of every indexed row, same layout as exact_top_k.
+
+        Rows with fewer candidates than slots are padded with index -1 and score -inf.
+        """
+        normalized = self.normalized
+        num_words = len(normalized)
+        num_to_find = min(k_neighbors + 1, num_words)
+        num_probes = max(1, min(num_probes, self.num_lists))
+
+        # The num_probes closest lists of every row, regrouped as list -> probing rows
+        probes = np.concatenate([
+            top_k_block(normalized[start:start + ASSIGN_BLOCK_ROWS] @ self.centroids.T, num_probes)[0]
+            for start in range(0, num_words, ASSIGN_BLOCK_ROWS)
+        ])
+        probe_lists = probes.ravel()
+        probe_order = np.argsort(probe_lists, kind='stable')
+        probe_rows = probe_order // num_probes
+        bounds = np.searchsorted(probe_lists[probe_order], np.arange(self.num_lists + 1))
+
+        indices = np.full((num_words, num_to_find), -1, dtype=np.int64)
+        scores = np.full((num_words, num_to_find), -np.inf, dtype=np.float32)
+        for list_id, members in enumerate(self.lists):
+            queries = probe_rows[bounds[list_id]:bounds[list_id + 1]]
+            if len(queries) == 0 or len(members) == 0:
+                continue
+            # Merge this list's candidates into each probing row's running top-k
+            merged_scores = np.concatenate((scores[queries], normalized[queries] @ normalized[members].T), axis=1)
+            merged_indices = np.concatenate(
+                (indices[queries], np.broadcast_to(members, (len(queries), len(members)))), axis=1)
+            keep = np.argpartition(merged_scores, -num_to_find, axis=1)[:, -num_to_find:]
+            scores[queries] = np.take_along_axis(merged_scores, keep, axis=1)
+            indices[queries] = np.take_along_axis(merged_indices, keep, axis=1)
+
+        order = np.argsort(scores, axis=1)[:, ::-1]
+        return np.take_along_axis(indices, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def recall_at_k(normalized: np.ndarray, indices: np.ndarray, k_neighbors: int,
+                sample_size: int = DEFAULT_RECALL_SAMPLE, seed: int = 0) -> float:
+    """
+    Fraction of the exact k nearest neighbors (excluding the row itself) that
+    appear among the first k neighbors in indices, averaged over sampled rows.
+    """
+    num_words = len(normalized)
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(num_words, min(sample_size, num_words), replace=False)
+    exact_indices, _ = top_k_block(normalized[sample] @ normalized.T, min(k_neighbors + 1, num_words))
+
+    found = 0
+    total = 0
+    for row, exact_row, approx_row in zip(sample, exact_indices, indices[sample]):
+        exact = [idx for idx in exact_row if idx != row][:k_neighbors]
+        approx = set([idx for idx in approx_row if idx != row and idx >= 0][:k_neighbors])
+        found += sum(1 for idx in exact if idx in approx)
+        total += len(exact)
+    return found / total if total else 1.0
+
+
+def find_neighbors(normalized: np.ndarray, k_neighbors: int, backend: str = "exact",
+                   block_mb: float = DEFAULT_BLOCK_MB, num_lists: Optional[int] = None,
+                   num_probes: int = DEFAULT_NUM_PROBES) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-(k + 1) neighbors of every row with the chosen backend (see NEIGHBOR_BACKENDS)."""
+    if backend == "exact":
+        return exact_top_k(normalized, k_neighbors, block_mb)
+    if backend == "ivf":
+        start_time = time.time()
+        index = IVFIndex(normalized, num_lists)
+        print(f"  Built IVF index with {index.num_lists} lists in {time.time() - start_time:.1f}s")
+        return index.search_all(k_neighbors, num_probes)
+    raise ValueError(f"Unknown neighbor backend '{backend}', expected one of {NEIGHBOR_BACKENDS}")
@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import numpy as np
+
+# Offline stand-in for the Ollama endpoints generate_embeddings_ollama.py uses:
+#     GET  /api/tags         lists the configured model with a fixed digest
+#     POST /api/embeddings   {"model", "prompt"} -> {"embedding": [...]}
+#     POST /api/embed        {"model", "input": str | [str]} -> {"embeddings": [[...], ...]}
+# Vectors are derived from SHA-256 of (model, text), so every run returns the
+# same embedding for the same word; /api/embed L2-normalizes them like Ollama.
+# Each request sleeps latency + per-item latency * inputs + uniform jitter, and
+# fails with HTTP 500 with probability error_rate. Like Ollama, at most
+# `parallel` requests are processed at once and the rest queue, so fetch
+# concurrency and batching can be benchmarked (benchmark_embeddings.py)
+# without a live server.
+
+# --- Configuration ---
+DEFAULT_PORT = 11434
+DEFAULT_MODEL = "nomic-embed-text:137m-v1.5-fp16"
+DEFAULT_DIM = 768
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_PER_ITEM_MS = 2.0
+DEFAULT_JITTER_MS = 5.0
+DEFAULT_PARALLEL = 4 # Requests processed at once (OLLAMA_NUM_PARALLEL)
+
+
+def standin_vector(model: str, text: str, dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Deterministic float32 embedding of text for model (not normalized)."""
+    seed = int.from_bytes(hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def standin_digest(model: str) -> str:
+    return hashlib.sha256(f"standin\0{model}".encode("utf-8")).hexdigest()
+
+
+class StandinServer(ThreadingHTTPServer):
+    """HTTP server holding the stand-in settings and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = DEFAULT_PORT, model: str = DEFAULT_MODEL, dim: int = DEFAULT_DIM,
+                 latency_ms: float = DEFAULT_LATENCY_MS, per_item_ms: float = DEFAULT_PER_ITEM_MS,
+                 jitter_ms: float = DEFAULT_JITTER_MS, error_rate: float = 0.0,
+                 parallel: int = DEFAULT_PARALLEL, seed: int = 0):
+        """
+        Args:
+            port: Port on 127.0.0.1 (0 picks a free one; see server_address).
+            model: Model name served; other names get HTTP 404.
+            dim: Embedding dimension.
+            latency_ms: Base latency of every request.
+            per_item_ms: Extra latency per input text.
+            jitter_ms: Latency varies uniformly by up to this much either way.
+            error_rate: Probability that a request fails with HTTP 500.
+            parallel: Requests processed at once; others wait for a slot.
+            seed: Seed for latency jitter and injected errors.
+        """
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.model = model
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.per_item_ms = per_item_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slots = threading.Semaphore(parallel)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def draw_delay_and_error(self, num_items: int):
+        """Sleep time in seconds and whether to fail, for one request of num_items texts."""
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self.rng.random() < self.error_rate
+        return max(0.0, self.latency_ms + self.per_item_ms * num_items + jitter) / 1000.0, fail
+
+    def start_background(self) -> threading.Thread:
+        """Serve from a daemon thread (stop with shutdown())."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Ollama
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/api/tags":
+            self._send_json(404, {"error": "not found"})
+            return
+        self.server.count("tags")
+        model = self.server.model
+        self._send_json(200, {"models": [{"name": model, "model": model, "digest": standin_digest(model)}]})
+
+    def do_POST(self):
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        if self.path == "/api/embeddings":
+            texts: List[str] = [request.get("prompt", "")]
+        elif self.path == "/api/embed":
+            inputs = request.get("input", [])
+            texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        else:
+            self._send_json(404, {"error": "not found"})
+            return
+        if request.get("model") != self.server.model:
+            self._send_json(404, {"error": f"model \"{request.get('model')}\" not found"})
+            return
+
+        self.server.count(self.path)
+        delay, fail = self.server.draw_delay_and_error(len(texts))
+        with self.server.slots:
+            time.sleep(delay)
+        if fail:
+            self.server.count("errors")
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        vectors = [standin_vector(self.server.model, text, self.server.dim) for text in texts]
+        if self.path == "/api/embeddings":
+            self._send_json(200, {"embedding": vectors[0].tolist()})
+        else:
+            vectors = [vector / np.linalg.norm(vector) for vector in vectors]
+            self._send_json(200, {"model": self.server.model, "embeddings": [vector.tolist() for vector in vectors]})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve deterministic fake embeddings on the Ollama API')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port on 127.0.0.1')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='Model name to serve')
+    parser.add_argument('--dim', type=int, default=DEFAULT_DIM, help='Embedding dimension')
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_LATENCY_MS, help='Base latency per request')
+    parser.add_argument('--per-item-ms', type=float, default=DEFAULT_PER_ITEM_MS, help='Extra latency per input text')
+    parser.add_argument('--jitter-ms', type=float, default=DEFAULT_JITTER_MS, help='Uniform latency jitter (+/-)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with HTTP 500')
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL, help='Requests processed at once')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for jitter and injected errors')
+    args = parser.parse_args()
+
+    server = StandinServer(args.port, args.model, args.dim, args.latency_ms, args.per_item_ms,
+                           args.jitter_ms, args.error_rate, args.parallel, args.seed)
+    print(f"Serving {args.model} stand-in embeddings on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from word_graph import (WordGraph, load_graph, read_manifest, source_fingerprint,
+                        source_matches, write_json_atomic)
+
+# All-pairs shortest-path atlas for graph.json.
+#
+# hops.npy is an N x N uint8 matrix: hops[a, b] is the number of steps on the
+# weighted (1 - similarity) shortest path from a to b. predecessors.npy is an
+# N x N uint16 matrix holding each source's shortest-path tree: the node before
+# b on the path from a. Walking a single row back from b gives the path in
+# O(path length), and because every row is the exact tree of WordGraph's
+# Dijkstra, atlas paths are identical to WordGraph.shortest_path output.
+#
+# The atlas lives next to the graph (graph.json -> graph.json.atlas/) and is
+# tied to the graph's content hash, so a rebuilt graph.json is never answered
+# from a stale atlas.
+
+# --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+GRAPH_PATH = PROJECT_ROOT / "src" / "data" / "graph.json"
+DAILY_CHALLENGES_PATH = PROJECT_ROOT / "src" / "data" / "daily_challenges.json"
+
+ATLAS_SUFFIX = ".atlas"
+ATLAS_FORMAT_VERSION = 1
+UNREACHABLE = 255  # hops value for "no path"
+NO_PREDECESSOR = 65535  # predecessor value for the source itself and unreachable nodes
+SOURCES_PER_TASK = 64
+
+
+class PathAtlas:
+    """Memory-mapped all-pairs hop lengths and shortest-path trees for one graph."""
+
+    def __init__(self, atlas_dir: str, words: List[str], word_ids: Dict[str, int],
+                 hops: np.ndarray, predecessors: np.ndarray):
+        self.atlas_dir = atlas_dir
+        self.words = words
+        self.word_ids = word_ids
+        self.hops = hops
+        self.predecessors = predecessors
+
+    def __getstate__(self):
+        # Workers reopen the mapped files instead of receiving ~75 MB of pickled tables
+        return {"atlas_dir": self.atlas_dir, "words": self.words, "word_ids": self.word_ids}
+
+    def __setstate__(self, state):
+        hops, predecessors = _open_tables(state["atlas_dir"])
+        self.__init__(state["atlas_dir"], state["words"], state["word_ids"], hops, predecessors)
+
+    def distance_ids(self, start: int, end: int) -> Optional[int]:
+        """Steps on the shortest path between two node ids, or None if unreachable."""
+        hops = int(self.hops[start, end])
+        return None if hops == UNREACHABLE else hops
+
+    def path_ids(self, start: int, end: int) -> List[int]:
+        """Shortest path between two node ids, or [] if unreachable."""
+        if start == end:
+            return [start]
+        if self.hops[start, end] == UNREACHABLE:
+            return []
+        row = self.predecessors[start]
+        path = [end]
+        node = end
+        while node != start:
+            node = int(row[node])
+            path.append(node)
+        path.reverse()
+        return path
+
+    def distance(self, start: str, end: str) -> Optional[int]:
+        """Steps on the shortest path between two words, or None if unknown or unreachable."""
+        start_id = self.word_ids.get(start)
+        end_id = self.word_ids.get(end)
+        if start_id is None or end_id is None:
+            return None
+        return self.distance_ids(start_id, end_id)
+
+    def path(self, start: str, end: str) -> List[str]:
+        """Shortest path between two words, or [] if unknown or unreachable."""
+        start_id = self.word_ids.get(start)
+        end_id = self.word_ids.get(end)
+        if start_id is None or end_id is None:
+            return []
+        return [self.words[i] for i in self.path_ids(start_id, end_id)]
+
+
+def atlas_dir_for(graph_path) -> str:
+    """Atlas directory for a graph.json path."""
+    return os.fspath(graph_path) + ATLAS_SUFFIX
+
+
+def _open_tables(atlas_dir: str) -> Tuple[np.ndarray, np.ndarray]:
+    hops = np.load(os.path.join(atlas_dir, "hops.npy"), mmap_mode='r')
+    predecessors = np.load(os.path.join(atlas_dir, "predecessors.npy"), mmap_mode='r')
+    return hops, predecessors
+
+
+def open_atlas(graph_path, graph: WordGraph) -> Optional[PathAtlas]:
+    """Open the atlas built for graph_path, or None if there is none or it is stale."""
+    graph_path = os.fspath(graph_path)
+    atlas_dir = atlas_dir_for(graph_path)
+    manifest_path = os.path.join(atlas_dir, "manifest.json")
+    manifest = read_manifest(manifest_path, ATLAS_FORMAT_VERSION)
+    if manifest is None:
+        return None
+    if manifest.get("num_words") != len(graph) or not source_matches(graph_path, manifest, manifest_path):
+        print(f"Warning: Path atlas at {atlas_dir} is stale; rebuild it with path_atlas.py build",
+              file=sys.stderr)
+        return None
+    try:
+        hops, predecessors = _open_tables(atlas_dir)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable path atlas at {atlas_dir}: {e}", file=sys.stderr)
+        return None
+    return PathAtlas(atlas_dir, graph.words, graph.word_ids, hops, predecessors)
+
+
+# --- Build ---
+
+_worker_graph = None
+
+
+def _init_worker(graph_path: str) -> None:
+    global _worker_graph
+    _worker_graph = load_graph(graph_path, use_atlas=False)
+
+
+def _build_rows(source_range: Tuple[int, int]) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Compute atlas rows for sources in [start, stop) in a worker process."""
+    start, stop = source_range
+    num_words = len(_worker_graph)
+    hops_block = np.full((stop - start, num_words), UNREACHABLE, dtype=np.uint8)
+    predecessors_block = np.full((stop - start, num_words), NO_PREDECESSOR, dtype=np.uint16)
+
+    for row, source in enumerate(range(start, stop)):
+        _, previous, hops = _worker_graph.shortest_path_tree(source)
+        reachable = hops >= 0
+        if hops.max() >= UNREACHABLE:
+            raise ValueError(f"Path from '{_worker_graph.words[source]}' exceeds {UNREACHABLE - 1} steps")
+        hops_block[row, reachable] = hops[reachable]
+        has_previous = previous >= 0
+        predecessors_block[row, has_previous] = previous[has_previous]
+
+    return start, hops_block, predecessors_block
+
+
+def build_atlas(graph_path, workers: Optional[int] = None) -> str:
+    """
+    Precompute the atlas for graph_path with one full Dijkstra per source word,
+    spread over a process pool, and write it next to the graph.
+
+    Returns:
+        The atlas directory.
+    """
+    graph_path = os.fspath(graph_path)
+    graph = load_graph(graph_path, use_atlas=False)
+    num_words = len(graph)
+    if num_words >= NO_PREDECESSOR:
+        print(f"Error: {num_words} words do not fit a uint16 predecessor table.")
+        sys.exit(1)
+
+    atlas_dir = atlas_dir_for(graph_path)
+    manifest_path = os.path.join(atlas_dir, "manifest.json")
+    os.makedirs(atlas_dir, exist_ok=True)
+    # Invalidate first so a half-written atlas is never picked up
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tmp_hops_path = os.path.join(atlas_dir, f"hops.tmp{os.getpid()}.npy")
+    tmp_predecessors_path = os.path.join(atlas_dir, f"predecessors.tmp{os.getpid()}.npy")
+    hops = np.lib.format.open_memmap(tmp_hops_path, mode='w+', dtype=np.uint8,
+                                     shape=(num_words, num_words))
+    predecessors = np.lib.format.open_memmap(tmp_predecessors_path, mode='w+', dtype=np.uint16,
+                                             shape=(num_words, num_words))
+
+    workers = workers or cpu_count()
+    tasks = [(start, min(start + SOURCES_PER_TASK, num_words))
+             for start in range(0, num_words, SOURCES_PER_TASK)]
+    print(f"Building path atlas for {num_words} words with {workers} workers...")
+    start_time = time.time()
+    with Pool(processes=workers, initializer=_init_worker, initargs=(graph_path,)) as pool:
+        for done, (start, hops_block, predecessors_block) in enumerate(
+                pool.imap_unordered(_build_rows, tasks), 1):
+            hops[start:start + len(hops_block)] = hops_block
+            predecessors[start:start + len(predecessors_block)] = predecessors_block
+            if done % 10 == 0 or done == len(tasks):
+                print(f"  Processed {min(done * SOURCES_PER_TASK, num_words)}/{num_words} sources...")
+
+    hops.flush()
+    predecessors.flush()
+    del hops, predecessors
+    os.replace(tmp_hops_path, os.path.join(atlas_dir, "hops.npy"))
+    os.replace(tmp_predecessors_path, os.path.join(atlas_dir, "predecessors.npy"))
+
+    manifest = {"version": ATLAS_FORMAT_VERSION, "num_words": num_words}
+    manifest.update(source_fingerprint(graph_path))
+    write_json_atomic(manifest_path, manifest)
+    print(f"Path atlas written to {atlas_dir} in {time.time() - start_time:.1f}s")
+    return atlas_dir
+
+
+def validate_challenges(graph_path, challenges_path) -> int:
+    """Check every daily challenge's optimalPathLength against the atlas. Returns the mismatch count."""
+    graph = load_graph(graph_path)
+    if graph.atlas is None:
+        print(f"Error: No up-to-date path atlas for {graph_path}. Run: python path_atlas.py build")
+        sys.exit(1)
+
+    with open(challenges_path, 'r') as f:
+        challenges = json.load(f)["challenges"]
+
+    mismatches = 0
+    for challenge in challenges:
+        start_word = challenge.get("startWord")
+        target_word = challenge.get("targetWord")
+        expected = challenge.get("optimalPathLength", challenge.get("pathLength"))
+        actual = graph.atlas.distance(start_word, target_word)
+        if actual != expected:
+            mismatches += 1
+            print(f"  {challenge.get('id')}: {start_word} -> {target_word} "
+                  f"stored {expected}, atlas {actual}")
+
+    print(f"Validated {len(challenges)} challenges: {mismatches} mismatches")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build or query the all-pairs shortest-path atlas')
+    parser.add_argument('command', choices=['build', 'validate'],
+                        help='build: precompute the atlas; validate: check daily challenge path lengths')
+    parser.add_argument('--graph', default=str(GRAPH_PATH), help='Path to graph.json')
+    parser.add_argument('--challenges', default=str(DAILY_CHALLENGES_PATH),
+                        help='Daily challenges file for validate')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for build')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_atlas(args.graph, args.workers)
+    else:
+        sys.exit(1 if validate_challenges(args.graph, args.challenges) else 0)
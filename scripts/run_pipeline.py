@@ -0,0 +1,282 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from word_graph import write_json_atomic
+
+# Runs the offline data pipeline, skipping stages whose inputs are unchanged:
+#
+#   embeddings -> tsne -------\
+#              \-> definitions -> graph -> pairs -> solve
+#
+# Every stage is a plain script invocation from the project root. A stage's key
+# is the SHA-256 of its command, its scripts and the contents of its input
+# files/directories; keys of successful runs are recorded in
+# data/pipeline_state.json, and a stage is skipped when its key is unchanged and
+# its outputs still exist. Every input is either a source file or the output of
+# an upstream stage (validate_stages checks this), so a change only reruns what
+# depends on it. Stages whose dependencies are done run concurrently (t-SNE
+# alongside the definition lookups).
+#
+# The pipeline builds a single k: build_graph.py only writes graph.json, which
+# pairs and solve read, when given one k (several write graph_k{k}.json each).
+#
+# The "definitions" stage fills the WordNet definition cache (definition_cache.py)
+# with build_graph's settings; build_graph then writes definitions.json from it.
+# The graph stage is keyed on that one cache file, not the whole cache directory.
+
+# --- Configuration ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_PATH = PROJECT_ROOT / "data" / "pipeline_state.json"
+LOG_DIR = PROJECT_ROOT / "data" / "pipeline_logs"
+PYTHON = sys.executable
+DEFAULT_JOBS = 2
+
+
+class Stage:
+    """One pipeline step: a command plus the files it reads and writes."""
+
+    def __init__(self, name: str, command: List[str], inputs: List[str], outputs: List[str],
+                 deps: Optional[List[str]] = None):
+        """
+        Args:
+            name: Stage name.
+            command: Command line, run from the project root.
+            inputs: Files or directories (relative to the root) whose contents key the stage,
+                including the scripts it runs.
+            outputs: Files or directories that must exist for the stage to be skipped.
+            deps: Stages that must finish first.
+        """
+        self.name = name
+        self.command = command
+        self.inputs = inputs
+        self.outputs = outputs
+        self.deps = deps or []
+
+
+def _relative(path) -> str:
+    return os.path.relpath(os.fspath(path), PROJECT_ROOT)
+
+
+def pipeline_stages(k_neighbors: int, pairs_seed: int, wordnet_version: Optional[str] = None) -> List[Stage]:
+    """
+    The pipeline, in dependency order.
+
+    wordnet_version names the definition cache file build_graph reads (default:
+    the installed WordNet's version).
+    """
+    import build_graph
+    import definition_cache
+    import generate_daily_pairs
+    import generate_embeddings_ollama
+    import generate_tsne
+    from build_graph import MAX_DEFINITION_LENGTH, MAX_DEFINITIONS_PER_WORD
+
+    # Paths come from the stage scripts' own constants, relative to the project root; each
+    # input is the reading script's constant, so test_run_pipeline.py catches scripts that disagree
+    words = _relative(generate_embeddings_ollama.WORDS_PATH)
+    embeddings = _relative(generate_embeddings_ollama.OUTPUT_PATH)
+    tsne = _relative(generate_tsne.OUTPUT_PATH)
+    client_graph = _relative(build_graph.OUTPUT_GRAPH_PATH)
+    pairs = _relative(generate_daily_pairs.OUTPUT_PATH)
+    if wordnet_version is None:
+        wordnet_version = definition_cache.wordnet_version()
+    # Only the cache file for build_graph's settings keys the graph stage, so other
+    # cache files (e.g. generate_definitions.py's) do not trigger a rebuild
+    definitions = _relative(definition_cache.cache_path_for(wordnet_version, MAX_DEFINITIONS_PER_WORD,
+                                                            MAX_DEFINITION_LENGTH))
+    graph_modules = ["scripts/nearest_neighbors.py", "scripts/similarity_store.py", "scripts/build_state.py",
+                     "scripts/embedding_store.py", "scripts/definition_cache.py", "scripts/graph_health.py",
+                     "scripts/word_graph.py"]
+    return [
+        Stage("embeddings", [PYTHON, "scripts/generate_embeddings_ollama.py"],
+              [words, "scripts/generate_embeddings_ollama.py", "scripts/embedding_store.py",
+               "scripts/embedding_checkpoint.py", "scripts/embedding_cache.py"],
+              [embeddings]),
+        Stage("tsne", [PYTHON, "scripts/generate_tsne.py"],
+              [_relative(generate_tsne.EMBEDDINGS_PATH), "scripts/generate_tsne.py", "scripts/embedding_store.py"],
+              [tsne], deps=["embeddings"]),
+        Stage("definitions", [PYTHON, "scripts/definition_cache.py", "warm", "--embeddings", embeddings,
+                              "--max-definitions", str(MAX_DEFINITIONS_PER_WORD),
+                              "--max-length", str(MAX_DEFINITION_LENGTH)],
+              [embeddings, "scripts/definition_cache.py"],
+              [definitions], deps=["embeddings"]),
+        Stage("graph", [PYTHON, "scripts/build_graph.py", "-k", str(k_neighbors)],
+              [_relative(build_graph.EMBEDDINGS_PATH), _relative(build_graph.TSNE_COORDS_PATH), definitions,
+               "scripts/build_graph.py"] + graph_modules,
+              [client_graph, _relative(build_graph.OUTPUT_DEFS_PATH)],
+              deps=["tsne", "definitions"]),
+        Stage("pairs", [PYTHON, "scripts/generate_daily_pairs.py", "--enumerate", "--seed", str(pairs_seed)],
+              [_relative(generate_daily_pairs.GRAPH_PATH), "scripts/generate_daily_pairs.py", "scripts/word_graph.py"],
+              [pairs], deps=["graph"]),
+        # Solve the pairs on the graph they were drawn from
+        Stage("solve", [PYTHON, "scripts/heuristic_solver.py", "--graph", client_graph, "--pairs", pairs],
+              [pairs, client_graph, "scripts/heuristic_solver.py", "scripts/landmarks.py",
+               "scripts/word_graph.py"],
+              [], deps=["pairs"]),
+    ]
+
+
+def validate_stages(stages: List[Stage]) -> None:
+    """
+    Check that dependencies name known, earlier stages and that every input
+    another stage writes is an output of an upstream stage. Raises ValueError.
+    """
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    upstream: Dict[str, set] = {}
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in upstream:
+                raise ValueError(f"Stage '{stage.name}' depends on '{dep}', which is not an earlier stage")
+        upstream[stage.name] = set(stage.deps).union(*(upstream[dep] for dep in stage.deps))
+        for relative in stage.inputs:
+            producer = producers.get(relative)
+            if producer is not None and producer not in upstream[stage.name]:
+                raise ValueError(f"Stage '{stage.name}' reads {relative}, an output of '{producer}', "
+                                 f"which is not upstream of it")
+
+
+def _hash_path(digest, root: Path, relative: str) -> None:
+    """Feed the contents of a file, or every file under a directory, into digest."""
+    path = root / relative
+    if path.is_dir():
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                _hash_path(digest, root, os.path.relpath(os.path.join(dirpath, filename), root))
+        return
+    digest.update(relative.encode() + b"\0")
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def stage_key(stage: Stage, root: Path) -> str:
+    """Content hash of a stage's command and inputs. Raises FileNotFoundError for a missing input."""
+    digest = hashlib.sha256(json.dumps(stage.command[1:]).encode())
+    for relative in stage.inputs:
+        if not (root / relative).exists():
+            raise FileNotFoundError(f"missing input {relative}")
+        _hash_path(digest, root, relative)
+    return digest.hexdigest()
+
+
+def run_stage(stage: Stage, root: Path, log_dir: Path, state: Dict, force: bool, dry_run: bool) -> Dict:
+    """Run (or skip) one stage. Returns a result row for the timing table."""
+    start_time = time.time()
+    try:
+        key = stage_key(stage, root)
+    except FileNotFoundError as e:
+        return {"stage": stage.name, "status": "failed", "seconds": 0.0, "detail": str(e)}
+
+    outputs_exist = all((root / output).exists() for output in stage.outputs)
+    if not force and state.get(stage.name) == key and outputs_exist:
+        return {"stage": stage.name, "status": "skipped", "seconds": 0.0, "detail": "inputs unchanged"}
+    if dry_run:
+        return {"stage": stage.name, "status": "stale", "seconds": 0.0, "detail": "would run"}
+
+    print(f"[{stage.name}] {' '.join(stage.command)}")
+    log_path = log_dir / f"{stage.name}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'w') as log:
+        returncode = subprocess.call(stage.command, cwd=root, stdout=log, stderr=subprocess.STDOUT)
+    seconds = time.time() - start_time
+    if returncode != 0:
+        return {"stage": stage.name, "status": "failed", "seconds": seconds,
+                "detail": f"exit code {returncode}, see {log_path}"}
+    return {"stage": stage.name, "status": "ran", "seconds": seconds, "key": key, "detail": str(log_path)}
+
+
+def run_pipeline(stages: List[Stage], root: Path = PROJECT_ROOT, state_path: Path = STATE_PATH,
+                 log_dir: Path = LOG_DIR, jobs: int = DEFAULT_JOBS, force: Optional[List[str]] = None,
+                 dry_run: bool = False) -> List[Dict]:
+    """
+    Run stages as their dependencies finish, up to jobs at a time.
+
+    Args:
+        force: Stage names to rerun regardless of their key ("all" for every stage).
+        dry_run: Only report which stages are stale; dependents of stale stages
+            are reported as stale too since their inputs would change.
+
+    Returns:
+        Result rows in completion order.
+    """
+    validate_stages(stages)
+    force = set(force or [])
+    try:
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    by_name = {stage.name: stage for stage in stages}
+    results: Dict[str, Dict] = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while len(results) < len(stages):
+            for stage in stages:
+                if stage.name in results or stage.name in running.values():
+                    continue
+                dep_results = [results.get(dep) for dep in stage.deps]
+                if any(r is None for r in dep_results):
+                    continue
+                if any(r["status"] in ("failed", "blocked") for r in dep_results):
+                    results[stage.name] = {"stage": stage.name, "status": "blocked", "seconds": 0.0,
+                                           "detail": "a dependency failed"}
+                    continue
+                if dry_run and any(r["status"] == "stale" for r in dep_results):
+                    results[stage.name] = {"stage": stage.name, "status": "stale", "seconds": 0.0,
+                                           "detail": "upstream is stale"}
+                    continue
+                stage_force = "all" in force or stage.name in force
+                running[executor.submit(run_stage, stage, root, log_dir, state, stage_force, dry_run)] = stage.name
+
+            if not running:
+                waiting = [stage.name for stage in stages if stage.name not in results]
+                if not waiting:
+                    break
+                # validate_stages rules this out; never spin on stages that cannot start
+                raise RuntimeError(f"Stages {waiting} are waiting on dependencies that never finish")
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results[running.pop(future)] = result
+                print(f"[{result['stage']}] {result['status']} ({result['seconds']:.1f}s) {result['detail']}")
+                if result["status"] == "ran":
+                    # Record progress as it happens so an interrupted run keeps finished stages
+                    state[result["stage"]] = result["key"]
+                    state_path.parent.mkdir(parents=True, exist_ok=True)
+                    write_json_atomic(str(state_path), state)
+
+    return [results[name] for name in by_name]
+
+
+def print_timing_table(results: List[Dict]) -> None:
+    print(f"\n{'stage':<14}{'status':<10}{'seconds':>10}  detail")
+    for row in results:
+        print(f"{row['stage']:<14}{row['status']:<10}{row['seconds']:>10.1f}  {row['detail']}")
+    print(f"{'total':<14}{'':<10}{sum(row['seconds'] for row in results):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the embeddings -> t-SNE -> graph -> pairs -> solver pipeline, '
+                                                 'skipping stages whose inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Stages run concurrently')
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE',
+                        help="Rerun these stages even if unchanged ('all' for every stage)")
+    parser.add_argument('--dry-run', action='store_true', help='Only report which stages would run')
+    parser.add_argument('-k', '--k', type=int, default=5, help='k passed to build_graph.py')
+    parser.add_argument('--pairs-seed', type=int, default=42, help='Seed passed to generate_daily_pairs.py')
+    args = parser.parse_args()
+
+    results = run_pipeline(pipeline_stages(args.k, args.pairs_seed), jobs=args.jobs, force=args.force,
+                           dry_run=args.dry_run)
+    print_timing_table(results)
+    sys.exit(1 if any(row["status"] in ("failed", "blocked") for row in results) else 0)
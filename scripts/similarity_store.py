@@ -0,0 +1,201 @@
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from nearest_neighbors import rows_per_block, similarity_blocks
+from word_graph import read_manifest, write_json_atomic
+
+# Quantized all-pairs cosine similarity store written by build_graph.py.
+#
+# Cosine similarity is symmetric, so only the upper triangle (diagonal
+# included) is kept, row by row, in one flat array: row i holds the
+# similarities of words[i] to words[i:], starting at i * N - i * (i - 1) / 2.
+# Scores are quantized to uint16 (about 3e-5 resolution) or int8 (about 8e-3)
+# and the directory holds:
+#     similarities.npy   flat upper triangle, memory-mapped by the reader
+#     words.json         word list (row/column order)
+#     manifest.json      format version, dtype and word count
+
+STORE_FORMAT_VERSION = 1
+STORE_DTYPES = ("uint16", "int8")
+
+
+def _quantize(scores: np.ndarray, dtype: str) -> np.ndarray:
+    # One float temporary (the clipped copy), scaled in place
+    scores = np.clip(scores, -1.0, 1.0)
+    if dtype == "uint16":
+        scores += 1.0
+        scores *= 32767.5
+        return np.rint(scores, out=scores).astype(np.uint16)
+    scores *= 127.0
+    return np.rint(scores, out=scores).astype(np.int8)
+
+
+def _dequantize(values: np.ndarray, dtype: str) -> np.ndarray:
+    if dtype == "uint16":
+        return values.astype(np.float32) / np.float32(32767.5) - np.float32(1.0)
+    return values.astype(np.float32) / np.float32(127.0)
+
+
+def _row_offsets(num_words: int) -> np.ndarray:
+    rows = np.arange(num_words + 1, dtype=np.int64)
+    return rows * num_words - rows * (rows - 1) // 2
+
+
+def write_similarity_store(store_dir: str, words: List[str], normalized: np.ndarray,
+                           dtype: str = "uint16", block_mb: float = 256,
+                           previous_ids: Optional[np.ndarray] = None) -> int:
+    """
+    Quantize the upper triangle of normalized @ normalized.T into store_dir,
+    one block of rows at a time.
+
+    Args:
+        store_dir: Output directory (created if needed).
+        words: Word for each row of normalized.
+        normalized: (N, d) float32 matrix from nearest_neighbors.normalize_embeddings.
+        dtype: "uint16" or "int8".
+        block_mb: Memory budget for each block of similarity rows.
+        previous_ids: For an incremental update of the store already in store_dir:
+            each word's id in that store, or -1 if it is new or re-embedded. Pairs
+            of two previous words are copied instead of recomputed.
+
+    Returns:
+        Size of similarities.npy in bytes.
+    """
+    if dtype not in STORE_DTYPES:
+        raise ValueError(f"Unknown similarity store dtype '{dtype}', expected one of {STORE_DTYPES}")
+    num_words = len(words)
+    offsets = _row_offsets(num_words)
+    previous = SimilarityStore(store_dir) if previous_ids is not None else None
+    os.makedirs(store_dir, exist_ok=True)
+    manifest_path = os.path.join(store_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    similarities_path = os.path.join(store_dir, "similarities.npy")
+    tmp_path = os.path.join(store_dir, f"similarities.tmp{os.getpid()}.npy")
+    triangle = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.dtype(dtype),
+                                         shape=(int(offsets[-1]),))
+    if previous is None:
+        for start, block in similarity_blocks(normalized, rows_per_block(num_words, block_mb)):
+            values = _quantize(block, dtype)
+            # Row i of the triangle is row i of the matrix from column i on
+            for row, i in enumerate(range(start, start + len(block))):
+                triangle[offsets[i]:offsets[i + 1]] = values[row, i:]
+    else:
+        _update_triangle(triangle, offsets, previous, previous_ids, normalized, dtype, block_mb)
+    triangle.flush()
+    del triangle
+    os.replace(tmp_path, similarities_path)
+
+    write_json_atomic(os.path.join(store_dir, "words.json"), words)
+    write_json_atomic(manifest_path, {"version": STORE_FORMAT_VERSION, "dtype": dtype, "num_words": num_words})
+    return os.path.getsize(similarities_path)
+
+
+def _update_triangle(triangle: np.ndarray, offsets: np.ndarray, previous: "SimilarityStore",
+                     previous_ids: np.ndarray, normalized: np.ndarray, dtype: str, block_mb: float) -> None:
+    """
+    Fill triangle from the previous store, computing only pairs that involve a fresh word.
+
+    Copied pairs keep the quantized value of the previous build. A full rebuild
+    recomputes them with a differently shaped matrix product, whose float rounding
+    can move a score that sits on a quantization boundary, so the two stores may
+    differ by one quantum on such pairs.
+    """
+    num_words = len(normalized)
+    previous_offsets = previous._offsets
+    fresh = np.nonzero(previous_ids < 0)[0]
+    # A block scores its fresh rows against every word and its other rows against
+    # the fresh words only, so it never holds more than a full block of scores;
+    # copied cells are gathered one row at a time
+    block_rows = rows_per_block(num_words, block_mb)
+    for start in range(0, num_words, block_rows):
+        stop = min(start + block_rows, num_words)
+        block_ids = previous_ids[start:stop]
+        fresh_rows = np.nonzero(block_ids < 0)[0]
+        old_rows = np.nonzero(block_ids >= 0)[0]
+        if len(fresh_rows):
+            fresh_row_values = _quantize(normalized[start + fresh_rows] @ normalized.T, dtype)
+            for row, local in enumerate(fresh_rows):
+                i = start + int(local)
+                triangle[offsets[i]:offsets[i + 1]] = fresh_row_values[row, i:]
+            del fresh_row_values
+        if len(fresh):
+            fresh_col_values = _quantize(normalized[start + old_rows] @ normalized[fresh].T, dtype)
+
+        for row, local in enumerate(old_rows):
+            i = start + int(local)
+            values = np.empty(num_words - i, dtype=np.dtype(dtype))
+            old_id = previous_ids[i]
+            col_ids = previous_ids[i:]
+            old_cols = np.nonzero(col_ids >= 0)[0]
+            lo = np.minimum(col_ids[old_cols], old_id)
+            hi = np.maximum(col_ids[old_cols], old_id)
+            values[old_cols] = previous.values[previous_offsets[lo] + (hi - lo)]
+            if len(fresh):
+                # fresh is sorted, so the fresh columns at or after i are a suffix of it
+                first = np.searchsorted(fresh, i)
+                values[fresh[first:] - i] = fresh_col_values[row, first:]
+            triangle[offsets[i]:offsets[i + 1]] = values
+
+
+def write_dense_json(path: str, words: List[str], normalized: np.ndarray, block_mb: float = 256) -> None:
+    """
+    Stream the legacy dense_similarity_matrix.json ({word: {word: score rounded
+    to 3 places}}) one row at a time instead of building the nested dict.
+    """
+    with open(path, 'w') as f:
+        f.write('{')
+        for start, block in similarity_blocks(normalized, rows_per_block(len(words), block_mb)):
+            for offset, similarities in enumerate(block):
+                row = {word: round(float(score), 3) for word, score in zip(words, similarities)}
+                f.write(', ' if start + offset else '')
+                f.write(f"{json.dumps(words[start + offset])}: {json.dumps(row)}")
+        f.write('}')
+
+
+class SimilarityStore:
+    """Read-only view of a store written by write_similarity_store."""
+
+    def __init__(self, store_dir: str):
+        manifest = read_manifest(os.path.join(store_dir, "manifest.json"), STORE_FORMAT_VERSION)
+        if manifest is None:
+            raise FileNotFoundError(f"No similarity store at {store_dir}")
+        with open(os.path.join(store_dir, "words.json"), 'r') as f:
+            self.words: List[str] = json.load(f)
+        self.word_ids: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        self.dtype = manifest["dtype"]
+        self.values = np.load(os.path.join(store_dir, "similarities.npy"), mmap_mode='r')
+        self._offsets = _row_offsets(len(self.words))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_ids
+
+    def similarity_ids(self, first: Sequence[int], second: Sequence[int]) -> np.ndarray:
+        """Similarities for aligned arrays of word ids."""
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        rows = np.minimum(first, second)
+        cols = np.maximum(first, second)
+        return _dequantize(self.values[self._offsets[rows] + (cols - rows)], self.dtype)
+
+    def similarity(self, word1: str, word2: str) -> float:
+        """Cosine similarity between two words (KeyError if either is unknown)."""
+        return float(self.similarity_ids([self.word_ids[word1]], [self.word_ids[word2]])[0])
+
+    def similarities(self, pairs: Sequence[Sequence[str]]) -> np.ndarray:
+        """Cosine similarities for a list of (word1, word2) pairs (KeyError if a word is unknown)."""
+        first = [self.word_ids[word1] for word1, _ in pairs]
+        second = [self.word_ids[word2] for _, word2 in pairs]
+        return self.similarity_ids(first, second)
+
+    def row(self, word: str) -> np.ndarray:
+        """Similarities of word to every word, in self.words order."""
+        word_id = self.word_ids[word]
+        return self.similarity_ids(np.full(len(self.words), word_id), np.arange(len(self.words)))
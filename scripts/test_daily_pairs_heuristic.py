@@ -9,6 +9,7 @@ import random
 
 # Import the heuristic solver
 from heuristic_solver import HeuristicSolver
+from word_graph import load_graph
 
 # --- Configuration ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -254,8 +255,7 @@ def main():
     print("Loading game data...")
     daily_challenges_data = load_json_file(DAILY_CHALLENGES_PATH)
     daily_challenges = daily_challenges_data["challenges"]
-    graph_data = load_json_file(GRAPH_PATH)
-    graph_nodes = graph_data["nodes"]
+    graph = load_graph(GRAPH_PATH)
 
     # Sort challenges by path length and filter for length 6
     daily_challenges = sorted(daily_challenges, key=lambda x: x['pathLength'])
@@ -285,8 +285,8 @@ def main():
 
     # Initialize heuristic solver
     print(f"\nInitializing heuristic solver...")
-    solver = HeuristicSolver(graph_nodes)
-    print(f"Solver initialized with {len(graph_nodes)} words")
+    solver = HeuristicSolver(graph)
+    print(f"Solver initialized with {len(graph)} words")
     print(f"Identified {len(solver.hub_words)} hub words")
 
     # Filter out already solved challenges
@@ -7,9 +7,10 @@ from openai import OpenAI
 from pathlib import Path
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Set, Tuple
-import heapq
 from dotenv import load_dotenv
 
+from word_graph import WordGraph, load_graph
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -118,70 +119,26 @@ def save_json_file(data: List[Dict], path: Path) -> None:
         json.dump(normalized_data, f, indent=2)
     print(f"Results saved to {path}")
 
-def get_word_neighbors(graph_nodes: Dict, current_word: str) -> List[str]:
+def get_word_neighbors(graph: WordGraph, current_word: str) -> List[str]:
     """Get the top k=6 nearest neighbors of the current word."""
-    if current_word not in graph_nodes:
-        return []
-    node_data = graph_nodes[current_word]
-    return [neighbor for neighbor in node_data.get("edges", {}) if neighbor in graph_nodes]
+    return graph.neighbors(current_word)
 
 def normalize_word(word: str) -> str:
     """Normalize a word to lowercase for comparison."""
     return word.lower()
 
-def find_shortest_path(graph: Dict, start: str, end: str) -> List[str]:
+def find_shortest_path(graph: WordGraph, start: str, end: str) -> List[str]:
     """Find shortest path between two words using Dijkstra's algorithm."""
     if start not in graph or end not in graph:
         print(f"find_shortest_path: Invalid graph data or start/end words (start={start}, end={end})")
         return []
     
-    # Initialize distances and previous nodes
-    distances = {word: float('infinity') for word in graph}
-    previous = {word: None for word in graph}
-    visited = set()
-    unvisited = set(graph.keys())
-    distances[start] = 0
-    
-    while unvisited:
-        # Find unvisited node with smallest distance
-        current = min(unvisited, key=lambda x: distances[x], default=None)
-        if current is None or distances[current] == float('infinity') or current == end:
-            break
-            
-        unvisited.remove(current)
-        visited.add(current)
-        
-        # Update distances for neighbors
-        edges = graph[current].get("edges", {})
-        for neighbor, similarity in edges.items():
-            if neighbor in visited:
-                continue
-                
-            cost = 1 - similarity
-            distance_through_current = distances[current] + cost
-            
-            if distance_through_current < distances[neighbor]:
-                distances[neighbor] = distance_through_current
-                previous[neighbor] = current
-    
-    # Reconstruct path if end is reachable
-    if distances[end] == float('infinity'):
+    path = graph.shortest_path(start, end)
+    if not path:
         print(f"No path found from {start} to {end}")
-        return []
-        
-    # Trace back from end to start
-    path = []
-    current = end
-    while current is not None:
-        path.insert(0, current)
-        current = previous[current]
-        if current == start:
-            path.insert(0, start)
-            break
-    
     return path
 
-def format_game_state(state: GameState, graph_nodes: Dict, invalid_move: Optional[Dict] = None) -> str:
+def format_game_state(state: GameState, graph: WordGraph, invalid_move: Optional[Dict] = None) -> str:
     """Format the current game state for the LLM."""
     state_str = ""
     if invalid_move:
@@ -211,7 +168,7 @@ Path So Far: {' -> '.join(path_with_labels)}
 Available Moves (k=6 nearest neighbors):
 """
     for word in state.neighbors:
-        if word in graph_nodes:
+        if word in graph:
             state_str += f"- {word}\n"
     
     return state_str
@@ -363,7 +320,7 @@ def get_client() -> OpenAI:
         return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     return OpenAI(base_url=OLLAMA_BASE_URL, api_key=OLLAMA_API_KEY)
 
-def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph_nodes: Dict, 
+def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph: WordGraph, 
                  client: OpenAI, system_prompt: str, solved_challenges: Set[str]) -> Tuple[List[Dict], int, int, int]:
     """Process a batch of challenges."""
     batch_results = []
@@ -408,7 +365,7 @@ def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph
         print(f"--- Challenge {challenge_id}: {start_word} -> {end_word} (Optimal: {original_path_len} steps) ---")
 
         # Find optimal path for display purposes only
-        optimal_path = find_shortest_path(graph_nodes, start_word, end_word)
+        optimal_path = find_shortest_path(graph, start_word, end_word)
         recalculated_length = len(optimal_path) - 1 if optimal_path else float('inf')
         assert recalculated_length == original_path_len, f"Path length mismatch for {start_word} -> {end_word}: original={original_path_len}, recalculated={recalculated_length}"
         
@@ -417,7 +374,7 @@ def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph
             current_word=start_word,
             target_word=end_word,
             path_so_far=[start_word],
-            neighbors=get_word_neighbors(graph_nodes, start_word),
+            neighbors=get_word_neighbors(graph, start_word),
             steps_taken=0,
             optimal_path=optimal_path,
             suggested_path=optimal_path,
@@ -443,7 +400,7 @@ def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph
                 }
                 last_backtrack_word = None
             
-            state_prompt = format_game_state(current_state, graph_nodes, invalid_move)
+            state_prompt = format_game_state(current_state, graph, invalid_move)
             
             try:
                 max_retries = 5
@@ -543,9 +500,9 @@ def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph
                                 current_state.path_so_far.append(actual_word)
                                 current_state.current_word = actual_word
                                 current_state.steps_taken += 1
-                                current_state.neighbors = get_word_neighbors(graph_nodes, actual_word)
+                                current_state.neighbors = get_word_neighbors(graph, actual_word)
                                 current_state.prev_moves_left = max(len(current_state.suggested_path) - 1, 0)
-                                current_state.suggested_path = find_shortest_path(graph_nodes, actual_word, end_word)
+                                current_state.suggested_path = find_shortest_path(graph, actual_word, end_word)
                                 if current_state.suggested_path and len(current_state.suggested_path) > 1:
                                     next_suggested = current_state.suggested_path[1]
                                     current_state.path_suggested_moves.append(next_suggested)
@@ -583,8 +540,8 @@ def process_batch(challenges: List[Dict], start_idx: int, batch_size: int, graph
                             current_state.path_so_far = current_state.path_so_far[:last_optimal_idx + 1]
                             current_state.current_word = backtrack_word
                             current_state.steps_taken = last_optimal_idx
-                            current_state.neighbors = get_word_neighbors(graph_nodes, backtrack_word)
-                            current_state.suggested_path = find_shortest_path(graph_nodes, backtrack_word, end_word)
+                            current_state.neighbors = get_word_neighbors(graph, backtrack_word)
+                            current_state.suggested_path = find_shortest_path(graph, backtrack_word, end_word)
                             current_state.prev_moves_left = max(len(current_state.suggested_path) - 1, 0)
                             current_state.path_suggested_moves = current_state.path_suggested_moves[:last_optimal_idx]
                             current_state.invalid_moves = []
@@ -688,8 +645,7 @@ def main():
     print("Loading game data...")
     daily_challenges_data = load_json_file(DAILY_CHALLENGES_PATH)
     daily_challenges = daily_challenges_data["challenges"]
-    graph_data = load_json_file(GRAPH_PATH)
-    graph_nodes = graph_data["nodes"]
+    graph = load_graph(GRAPH_PATH)
 
     # Sort challenges by path length and filter for length 6
     daily_challenges = sorted(daily_challenges, key=lambda x: x['pathLength'])
@@ -750,7 +706,7 @@ Let's think step by step.
             break
 
         batch_results, batch_solved, batch_failed, batch_skipped = process_batch(
-            daily_challenges, start_idx, BATCH_SIZE, graph_nodes, client, system_prompt, solved_challenges
+            daily_challenges, start_idx, BATCH_SIZE, graph, client, system_prompt, solved_challenges
         )
         
         # Update totals
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, variant_dir_for
+
+# Checks that the embedding cache keeps every model's entries.
+# Run with: python -m pytest scripts/test_embedding_cache.py
+
+DIGEST = "sha256:" + "ab" * 32
+
+
+def cache_with(cache_root, model, word, value):
+    cache = EmbeddingCache(model, DIGEST, "embed", str(cache_root))
+    cache.put(word, np.full(4, value, dtype=np.float32))
+    cache.flush()
+    return cache
+
+
+def test_second_model_does_not_evict_the_first(tmp_path):
+    cache_with(tmp_path, "first-model", "apple", 1.0)
+    cache_with(tmp_path, "second-model", "apple", 2.0)
+    # Names that map to the same directory share it instead of replacing it
+    assert variant_dir_for("third:model", DIGEST, "embed", str(tmp_path)) == \
+        variant_dir_for("third_model", DIGEST, "embed", str(tmp_path))
+    cache_with(tmp_path, "third:model", "apple", 3.0)
+    cache_with(tmp_path, "third_model", "apple", 4.0)
+
+    for model, value in [("first-model", 1.0), ("second-model", 2.0), ("third:model", 3.0), ("third_model", 4.0)]:
+        cached = EmbeddingCache(model, DIGEST, "embed", str(tmp_path)).lookup(["apple", "pear"])
+        assert list(cached) == ["apple"]
+        assert np.array_equal(cached["apple"], np.full(4, value, dtype=np.float32))
+
+
+def test_unreadable_manifest_keeps_the_entries(tmp_path, capsys):
+    cache = cache_with(tmp_path, "model", "apple", 1.0)
+    with open(os.path.join(cache.checkpoint_dir, "manifest.json"), 'w') as f:
+        f.write('{"vers')
+
+    reopened = EmbeddingCache("model", DIGEST, "embed", str(tmp_path))
+    assert "manifest.json" in capsys.readouterr().err
+    assert list(reopened.lookup(["apple"])) == ["apple"]
+    # New entries go to a new shard instead of overwriting the old one
+    reopened.put("pear", np.zeros(4, dtype=np.float32))
+    reopened.flush()
+    assert len(EmbeddingCache("model", DIGEST, "embed", str(tmp_path)).lookup(["apple", "pear"])) == 2
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+
+import generate_embeddings_ollama as fetcher
+from embedding_checkpoint import EmbeddingCheckpoint
+from embedding_store import EmbeddingStore
+from ollama_standin import StandinServer
+
+# Checks that an interrupted embedding run resumes from its checkpoint shards.
+# Run with: python -m pytest scripts/test_embedding_checkpoint.py
+
+MODEL = "test-model"
+
+
+def vector_for(i):
+    return np.full(4, i, dtype=np.float32)
+
+
+def test_resume_keeps_flushed_shards(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    checkpoint = EmbeddingCheckpoint(checkpoint_dir, MODEL, shard_size=3)
+    for i in range(7):
+        checkpoint.add(f"w{i}", vector_for(i))
+    # Interrupted before the final flush: only the two full shards survive
+
+    resumed = EmbeddingCheckpoint(checkpoint_dir, MODEL, shard_size=3, resume=True)
+    assert sorted(resumed.embeddings) == [f"w{i}" for i in range(6)]
+    assert np.array_equal(resumed.embeddings["w4"], vector_for(4))
+
+    # New shards continue the numbering instead of overwriting
+    resumed.add("w6", vector_for(6))
+    resumed.flush()
+    assert sorted(os.listdir(checkpoint_dir)) == ["manifest.json", "shard_00000.npz",
+                                                 "shard_00001.npz", "shard_00002.npz"]
+    assert len(EmbeddingCheckpoint(checkpoint_dir, MODEL, resume=True)) == 7
+
+
+def test_other_model_or_no_resume_starts_over(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    checkpoint = EmbeddingCheckpoint(checkpoint_dir, MODEL)
+    checkpoint.add("w0", vector_for(0))
+    checkpoint.flush()
+
+    assert len(EmbeddingCheckpoint(checkpoint_dir, "other-model", resume=True)) == 0
+    checkpoint = EmbeddingCheckpoint(checkpoint_dir, MODEL)
+    checkpoint.add("w0", vector_for(0))
+    checkpoint.flush()
+    assert len(EmbeddingCheckpoint(checkpoint_dir, MODEL, resume=False)) == 0
+
+
+def test_corrupt_shard_is_skipped_with_a_warning(tmp_path, capsys):
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    checkpoint = EmbeddingCheckpoint(checkpoint_dir, MODEL, shard_size=1)
+    checkpoint.add("w0", vector_for(0))
+    checkpoint.add("w1", vector_for(1))
+    with open(os.path.join(checkpoint_dir, "shard_00000.npz"), 'wb') as f:
+        f.write(b"torn")
+
+    resumed = EmbeddingCheckpoint(checkpoint_dir, MODEL, shard_size=1, resume=True)
+    assert list(resumed.embeddings) == ["w1"]
+    captured = capsys.readouterr()
+    assert "shard_00000.npz" in captured.err and "shard_00000.npz" not in captured.out
+
+
+def test_resume_in_the_other_mode_starts_over(tmp_path, monkeypatch):
+    words = [f"w{i}" for i in range(12)]
+    (tmp_path / "words.txt").write_text("\n".join(words) + "\n")
+    server = StandinServer(0, fetcher.MODEL_NAME, dim=8, latency_ms=0, per_item_ms=0, jitter_ms=0)
+    server.start_background()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(fetcher, "OLLAMA_API_URL", f"{base_url}/api/embeddings")
+    monkeypatch.setattr(fetcher, "OLLAMA_EMBED_URL", f"{base_url}/api/embed")
+    monkeypatch.setattr(fetcher, "WORDS_PATH", str(tmp_path / "words.txt"))
+    monkeypatch.setattr(fetcher, "OUTPUT_PATH", str(tmp_path / "embeddings"))
+    monkeypatch.setattr(fetcher, "CHECKPOINT_DIR", str(tmp_path / "checkpoint"))
+    # Leave the checkpoint behind as an interrupted run would
+    monkeypatch.setattr(EmbeddingCheckpoint, "remove", lambda self: None)
+    try:
+        fetcher.generate_embeddings(shard_size=5, use_cache=False) # /api/embeddings: raw vectors
+        assert len(EmbeddingCheckpoint(fetcher.CHECKPOINT_DIR, f"{fetcher.MODEL_NAME}/embeddings",
+                                       resume=True)) == len(words)
+        fetcher.generate_embeddings(batched=True, resume=True, use_cache=False)
+    finally:
+        server.shutdown()
+
+    # The raw-vector checkpoint was discarded, not mixed with /api/embed's unit vectors
+    assert server.counts["/api/embed"] > 0
+    store = EmbeddingStore.open(str(tmp_path / "embeddings"))
+    assert len(store) == len(words)
+    assert np.allclose(np.linalg.norm(store.vectors(), axis=1), 1.0, atol=1e-4)
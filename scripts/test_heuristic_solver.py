@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import heuristic_solver
+from test_word_graph import random_nodes, write_graph
+from word_graph import WordGraph
+
+# Checks that the solver works on the graph it is given rather than src/data/graph.json.
+# Run with: python -m pytest scripts/test_heuristic_solver.py
+
+SCRIPT = Path(__file__).resolve().parent / "heuristic_solver.py"
+
+
+def reachable_pair(nodes):
+    """A start/target pair 3+ steps apart in the graph, with its step count."""
+    graph = WordGraph.from_nodes(nodes)
+    start = graph.words[0]
+    for target in graph.words[1:]:
+        path = graph.shortest_path(start, target)
+        if len(path) >= 4:
+            return start, target, len(path) - 1
+    raise AssertionError("no pair 3+ steps apart")
+
+
+def test_solve_pair_uses_the_graph_flag(tmp_path):
+    nodes = random_nodes()
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    start, target, _ = reachable_pair(nodes)
+
+    completed = subprocess.run([sys.executable, str(SCRIPT), "--graph", str(graph_path), "--solve-pair", start, target],
+                               capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert result["status"] == "solved"
+    assert result["path"][0] == start and result["path"][-1] == target
+    assert all(word in nodes for word in result["path"])
+
+
+def test_solvers_load_the_given_graph(tmp_path, monkeypatch):
+    nodes = random_nodes()
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    start, target, steps = reachable_pair(nodes)
+    pair = {"startWord": start, "targetWord": target, "pathLength": steps}
+    (tmp_path / "pairs.json").write_text(json.dumps({"pairs": [pair]}))
+    challenges_path = tmp_path / "daily_challenges.json"
+    challenges_path.write_text(json.dumps({"challenges": [{"id": "c1", **pair}]}))
+    monkeypatch.setattr(heuristic_solver, "DAILY_CHALLENGES_PATH", challenges_path)
+
+    results = heuristic_solver.solve_playtest_pairs_heuristic(str(tmp_path / "pairs.json"), graph_path=graph_path)
+    results += heuristic_solver.solve_daily_challenges_heuristic(1, steps, graph_path=graph_path)
+    assert [result["status"] for result in results] == ["solved", "solved"]
+    assert all(word in nodes for result in results for word in result["llmPath"])
@@ -8,9 +8,10 @@ from openai import OpenAI
 from pathlib import Path
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Set, Tuple
-import heapq
 from dotenv import load_dotenv
 
+from word_graph import WordGraph, load_graph
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -152,77 +153,33 @@ def save_json_file(data: List[Dict], path: Path) -> None:
         json.dump(normalized_data, f, indent=2)
     print(f"Results saved to {path}")
 
-def get_word_neighbors(graph_nodes: Dict, current_word: str) -> List[str]:
+def get_word_neighbors(graph: WordGraph, current_word: str) -> List[str]:
     """Get the top k=6 nearest neighbors of the current word."""
-    if current_word not in graph_nodes:
-        return []
-    node_data = graph_nodes[current_word]
-    return [neighbor for neighbor in node_data.get("edges", {}) if neighbor in graph_nodes]
+    return graph.neighbors(current_word)
 
 def normalize_word(word: str) -> str:
     """Normalize a word to lowercase for comparison."""
     return word.lower()
 
-def find_shortest_path(graph: Dict, start: str, end: str) -> List[str]:
+def find_shortest_path(graph: WordGraph, start: str, end: str) -> List[str]:
     """Find shortest path between two words using Dijkstra's algorithm."""
     if start not in graph or end not in graph:
         print(f"find_shortest_path: Invalid graph data or start/end words (start={start}, end={end})")
         return []
     
-    # Initialize distances and previous nodes
-    distances = {word: float('infinity') for word in graph}
-    previous = {word: None for word in graph}
-    visited = set()
-    unvisited = set(graph.keys())
-    distances[start] = 0
-    
-    while unvisited:
-        # Find unvisited node with smallest distance
-        current = min(unvisited, key=lambda x: distances[x], default=None)
-        if current is None or distances[current] == float('infinity') or current == end:
-            break
-            
-        unvisited.remove(current)
-        visited.add(current)
-        
-        # Update distances for neighbors
-        edges = graph[current].get("edges", {})
-        for neighbor, similarity in edges.items():
-            if neighbor in visited:
-                continue
-                
-            cost = 1 - similarity
-            distance_through_current = distances[current] + cost
-            
-            if distance_through_current < distances[neighbor]:
-                distances[neighbor] = distance_through_current
-                previous[neighbor] = current
-    
-    # Reconstruct path if end is reachable
-    if distances[end] == float('infinity'):
+    path = graph.shortest_path(start, end)
+    if not path:
         print(f"No path found from {start} to {end}")
-        return []
-        
-    # Trace back from end to start
-    path = []
-    current = end
-    while current is not None:
-        path.insert(0, current)
-        current = previous[current]
-        if current == start:
-            path.insert(0, start)
-            break
-    
     return path
 
-def format_game_state_enhanced(state: GameState, graph_nodes: Dict, invalid_move_msg: Optional[str] = None) -> str:
+def format_game_state_enhanced(state: GameState, graph: WordGraph, invalid_move_msg: Optional[str] = None) -> str:
     """Format the current game state with enhanced context including distances and optimal move tagging."""
     state_str = ""
     if invalid_move_msg:
         state_str += f"Previous move was invalid: {invalid_move_msg}\n\n"
     
     # Calculate current distance to target
-    current_path = find_shortest_path(graph_nodes, state.current_word, state.target_word)
+    current_path = find_shortest_path(graph, state.current_word, state.target_word)
     current_distance = len(current_path) - 1 if current_path else "∞"
     
     # Show progress information
@@ -341,7 +298,7 @@ def get_client() -> OpenAI:
     """Initialize the Ollama client."""
     return OpenAI(base_url=OLLAMA_BASE_URL, api_key=OLLAMA_API_KEY)
 
-def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, system_prompt: str, model: str) -> Dict:
+def solve_puzzle(pair: Dict, variant: str, graph: WordGraph, client: OpenAI, system_prompt: str, model: str) -> Dict:
     """Solve a single puzzle with the given variant."""
     pair_id = f"{pair['startWord']}_{pair['targetWord']}"
     start_word = pair["startWord"]
@@ -351,7 +308,7 @@ def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, sy
     print(f"--- Solving {pair_id} with {variant} (Optimal: {optimal_path_length} steps) ---")
     
     # Find optimal path for reference
-    optimal_path = find_shortest_path(graph_nodes, start_word, end_word)
+    optimal_path = find_shortest_path(graph, start_word, end_word)
     if not optimal_path:
         return {
             "id": pair_id,
@@ -372,12 +329,12 @@ def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, sy
         }
     
     # Initialize game state
-    initial_distance = len(find_shortest_path(graph_nodes, start_word, end_word)) - 1
+    initial_distance = len(find_shortest_path(graph, start_word, end_word)) - 1
     current_state = GameState(
         current_word=start_word,
         target_word=end_word,
         path_so_far=[start_word],
-        neighbors=get_word_neighbors(graph_nodes, start_word),
+        neighbors=get_word_neighbors(graph, start_word),
         steps_taken=0,
         optimal_path=optimal_path,
         suggested_path=optimal_path,  # Start with optimal path as suggested
@@ -395,7 +352,7 @@ def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, sy
     
     while not solved and not failed:
         # Format state with enhanced context
-        state_prompt = format_game_state_enhanced(current_state, graph_nodes, invalid_move_msg)
+        state_prompt = format_game_state_enhanced(current_state, graph, invalid_move_msg)
         
         retry_count = 0
         next_word = None
@@ -501,13 +458,13 @@ def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, sy
                         current_state.current_word = actual_word
                         current_state.steps_taken += 1
                         # Calculate new distance to target
-                        new_distance = len(find_shortest_path(graph_nodes, actual_word, current_state.target_word)) - 1
+                        new_distance = len(find_shortest_path(graph, actual_word, current_state.target_word)) - 1
                         current_state.previous_distances.append(new_distance)
-                        current_state.neighbors = get_word_neighbors(graph_nodes, actual_word)
+                        current_state.neighbors = get_word_neighbors(graph, actual_word)
                         current_state.rationales.append(rationale)
                         # Update suggested path and log the change
                         old_suggested_path = current_state.suggested_path
-                        current_state.suggested_path = find_shortest_path(graph_nodes, actual_word, end_word)
+                        current_state.suggested_path = find_shortest_path(graph, actual_word, end_word)
                         
                         # Log suggested path update
                         if current_state.suggested_path != old_suggested_path:
@@ -547,7 +504,7 @@ def solve_puzzle(pair: Dict, variant: str, graph_nodes: Dict, client: OpenAI, sy
                 # Choose the most recent available checkpoint
                 best_checkpoint = max(available_backtracks, key=lambda x: x["index"])
                 print(f"  BACKTRACKING: No valid moves found, using checkpoint {best_checkpoint['word']} [{best_checkpoint['type']}]")
-                backtrack_message = backtrack_to_checkpoint(current_state, best_checkpoint, graph_nodes, end_word)
+                backtrack_message = backtrack_to_checkpoint(current_state, best_checkpoint, graph, end_word)
                 invalid_move_msg = backtrack_message
                 # Reset retry count and continue from backtrack position
                 retry_count = 0
@@ -619,7 +576,7 @@ def update_checkpoints(state: GameState, old_suggested_path: List[str]) -> None:
     else:
         print(f"    No checkpoint: {current_word} was not on optimal paths (G: {current_word in state.optimal_path}, L: {current_word in old_suggested_path if old_suggested_path else False})")
 
-def backtrack_to_checkpoint(state: GameState, checkpoint: Dict, graph_nodes: Dict, end_word: str) -> str:
+def backtrack_to_checkpoint(state: GameState, checkpoint: Dict, graph: WordGraph, end_word: str) -> str:
     """Backtrack to a specific checkpoint, resetting game state. Returns message about failed path."""
     target_index = checkpoint["index"]
     target_word = checkpoint["word"]
@@ -650,8 +607,8 @@ def backtrack_to_checkpoint(state: GameState, checkpoint: Dict, graph_nodes: Dic
     state.path_so_far = state.path_so_far[:target_index + 1]
     state.current_word = target_word
     state.steps_taken = target_index
-    state.neighbors = get_word_neighbors(graph_nodes, target_word)
-    state.suggested_path = find_shortest_path(graph_nodes, target_word, end_word)
+    state.neighbors = get_word_neighbors(graph, target_word)
+    state.suggested_path = find_shortest_path(graph, target_word, end_word)
     
     # Truncate other tracking arrays
     state.previous_distances = state.previous_distances[:target_index + 1]
@@ -706,8 +663,7 @@ def main():
     print("Loading game data...")
     playtest_data = load_json_file(PLAYTEST_PAIRS_PATH)
     pairs = playtest_data["pairs"]
-    graph_data = load_json_file(GRAPH_PATH)
-    graph_nodes = graph_data["nodes"]
+    graph = load_graph(GRAPH_PATH)
     
     print(f"Loaded {len(pairs)} playtest pairs")
     
@@ -767,7 +723,7 @@ Let's think step by step and explain your reasoning clearly."""
                 continue
             
             # Solve the puzzle
-            result = solve_puzzle(pair, variant, graph_nodes, client, system_prompt, args.model)
+            result = solve_puzzle(pair, variant, graph, client, system_prompt, args.model)
             all_results.append(result)
             
             # Update progress
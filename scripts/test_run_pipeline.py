@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+from run_pipeline import PROJECT_ROOT, Stage, pipeline_stages, run_pipeline, validate_stages
+
+# Checks the pipeline's stage wiring and that unchanged stages are skipped.
+# Run with: python -m pytest scripts/test_run_pipeline.py
+
+
+def copy_stage(name, source, target, deps=None):
+    """A stage that copies one file to another."""
+    command = [sys.executable, "-c", f"import shutil; shutil.copy({source!r}, {target!r})"]
+    return Stage(name, command, [source], [target], deps)
+
+
+def run(stages, root, **kwargs):
+    results = run_pipeline(stages, root=root, state_path=root / "state.json", log_dir=root / "logs", **kwargs)
+    return {row["stage"]: row["status"] for row in results}
+
+
+def test_pipeline_inputs_come_from_upstream_stages():
+    stages = pipeline_stages(5, 42, wordnet_version="3.0")
+    validate_stages(stages)
+    produced = {output for stage in stages for output in stage.outputs}
+    for stage in stages:
+        for relative in stage.inputs:
+            assert relative in produced or relative.startswith("scripts/") or \
+                relative == os.path.join("database", "raw_data", "words.txt"), (stage.name, relative)
+            assert os.path.exists(PROJECT_ROOT / relative) or relative in produced, (stage.name, relative)
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    (tmp_path / "a.txt").write_text("one")
+    stages = [copy_stage("first", "a.txt", "b.txt"), copy_stage("second", "b.txt", "c.txt", ["first"])]
+    assert run(stages, tmp_path) == {"first": "ran", "second": "ran"}
+    assert run(stages, tmp_path) == {"first": "skipped", "second": "skipped"}
+
+    (tmp_path / "a.txt").write_text("two")
+    assert run(stages, tmp_path, dry_run=True) == {"first": "stale", "second": "stale"}
+    assert run(stages, tmp_path) == {"first": "ran", "second": "ran"}
+    assert (tmp_path / "c.txt").read_text() == "two"
+
+    (tmp_path / "c.txt").unlink()
+    assert run(stages, tmp_path) == {"first": "skipped", "second": "ran"}
+
+
+def test_failed_stage_blocks_dependents(tmp_path):
+    stages = [copy_stage("first", "missing.txt", "b.txt"), copy_stage("second", "b.txt", "c.txt", ["first"])]
+    assert run(stages, tmp_path) == {"first": "failed", "second": "blocked"}
+
+
+def test_unknown_dependency_is_rejected(tmp_path):
+    stages = [copy_stage("second", "b.txt", "c.txt", ["first"])]
+    with pytest.raises(ValueError):
+        run(stages, tmp_path)
+
+
+def test_input_from_a_stage_that_is_not_upstream_is_rejected():
+    stages = [copy_stage("first", "a.txt", "b.txt"), copy_stage("second", "b.txt", "c.txt")]
+    with pytest.raises(ValueError):
+        validate_stages(stages)
+
+
+def test_graph_stage_reads_only_its_definition_cache_file():
+    stages = {stage.name: stage for stage in pipeline_stages(5, 42, wordnet_version="3.0")}
+    cache_inputs = [relative for relative in stages["graph"].inputs if relative.startswith(os.path.join("data", "definition_cache"))]
+    # generate_definitions.py writes a ..._lenany.json file alongside it
+    assert cache_inputs == stages["definitions"].outputs
+    assert cache_inputs[0].endswith("wordnet-3.0_defs3_len90.json")
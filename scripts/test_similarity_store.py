@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from nearest_neighbors import normalize_embeddings
+from similarity_store import SimilarityStore, write_similarity_store
+
+# Checks the quantized similarity store against the float cosine similarities
+# and incremental updates against a full rebuild.
+# Run with: python -m pytest scripts/test_similarity_store.py
+
+QUANTUM = {"uint16": 1.0 / 32767.5, "int8": 1.0 / 127.0}
+
+
+def random_normalized(num_words, dim=16, seed=0):
+    return normalize_embeddings(np.random.default_rng(seed).standard_normal((num_words, dim)))
+
+
+def words_for(num_words, prefix="w"):
+    return [f"{prefix}{i:03d}" for i in range(num_words)]
+
+
+@pytest.mark.parametrize("dtype", ["uint16", "int8"])
+@pytest.mark.parametrize("block_mb", [256, 0.001])
+def test_round_trip(tmp_path, dtype, block_mb):
+    normalized = random_normalized(50)
+    words = words_for(50)
+    size = write_similarity_store(str(tmp_path), words, normalized, dtype, block_mb)
+
+    store = SimilarityStore(str(tmp_path))
+    assert store.words == words and store.dtype == dtype
+    assert size > store.values.nbytes
+    assert len(store.values) == 50 * 51 // 2
+    expected = normalized @ normalized.T
+    for word in words:
+        row = store.row(word)
+        assert np.abs(row - expected[store.word_ids[word]]).max() <= QUANTUM[dtype] / 2 + 1e-6
+    assert store.similarity("w003", "w017") == store.similarity("w017", "w003")
+
+
+@pytest.mark.parametrize("dtype", ["uint16", "int8"])
+def test_incremental_update_matches_rebuild(tmp_path, dtype):
+    normalized = random_normalized(60)
+    old_words = words_for(60)
+    write_similarity_store(str(tmp_path / "store"), old_words, normalized, dtype)
+
+    # Drop some words, re-embed one, add new ones and reorder the rest
+    rng = np.random.default_rng(1)
+    kept = rng.permutation(np.arange(5, 60))
+    new_vectors = random_normalized(8, seed=2)
+    words = [old_words[i] for i in kept] + words_for(8, prefix="new")
+    vectors = np.vstack([normalized[kept], new_vectors])
+    vectors[3] = new_vectors[0]  # re-embedded
+    previous_ids = np.concatenate([kept, np.full(8, -1)])
+    previous_ids[3] = -1
+
+    write_similarity_store(str(tmp_path / "store"), words, vectors, dtype, block_mb=0.001,
+                           previous_ids=previous_ids)
+    write_similarity_store(str(tmp_path / "full"), words, vectors, dtype)
+    updated = SimilarityStore(str(tmp_path / "store"))
+    full = SimilarityStore(str(tmp_path / "full"))
+    assert updated.words == words
+    difference = np.abs(updated.values.astype(np.int32) - full.values.astype(np.int32))
+    # Copied pairs may land one quantum apart (see _update_triangle)
+    assert difference.max() <= 1
+    for word in words:
+        assert np.abs(updated.row(word) - (vectors @ vectors[updated.word_ids[word]])).max() \
+            <= QUANTUM[dtype] / 2 + 1e-6
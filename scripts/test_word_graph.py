@@ -0,0 +1,281 @@
+import heapq
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+
+from landmarks import LandmarkIndex
+from path_atlas import build_atlas, open_atlas
+from word_graph import WordGraph, cache_dir_for, load_graph
+
+# Checks the compiled WordGraph against the dict-based Dijkstra it replaced, the
+# sidecar cache invalidation, the path atlas and ALT search.
+# Run with: python -m pytest scripts/test_word_graph.py
+
+# Similarities that are exact in float32, so 1 - similarity costs match the
+# dict-based search bit for bit and equal-cost routes really tie
+TIED_SIMILARITIES = (0.5, 0.625, 0.75, 0.875)
+
+
+def reference_shortest_path(nodes, start, end):
+    """The dict-based Dijkstra heuristic_solver.py used before WordGraph."""
+    if start not in nodes or end not in nodes:
+        return []
+    if start == end:
+        return [start]
+
+    distances = {word: float('infinity') for word in nodes}
+    previous = {word: None for word in nodes}
+    distances[start] = 0
+    pq = [(0, start)]
+    visited = set()
+    while pq:
+        current_dist, current = heapq.heappop(pq)
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == end:
+            break
+        for neighbor, similarity in nodes[current].get("edges", {}).items():
+            if neighbor in visited:
+                continue
+            distance = current_dist + (1 - similarity)
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current
+                heapq.heappush(pq, (distance, neighbor))
+
+    if distances[end] == float('infinity'):
+        return []
+    path = []
+    current = end
+    while current is not None:
+        path.insert(0, current)
+        current = previous[current]
+    return path
+
+
+def random_nodes(num_words=60, degree=4, seed=0):
+    """
+    graph.json nodes of a random directed k-NN-like graph with many tied routes.
+
+    Words are in sorted order so graph.json order (WordGraph's tie-break) and word
+    order (the dict-based search's tie-break) agree.
+    """
+    rng = random.Random(seed)
+    words = [f"w{i:03d}" for i in range(num_words)]
+    nodes = {}
+    for word in words:
+        neighbors = rng.sample([other for other in words if other != word], degree)
+        nodes[word] = {
+            "edges": {neighbor: rng.choice(TIED_SIMILARITIES) for neighbor in neighbors},
+            "tsne": [rng.random(), rng.random()],
+        }
+    return nodes
+
+
+def path_cost(nodes, path):
+    return sum(1 - nodes[a]["edges"][b] for a, b in zip(path, path[1:]))
+
+
+def write_graph(path, nodes):
+    with open(path, 'w') as f:
+        json.dump({"nodes": nodes}, f)
+
+
+@pytest.fixture
+def nodes():
+    return random_nodes()
+
+
+@pytest.fixture
+def graph(nodes):
+    return WordGraph.from_nodes(nodes)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts graph.json parses, i.e. loads not answered by the sidecar cache."""
+    calls = []
+    from_nodes = WordGraph.from_nodes.__func__
+
+    def counting_from_nodes(cls, nodes):
+        calls.append(1)
+        return from_nodes(cls, nodes)
+
+    monkeypatch.setattr(WordGraph, "from_nodes", classmethod(counting_from_nodes))
+    return calls
+
+
+def all_pairs(nodes):
+    words = list(nodes)
+    return [(start, end) for start in words for end in words]
+
+
+# --- Dijkstra ---
+
+def test_diamond_tie_keeps_first_predecessor():
+    # a -> b -> d and a -> c -> d cost the same; b settles first and keeps d
+    nodes = {
+        "a": {"edges": {"c": 0.5, "b": 0.5}},
+        "b": {"edges": {"d": 0.5}},
+        "c": {"edges": {"d": 0.5}},
+        "d": {"edges": {}},
+    }
+    graph = WordGraph.from_nodes(nodes)
+    assert graph.shortest_path("a", "d") == ["a", "b", "d"]
+    assert reference_shortest_path(nodes, "a", "d") == ["a", "b", "d"]
+
+
+def test_paths_match_dict_dijkstra(nodes, graph):
+    for start, end in all_pairs(nodes):
+        assert graph.shortest_path(start, end) == reference_shortest_path(nodes, start, end), (start, end)
+
+
+def test_unknown_and_unreachable_words():
+    nodes = {"a": {"edges": {"b": 0.5}}, "b": {"edges": {}}, "c": {"edges": {"a": 0.5}}}
+    graph = WordGraph.from_nodes(nodes)
+    assert graph.shortest_path("a", "missing") == []
+    assert graph.shortest_path("a", "c") == []
+    assert graph.shortest_path("b", "b") == ["b"]
+    assert graph.path_length("c", "b") == 2
+
+
+def test_bidirectional_matches_cost(nodes, graph):
+    for start, end in all_pairs(nodes):
+        one_sided = graph.shortest_path(start, end)
+        both_sides = graph.shortest_path(start, end, bidirectional=True)
+        assert bool(one_sided) == bool(both_sides), (start, end)
+        if one_sided:
+            assert both_sides[0] == start and both_sides[-1] == end
+            assert path_cost(nodes, both_sides) == pytest.approx(path_cost(nodes, one_sided), abs=1e-9)
+
+
+def test_shortest_path_tree_matches_paths(graph):
+    for source in range(len(graph)):
+        _, predecessors, hops = graph.shortest_path_tree(source)
+        for target in range(len(graph)):
+            path = graph.shortest_path_ids(source, target)
+            assert hops[target] == (len(path) - 1 if path else -1)
+            if len(path) > 1:
+                assert predecessors[target] == path[-2]
+
+
+# --- Sidecar cache ---
+
+def test_cache_reused_when_unchanged(tmp_path, nodes, parses):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    graph = load_graph(graph_path, use_atlas=False)
+    assert os.path.exists(os.path.join(cache_dir_for(graph_path), "manifest.json"))
+
+    cached = load_graph(graph_path, use_atlas=False)
+    assert len(parses) == 1
+    assert cached.words == graph.words
+    assert np.array_equal(cached.indptr, graph.indptr)
+    assert np.array_equal(cached.indices, graph.indices)
+    assert np.array_equal(cached.weights, graph.weights)
+
+
+def test_cache_survives_touch(tmp_path, nodes, parses):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    load_graph(graph_path, use_atlas=False)
+
+    # New mtime, same bytes: the hash still matches and the stamp is refreshed
+    stat = os.stat(graph_path)
+    os.utime(graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_graph(graph_path, use_atlas=False)
+    assert len(parses) == 1
+    with open(os.path.join(cache_dir_for(graph_path), "manifest.json")) as f:
+        assert json.load(f)["mtime_ns"] == os.stat(graph_path).st_mtime_ns
+
+
+def test_cache_rebuilt_on_content_change(tmp_path, nodes, parses):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    load_graph(graph_path, use_atlas=False)
+
+    # Same size and mtime would skip hashing, so change the size as an edit would
+    nodes["w000"]["edges"] = {"w001": 0.75}
+    write_graph(graph_path, nodes)
+    assert load_graph(graph_path, use_atlas=False).edges("w000") == {"w001": 0.75}
+    assert len(parses) == 2
+    # The rewritten cache serves the new content
+    assert load_graph(graph_path, use_atlas=False).edges("w000") == {"w001": 0.75}
+    assert len(parses) == 2
+
+
+def test_cache_rebuilt_on_hash_change_with_same_size(tmp_path, parses):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, {"a": {"edges": {"b": 0.5}}, "b": {"edges": {}}})
+    load_graph(graph_path, use_atlas=False)
+
+    # Same length, different bytes, new mtime: only the SHA-256 tells them apart
+    stat = os.stat(graph_path)
+    write_graph(graph_path, {"a": {"edges": {"b": 0.7}}, "b": {"edges": {}}})
+    os.utime(graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert os.path.getsize(graph_path) == stat.st_size
+    assert load_graph(graph_path, use_atlas=False).similarity("a", "b") == pytest.approx(0.7)
+    assert len(parses) == 2
+
+
+# --- Path atlas ---
+
+def test_atlas_paths_match_dijkstra(tmp_path, nodes, graph):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    build_atlas(graph_path, workers=1)
+
+    with_atlas = load_graph(graph_path)
+    assert with_atlas.atlas is not None
+    for start in range(len(graph)):
+        for end in range(len(graph)):
+            path = graph.shortest_path_ids(start, end)
+            assert with_atlas.shortest_path_ids(start, end) == path, (start, end)
+            assert with_atlas.atlas.distance_ids(start, end) == (len(path) - 1 if path else None)
+
+
+def test_stale_atlas_is_ignored(tmp_path, nodes):
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path, nodes)
+    build_atlas(graph_path, workers=1)
+
+    nodes["w000"]["edges"] = {"w001": 0.75}
+    write_graph(graph_path, nodes)
+    graph = load_graph(graph_path, use_atlas=False)
+    assert open_atlas(graph_path, graph) is None
+
+
+# --- ALT ---
+
+@pytest.mark.parametrize("strategy", ["farthest", "degree"])
+@pytest.mark.parametrize("num_landmarks", [1, 4])
+def test_alt_paths_match_dijkstra(graph, strategy, num_landmarks):
+    index = LandmarkIndex(graph, num_landmarks, strategy)
+    for start in range(len(graph)):
+        for end in range(len(graph)):
+            assert index.path_ids(start, end) == graph.shortest_path_ids(start, end), (start, end)
+
+
+def test_alt_paths_match_dijkstra_on_a_grid():
+    # Every monotone route across a grid costs the same, so only the tie-break decides
+    size = 6
+    nodes = {}
+    for row in range(size):
+        for col in range(size):
+            edges = {}
+            if row + 1 < size:
+                edges[f"r{row + 1}c{col}"] = 0.5
+            if col + 1 < size:
+                edges[f"r{row}c{col + 1}"] = 0.5
+            if row > 0:
+                edges[f"r{row - 1}c{col}"] = 0.5
+            nodes[f"r{row}c{col}"] = {"edges": edges}
+    graph = WordGraph.from_nodes(nodes)
+    index = LandmarkIndex(graph, 4)
+    for start in range(len(graph)):
+        for end in range(len(graph)):
+            assert index.path_ids(start, end) == graph.shortest_path_ids(start, end), (start, end)
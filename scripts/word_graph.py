@@ -0,0 +1,657 @@
+import hashlib
+import heapq
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+except ImportError:  # SciPy is optional; multi_source_hops falls back to per-source trees
+    csr_matrix = None
+    csgraph_dijkstra = None
+
+# graph.json stores the semantic graph as
+#   {"nodes": {word: {"edges": {neighbor: similarity, ...}, "tsne": [x, y]}}}
+# WordGraph compiles that into an interned vocabulary (word <-> integer id) and
+# CSR adjacency arrays, so the Python tools walk integer ids instead of hashing
+# word strings on every edge relaxation.
+#
+# Compiled arrays are cached in a sidecar directory next to the JSON
+# (graph.json -> graph.json.wgcache/) as plain .npy files plus a vocabulary
+# table, and opened with mmap. The manifest records the source size, mtime and
+# SHA-256, so an edited graph.json is recompiled transparently on next load.
+#
+# The compact export (build_graph.py --compact) is a minified alternative to
+# graph.json that stores the same graph by integer id:
+#   {"format": "wordgraph-compact", "version": 1, "weightScale": S,
+#    "words": [...], "degrees": [...], "neighbors": [...], "weights": [...],
+#    "tsne": [x0, y0, x1, y1, ...]}
+# neighbors/weights are the CSR arrays flattened (weights as round(sim * S)),
+# and tsne uses null for missing coordinates. from_json reads either format.
+
+CACHE_SUFFIX = ".wgcache"
+CACHE_FORMAT_VERSION = 1
+CACHE_ARRAYS = ("indptr", "indices", "weights", "tsne")
+
+COMPACT_FORMAT = "wordgraph-compact"
+COMPACT_FORMAT_VERSION = 1
+COMPACT_WEIGHT_SCALE = 100000  # Similarities kept to 5 decimal places
+COMPACT_TSNE_DECIMALS = 3
+
+
+class WordGraph:
+    """Integer-indexed, CSR-backed view of the word graph."""
+
+    def __init__(self, words: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 weights: np.ndarray, tsne: Optional[np.ndarray] = None):
+        """
+        Args:
+            words: Vocabulary, position i is the word with id i.
+            indptr: int64 array of length N + 1; edges of node i live in
+                indices[indptr[i]:indptr[i + 1]].
+            indices: int32 neighbor ids, in the edge order of graph.json.
+            weights: float32 cosine similarities, parallel to indices.
+            tsne: Optional float32 (N, 2) array of t-SNE coordinates, NaN where missing.
+        """
+        self.words = list(words)
+        self.word_ids = {word: i for i, word in enumerate(self.words)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.tsne = tsne
+        self.degrees = np.diff(self.indptr).astype(np.int32)
+        self._costs = None
+        self._reverse_adjacency = None
+        self._costs_csr = None
+        # Optional path_atlas.PathAtlas answering shortest_path from precomputed tables
+        self.atlas = None
+
+    # --- Construction ---
+
+    @classmethod
+    def from_nodes(cls, nodes: Dict) -> "WordGraph":
+        """Compile the "nodes" mapping of graph.json. Edges to unknown words are dropped."""
+        words = list(nodes.keys())
+        word_ids = {word: i for i, word in enumerate(words)}
+
+        indptr = np.zeros(len(words) + 1, dtype=np.int64)
+        indices = []
+        weights = []
+        tsne = np.full((len(words), 2), np.nan, dtype=np.float32)
+
+        for i, word in enumerate(words):
+            node_data = nodes[word] or {}
+            for neighbor, similarity in node_data.get("edges", {}).items():
+                neighbor_id = word_ids.get(neighbor)
+                if neighbor_id is None:
+                    continue
+                indices.append(neighbor_id)
+                weights.append(similarity)
+            indptr[i + 1] = len(indices)
+
+            coords = node_data.get("tsne")
+            if coords and len(coords) == 2:
+                tsne[i] = coords
+
+        return cls(
+            words,
+            indptr,
+            np.array(indices, dtype=np.int32),
+            np.array(weights, dtype=np.float32),
+            tsne,
+        )
+
+    @classmethod
+    def from_compact(cls, data: Dict) -> "WordGraph":
+        """Build a graph from the parsed compact export (see to_compact)."""
+        if data.get("format") != COMPACT_FORMAT or data.get("version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact graph format {data.get('format')!r} "
+                             f"version {data.get('version')!r}")
+        words = data["words"]
+        indptr = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum(data["degrees"], out=indptr[1:])
+        weights = np.array(data["weights"], dtype=np.float64) / data["weightScale"]
+        tsne = np.array([np.nan if v is None else v for v in data["tsne"]], dtype=np.float32).reshape(-1, 2)
+        return cls(words, indptr, np.array(data["neighbors"], dtype=np.int32),
+                   weights.astype(np.float32), tsne)
+
+    def to_compact(self, weight_scale: int = COMPACT_WEIGHT_SCALE) -> Dict:
+        """The graph in the compact export format, ready for json.dump."""
+        tsne = self.tsne if self.tsne is not None else np.full((len(self), 2), np.nan, dtype=np.float32)
+        return {
+            "format": COMPACT_FORMAT,
+            "version": COMPACT_FORMAT_VERSION,
+            "weightScale": weight_scale,
+            "words": self.words,
+            "degrees": self.degrees.tolist(),
+            "neighbors": self.indices.tolist(),
+            "weights": np.rint(self.weights.astype(np.float64) * weight_scale).astype(np.int64).tolist(),
+            "tsne": [None if np.isnan(v) else round(float(v), COMPACT_TSNE_DECIMALS) for v in tsne.ravel()],
+        }
+
+    @classmethod
+    def from_json(cls, path, use_cache: bool = True) -> "WordGraph":
+        """
+        Load and compile a graph.json file (with or without the "nodes" wrapper),
+        or a compact export.
+
+        Args:
+            path: Path to graph.json.
+            use_cache: Open the memory-mapped sidecar cache when it is fresh, and
+                (re)write it when it is missing or stale.
+        """
+        path = os.fspath(path)
+        if not os.path.exists(path):
+            print(f"Error: Graph file not found at {path}")
+            print("Please ensure build_graph.py has been run and the path is correct.")
+            sys.exit(1)
+
+        if use_cache:
+            graph = _load_cache(path)
+            if graph is not None:
+                return graph
+
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get("format") == COMPACT_FORMAT:
+            graph = cls.from_compact(data)
+        else:
+            graph = cls.from_nodes(data.get("nodes", data))
+
+        if use_cache:
+            _write_cache(path, graph)
+        return graph
+
+    # --- Vocabulary ---
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word) -> bool:
+        return word in self.word_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __getstate__(self):
+        # The cost arrays are a cache; rebuild them after unpickling
+        state = self.__dict__.copy()
+        state["_costs"] = None
+        state["_reverse_adjacency"] = None
+        state["_costs_csr"] = None
+        return state
+
+    # --- Adjacency ---
+
+    def neighbor_ids(self, node_id: int) -> np.ndarray:
+        """Neighbor ids of node_id, in graph.json edge order."""
+        return self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def neighbor_weights(self, node_id: int) -> np.ndarray:
+        """Similarities parallel to neighbor_ids(node_id)."""
+        return self.weights[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def neighbors(self, word: str) -> List[str]:
+        """Neighbors of a word, in graph.json edge order. Unknown words have none."""
+        node_id = self.word_ids.get(word)
+        if node_id is None:
+            return []
+        return [self.words[i] for i in self.neighbor_ids(node_id)]
+
+    def edges(self, word: str) -> Dict[str, float]:
+        """Neighbor -> similarity mapping for a word, like graph.json's "edges"."""
+        node_id = self.word_ids.get(word)
+        if node_id is None:
+            return {}
+        return {
+            self.words[i]: float(w)
+            for i, w in zip(self.neighbor_ids(node_id), self.neighbor_weights(node_id))
+        }
+
+    def similarity(self, word: str, neighbor: str) -> Optional[float]:
+        """Edge similarity from word to neighbor, or None if there is no such edge."""
+        node_id = self.word_ids.get(word)
+        neighbor_id = self.word_ids.get(neighbor)
+        if node_id is None or neighbor_id is None:
+            return None
+        hits = np.nonzero(self.neighbor_ids(node_id) == neighbor_id)[0]
+        if len(hits) == 0:
+            return None
+        return float(self.neighbor_weights(node_id)[hits[0]])
+
+    def degree(self, word: str) -> int:
+        """Out-degree of a word (0 for unknown words)."""
+        node_id = self.word_ids.get(word)
+        return int(self.degrees[node_id]) if node_id is not None else 0
+
+    def tsne_of(self, word: str) -> Optional[Tuple[float, float]]:
+        """t-SNE coordinates of a word, or None if unknown or missing."""
+        node_id = self.word_ids.get(word)
+        if node_id is None or self.tsne is None:
+            return None
+        x, y = self.tsne[node_id]
+        if np.isnan(x) or np.isnan(y):
+            return None
+        return float(x), float(y)
+
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        CSR (indptr, neighbor ids, edge costs) arrays for the search loops.
+
+        Cost is 1 - similarity, computed in float64 exactly as the original dict-based
+        searches did. The search kernels copy out one node's slice at a time
+        (indices[indptr[i]:indptr[i + 1]].tolist()) instead of flattening the whole
+        graph into Python lists, so workers forked from a process that already built
+        these arrays only read the shared, memory-mapped pages.
+        """
+        if self._costs is None:
+            self._costs = 1.0 - self.weights.astype(np.float64)
+        return self.indptr, self.indices, self._costs
+
+    def reverse_adjacency(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR arrays of the transposed graph: for each node, the nodes with an edge into it."""
+        if self._reverse_adjacency is None:
+            num_nodes = len(self.words)
+            sources = np.repeat(np.arange(num_nodes, dtype=np.int32), self.degrees)
+            order = np.argsort(self.indices, kind='stable')
+            in_degrees = np.bincount(self.indices, minlength=num_nodes)
+            rev_indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+            np.cumsum(in_degrees, out=rev_indptr[1:])
+            rev_costs = (1.0 - self.weights.astype(np.float64))[order]
+            self._reverse_adjacency = (rev_indptr, sources[order], rev_costs)
+        return self._reverse_adjacency
+
+    # --- Shortest paths ---
+
+    def shortest_path_ids(self, start: int, end: int, bidirectional: bool = False,
+                          stats: Optional[Dict] = None) -> List[int]:
+        """
+        Dijkstra shortest path between two node ids, using 1 - similarity as edge cost.
+
+        Only the search frontier is stored and the search stops as soon as end is
+        settled. Equal-distance nodes settle in id (graph.json) order and a node keeps
+        the first predecessor that reached it at its final distance, so the returned
+        path is deterministic across runs. With an attached atlas the same path is
+        read from its predecessor table instead.
+
+        Args:
+            start: Start node id.
+            end: End node id.
+            bidirectional: Search from both ends and stop when the frontiers meet. Same
+                path cost, fewer settled nodes; on exactly tied paths it may return a
+                different (equally short) path than the one-sided search.
+            stats: Optional dict that receives the number of settled nodes ("settled").
+        """
+        if start == end:
+            return [start]
+        if self.atlas is not None:
+            return self.atlas.path_ids(start, end)
+        if bidirectional:
+            return self._bidirectional_path_ids(start, end, stats)
+
+        indptr, indices, costs = self.adjacency()
+        distances = {start: 0.0}
+        previous = {start: -1}
+        settled = set()
+
+        # Priority queue: (distance, node id)
+        pq = [(0.0, start)]
+        while pq:
+            current_dist, current = heapq.heappop(pq)
+            if current in settled:
+                continue
+            settled.add(current)
+
+            if current == end:
+                break
+
+            first, last = indptr[current], indptr[current + 1]
+            for neighbor, cost in zip(indices[first:last].tolist(), costs[first:last].tolist()):
+                if neighbor in settled:
+                    continue
+                distance = current_dist + cost
+                if distance < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (distance, neighbor))
+
+        if stats is not None:
+            stats["settled"] = len(settled)
+        if end not in settled:
+            return []
+        return _trace_back(previous, end)[::-1]
+
+    def _bidirectional_path_ids(self, start: int, end: int, stats: Optional[Dict] = None) -> List[int]:
+        """Bidirectional Dijkstra: forward from start, backward from end over reversed edges."""
+        adjacency = (self.adjacency(), self.reverse_adjacency())
+        distances = ({start: 0.0}, {end: 0.0})
+        previous = ({start: -1}, {end: -1})
+        settled = (set(), set())
+        pqs = ([(0.0, start)], [(0.0, end)])
+
+        best = float('infinity')
+        meeting = -1
+        # Once either side runs dry every edge of its reachable set has been relaxed,
+        # so the best meeting point seen so far is final.
+        while pqs[0] and pqs[1]:
+            if pqs[0][0][0] + pqs[1][0][0] >= best:
+                break
+            side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+            current_dist, current = heapq.heappop(pqs[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+
+            indptr, indices, costs = adjacency[side]
+            dist_side, dist_other = distances[side], distances[1 - side]
+            first, last = indptr[current], indptr[current + 1]
+            for neighbor, cost in zip(indices[first:last].tolist(), costs[first:last].tolist()):
+                if neighbor in settled[side]:
+                    continue
+                distance = current_dist + cost
+                if distance < dist_side.get(neighbor, float('infinity')):
+                    dist_side[neighbor] = distance
+                    previous[side][neighbor] = current
+                    heapq.heappush(pqs[side], (distance, neighbor))
+                if neighbor in dist_other and dist_side[neighbor] + dist_other[neighbor] < best:
+                    best = dist_side[neighbor] + dist_other[neighbor]
+                    meeting = neighbor
+
+        if stats is not None:
+            stats["settled"] = len(settled[0]) + len(settled[1])
+        if meeting == -1:
+            return []
+        forward = _trace_back(previous[0], meeting)[::-1]
+        backward = _trace_back(previous[1], meeting)
+        return forward + backward[1:]
+
+    def shortest_path(self, start: str, end: str, bidirectional: bool = False) -> List[str]:
+        """Shortest path between two words, or [] if either is unknown or unreachable."""
+        start_id = self.word_ids.get(start)
+        end_id = self.word_ids.get(end)
+        if start_id is None or end_id is None:
+            return []
+        return [self.words[i] for i in self.shortest_path_ids(start_id, end_id, bidirectional)]
+
+    def path_length(self, start: str, end: str) -> Optional[int]:
+        """Number of steps on the shortest path, or None if there is none."""
+        path = self.shortest_path(start, end)
+        return len(path) - 1 if path else None
+
+    def distance_field(self, target: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distances from every node to target, from one Dijkstra over the reversed edges.
+
+        Returns:
+            (costs, hops): float64 cost-to-target (inf where target is unreachable) and
+            int32 number of steps on that shortest path (-1 where unreachable).
+        """
+        distances, _, hops = _dijkstra_tree(self.reverse_adjacency(), len(self.words), target)
+        return np.array(distances, dtype=np.float64), np.array(hops, dtype=np.int32)
+
+    def shortest_path_tree(self, source: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Full single-source shortest-path tree from source.
+
+        Settling order and predecessors are the same as shortest_path_ids, so the
+        tree path to any node is exactly the path shortest_path_ids would return.
+
+        Returns:
+            (costs, predecessors, hops): float64 costs (inf where unreachable), int32
+            predecessor ids (-1 for source and unreachable nodes), int32 hop counts
+            (-1 where unreachable).
+        """
+        distances, previous, hops = _dijkstra_tree(self.adjacency(), len(self.words), source)
+        return (np.array(distances, dtype=np.float64),
+                np.array(previous, dtype=np.int32),
+                np.array(hops, dtype=np.int32))
+
+    def multi_source_hops(self, sources) -> np.ndarray:
+        """
+        Shortest-path step counts from each source to every node, in one batched pass.
+
+        Uses the attached atlas rows when available, otherwise a single
+        scipy.sparse.csgraph Dijkstra call over the CSR cost matrix, otherwise one
+        shortest_path_tree per source. SciPy may pick a different route than
+        shortest_path when two routes cost exactly the same, so callers that
+        persist a length should confirm it with shortest_path.
+
+        Returns:
+            int16 array of shape (len(sources), N); -1 where unreachable.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        if self.atlas is not None:
+            hops = self.atlas.hops[sources].astype(np.int16)
+            hops[hops == 255] = -1
+            return hops
+
+        if csgraph_dijkstra is not None:
+            cost_matrix = self._cost_matrix()
+            if cost_matrix is not None:
+                distances, predecessors = csgraph_dijkstra(
+                    cost_matrix, directed=True, indices=sources, return_predecessors=True)
+                return _hops_from_predecessors(distances, predecessors)
+
+        return np.vstack([self.shortest_path_tree(int(source))[2] for source in sources]).astype(np.int16)
+
+    def weak_components(self) -> np.ndarray:
+        """Weakly connected component label of every node (the smallest node id in its component)."""
+        labels = np.arange(len(self), dtype=np.int64)
+        sources = np.repeat(np.arange(len(self), dtype=np.int64), self.degrees)
+        targets = self.indices.astype(np.int64)
+        while True:
+            # Pull the smaller label across every edge in both directions until nothing changes
+            edge_labels = np.minimum(labels[sources], labels[targets])
+            updated = labels.copy()
+            np.minimum.at(updated, sources, edge_labels)
+            np.minimum.at(updated, targets, edge_labels)
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
+    def _cost_matrix(self):
+        """CSR matrix of 1 - similarity costs for SciPy, or None if it cannot represent the graph."""
+        if self._costs_csr is None:
+            costs = 1.0 - self.weights.astype(np.float64)
+            # SciPy drops zero-cost entries as non-edges; keep the exact kernel for such graphs
+            if (costs <= 0).any():
+                return None
+            self._costs_csr = csr_matrix((costs, self.indices, self.indptr), shape=(len(self), len(self)))
+        return self._costs_csr
+
+
+def _dijkstra_tree(adjacency, num_nodes: int, root: int) -> Tuple[List[float], List[int], List[int]]:
+    """Exhaustive Dijkstra from root over CSR adjacency arrays; returns (distances, previous, hops)."""
+    indptr, indices, costs = adjacency
+    distances = [float('infinity')] * num_nodes
+    previous = [-1] * num_nodes
+    hops = [-1] * num_nodes
+    visited = bytearray(num_nodes)
+    distances[root] = 0.0
+    hops[root] = 0
+
+    pq = [(0.0, root)]
+    while pq:
+        current_dist, current = heapq.heappop(pq)
+        if visited[current]:
+            continue
+        visited[current] = 1
+
+        first, last = indptr[current], indptr[current + 1]
+        for neighbor, cost in zip(indices[first:last].tolist(), costs[first:last].tolist()):
+            if visited[neighbor]:
+                continue
+            distance = current_dist + cost
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current
+                hops[neighbor] = hops[current] + 1
+                heapq.heappush(pq, (distance, neighbor))
+
+    return distances, previous, hops
+
+
+def _hops_from_predecessors(distances: np.ndarray, predecessors: np.ndarray) -> np.ndarray:
+    """Step counts from SciPy's (sources x N) predecessor matrix, by walking all rows in lockstep."""
+    rows = np.arange(predecessors.shape[0])[:, None]
+    hops = np.zeros(predecessors.shape, dtype=np.int16)
+    current = predecessors.copy()
+    has_parent = current >= 0
+    while has_parent.any():
+        hops += has_parent
+        current = np.where(has_parent, predecessors[rows, np.maximum(current, 0)], -1)
+        has_parent = current >= 0
+    hops[np.isinf(distances)] = -1
+    return hops
+
+
+def _trace_back(previous: Dict[int, int], node: int) -> List[int]:
+    """Follow predecessor links from node back to the search root (node first)."""
+    chain = []
+    while node != -1:
+        chain.append(node)
+        node = previous[node]
+    return chain
+
+
+def load_graph(path, use_cache: bool = True, use_atlas: bool = True) -> WordGraph:
+    """
+    Loads graph.json as a compiled WordGraph.
+
+    With use_atlas, a fresh all-pairs path atlas built by path_atlas.py next to the
+    JSON is attached, so shortest_path answers from the precomputed tables.
+    """
+    graph = WordGraph.from_json(path, use_cache=use_cache)
+    if use_atlas:
+        from path_atlas import open_atlas
+        graph.atlas = open_atlas(path, graph)
+    return graph
+
+
+def write_compact_json(graph: WordGraph, path, weight_scale: int = COMPACT_WEIGHT_SCALE) -> None:
+    """Write graph in the minified compact export format."""
+    with open(path, 'w') as f:
+        json.dump(graph.to_compact(weight_scale), f, separators=(',', ':'))
+
+
+# --- Sidecar cache ---
+
+def cache_dir_for(path) -> str:
+    """Sidecar cache directory for a graph.json path."""
+    return os.fspath(path) + CACHE_SUFFIX
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_stat(path: str) -> Dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_json_atomic(path: str, data) -> None:
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(manifest_path: str, version: int) -> Optional[Dict]:
+    """Read a sidecar manifest, or None if it is missing, unreadable or another format version."""
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != version:
+        return None
+    return manifest
+
+
+def source_matches(path: str, manifest: Dict, manifest_path: str) -> bool:
+    """True if path still has the content recorded in a sidecar manifest."""
+    # Cheap check first; only hash the source when size or mtime moved
+    source = _source_stat(path)
+    if source["size"] != manifest.get("size"):
+        return False
+    if source["mtime_ns"] != manifest.get("mtime_ns"):
+        if _file_sha256(path) != manifest.get("sha256"):
+            return False
+        # Same content (e.g. fresh checkout); refresh the stamp so the next load is cheap
+        manifest.update(source)
+        try:
+            write_json_atomic(manifest_path, manifest)
+        except OSError:
+            pass
+    return True
+
+
+def source_fingerprint(path: str) -> Dict:
+    """Size, mtime and SHA-256 of path, as recorded in sidecar manifests."""
+    fingerprint = {"sha256": _file_sha256(path)}
+    fingerprint.update(_source_stat(path))
+    return fingerprint
+
+
+def _load_cache(path: str) -> Optional[WordGraph]:
+    """Open the sidecar cache for path if it is still valid, else return None."""
+    cache_dir = cache_dir_for(path)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    manifest = read_manifest(manifest_path, CACHE_FORMAT_VERSION)
+    if manifest is None or not source_matches(path, manifest, manifest_path):
+        return None
+
+    try:
+        with open(os.path.join(cache_dir, "words.json"), 'r') as f:
+            words = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode='r')
+            for name in CACHE_ARRAYS
+        }
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable graph cache at {cache_dir}: {e}", file=sys.stderr)
+        return None
+
+    if len(words) + 1 != len(arrays["indptr"]):
+        return None
+    return WordGraph(words, arrays["indptr"], arrays["indices"], arrays["weights"], arrays["tsne"])
+
+
+def _write_cache(path: str, graph: WordGraph) -> None:
+    """Write the sidecar cache for path. Failures only cost the next load a JSON parse."""
+    cache_dir = cache_dir_for(path)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Invalidate first so a half-written cache is never picked up
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        arrays = {
+            "indptr": graph.indptr,
+            "indices": graph.indices,
+            "weights": graph.weights,
+            "tsne": graph.tsne if graph.tsne is not None
+            else np.full((len(graph), 2), np.nan, dtype=np.float32),
+        }
+        for name, array in arrays.items():
+            tmp_path = os.path.join(cache_dir, f"{name}.tmp{os.getpid()}.npy")
+            np.save(tmp_path, np.ascontiguousarray(array))
+            os.replace(tmp_path, os.path.join(cache_dir, f"{name}.npy"))
+        write_json_atomic(os.path.join(cache_dir, "words.json"), graph.words)
+
+        manifest = {"version": CACHE_FORMAT_VERSION}
+        manifest.update(source_fingerprint(path))
+        write_json_atomic(manifest_path, manifest)
+    except OSError as e:
+        print(f"Warning: Could not write graph cache to {cache_dir}: {e}", file=sys.stderr)